@@ -17,12 +17,13 @@ Example:
     >>> collector.run()
 """
 
-# Component imports for easy access
+# Component imports for easy access (config first, so an optional
+# LARA_CONFIG preload overlaps with the heavier component imports)
+from . import config
 from . import tracking
 from . import analysis
 from . import visualization
 from . import utils
-from . import config
 
 LARA_VERSION = "v1.0.0"
 DB_SCHEMA_VERSION = "v1.0"
@@ -4,9 +4,10 @@ Coordinates all analysis components.
 """
 
 import sqlite3
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from lara.tracking.database import configure_connection, optimize_connection
 from .corridor_detector import CorridorDetector
 from .pattern_matcher import PatternMatcher
 from .statistics import StatisticsEngine
@@ -28,6 +29,7 @@ class FlightAnalyzer:
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        configure_connection(self.conn, query_only=True)
 
         # Initialize components
         self.corridor_detector = CorridorDetector(self.conn)
@@ -85,6 +87,20 @@ class FlightAnalyzer:
         """Run only corridor analysis."""
         return self.corridor_detector.detect_corridors(grid_size_km)
 
+    def top_corridors(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Get the ``n`` highest-ranked corridors.
+
+        Only the requested corridors are converted to dictionaries.
+
+        Args:
+            n: Number of corridors to return
+
+        Returns:
+            Corridor dictionaries ordered by rank
+        """
+        return self.corridor_detector.detect_corridors(limit=n)["corridors"]
+
     def analyze_patterns(self) -> Dict[str, Any]:
         """Run only pattern analysis."""
         return self.pattern_matcher.find_patterns()
@@ -96,4 +112,5 @@ class FlightAnalyzer:
     def close(self):
         """Close database connection."""
         if self.conn:
+            optimize_connection(self.conn)
             self.conn.close()
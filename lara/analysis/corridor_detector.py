@@ -16,8 +16,15 @@ from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import defaultdict
 
+import numpy as np
+
 from lara.config import Settings
-from lara.utils import haversine_distance, perpendicular_distance, calculate_bearing
+from lara.utils import (
+    haversine_distance,
+    haversine_distances,
+    perpendicular_distance,
+    calculate_bearing,
+)
 
 # Type alias for database row (since we can't import sqlite3.Row type)
 DbRow = Any
@@ -106,6 +113,7 @@ class CorridorDetector:
         min_flights: int = Settings.MIN_FLIGHTS_FOR_CORRIDOR,
         heading_tolerance: float = Settings.HEADING_TOLERANCE_DEG,
         proximity_km: float = Settings.PROXIMITY_THRESHOLD_KM,
+        limit: int = 50,
     ) -> Dict[str, Any]:
         """
         Detect flight corridors using directional path analysis.
@@ -121,11 +129,12 @@ class CorridorDetector:
             min_flights: Minimum unique flights to qualify as corridor (default: 10)
             heading_tolerance: Heading tolerance in degrees ± (default: 30°)
             proximity_km: Maximum distance for positions to group in km (default: 2km)
+            limit: Number of top-ranked corridors to return (default: 50)
 
         Returns:
             Dictionary containing:
                 - total_corridors: Number of detected corridors
-                - corridors: List of corridor dictionaries (top 50)
+                - corridors: List of corridor dictionaries (top ``limit``)
                 - parameters: Detection parameters used
 
         Example:
@@ -199,7 +208,7 @@ class CorridorDetector:
 
         return {
             "total_corridors": len(quality_corridors),
-            "corridors": [self._corridor_to_dict(c) for c in quality_corridors[:50]],
+            "corridors": [self._corridor_to_dict(c) for c in quality_corridors[:limit]],
             "parameters": {
                 "min_flights": min_flights,
                 "heading_tolerance": heading_tolerance,
@@ -293,27 +302,27 @@ class CorridorDetector:
             if len(bin_positions) < 3:
                 continue
 
-            # Spatial clustering using simple proximity
-            ungrouped = bin_positions.copy()
+            # Spatial clustering using simple proximity. near[i] tracks
+            # whether position i is within range of any group member, so
+            # each join costs one vectorized distance pass over the bin.
+            lats = np.array([p.latitude for p in bin_positions])
+            lons = np.array([p.longitude for p in bin_positions])
+            ungrouped = list(range(len(bin_positions)))
 
             while ungrouped:
                 # Start new group with first ungrouped position
-                seed = ungrouped.pop(0)
+                seed_idx = ungrouped.pop(0)
+                seed = bin_positions[seed_idx]
                 group = [seed]
+                near = (
+                    haversine_distances(seed.latitude, seed.longitude, lats, lons)
+                    < proximity_km
+                )
 
                 # Find all positions close to this group
-                i = 0
-                while i < len(ungrouped):
-                    pos = ungrouped[i]
-
-                    # Check if close to any position in current group
-                    is_close = any(
-                        haversine_distance(
-                            pos.latitude, pos.longitude, g.latitude, g.longitude
-                        )
-                        < proximity_km
-                        for g in group
-                    )
+                remaining = []
+                for idx in ungrouped:
+                    pos = bin_positions[idx]
 
                     # Check heading similarity
                     heading_diff = min(
@@ -321,10 +330,15 @@ class CorridorDetector:
                         360 - abs(pos.heading - seed.heading),
                     )
 
-                    if is_close and heading_diff < heading_tolerance:
-                        group.append(ungrouped.pop(i))
+                    if near[idx] and heading_diff < heading_tolerance:
+                        group.append(pos)
+                        near |= (
+                            haversine_distances(pos.latitude, pos.longitude, lats, lons)
+                            < proximity_km
+                        )
                     else:
-                        i += 1
+                        remaining.append(idx)
+                ungrouped = remaining
 
                 if len(group) >= 3:  # Minimum 3 positions for a group
                     groups.append(group)
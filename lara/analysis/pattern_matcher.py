@@ -49,33 +49,23 @@ class PatternMatcher:
             """
             SELECT 
                 callsign,
-                COUNT(*) as occurrence_count,
-                AVG(min_distance_km) as avg_min_distance,
-                AVG(max_altitude_m) as avg_altitude,
-                MIN(first_seen) as first_occurrence,
-                MAX(last_seen) as last_occurrence
+                COUNT(*) as occurrences,
+                AVG(min_distance_km) as avg_min_distance_km,
+                AVG(max_altitude_m) as avg_altitude_m,
+                MIN(first_seen) as first_seen,
+                MAX(last_seen) as last_seen
             FROM flights
             WHERE callsign IS NOT NULL AND callsign != ''
             GROUP BY callsign
-            HAVING occurrence_count >= ?
-            ORDER BY occurrence_count DESC
-            LIMIT 50
+            HAVING occurrences >= ?
+            ORDER BY occurrences DESC
+            LIMIT ?
         """,
-            (Settings.MIN_PATTERN_OCCURRENCES,),
+            (Settings.MIN_PATTERN_OCCURRENCES, Settings.TOP_PATTERNS_LIMIT),
         )
 
-        recurring = []
-        for row in cursor.fetchall():
-            recurring.append(
-                {
-                    "callsign": row["callsign"],
-                    "occurrences": row["occurrence_count"],
-                    "avg_min_distance_km": row["avg_min_distance"],
-                    "avg_altitude_m": row["avg_altitude"],
-                    "first_seen": row["first_occurrence"],
-                    "last_seen": row["last_occurrence"],
-                }
-            )
+        # Columns are aliased to the report keys, so rows map 1:1 to dicts
+        recurring = [dict(row) for row in cursor.fetchall()]
 
         print(f"Found {len(recurring)} recurring flights")
         for flight in recurring[:10]:
@@ -88,28 +78,23 @@ class PatternMatcher:
         cursor = self.conn.cursor()
 
         # Group by callsign and hour
-        cursor.execute("""
+        cursor.execute(
+            """
             SELECT 
                 callsign,
                 CAST(strftime('%H', first_seen) AS INTEGER) as hour,
-                COUNT(*) as count
+                COUNT(*) as frequency
             FROM flights
             WHERE callsign IS NOT NULL AND callsign != ''
             GROUP BY callsign, hour
-            HAVING count >= 3
-            ORDER BY count DESC
-            LIMIT 50
-        """)
-
-        schedules = []
-        for row in cursor.fetchall():
-            schedules.append(
-                {
-                    "callsign": row["callsign"],
-                    "hour": row["hour"],
-                    "frequency": row["count"],
-                }
-            )
+            HAVING frequency >= ?
+            ORDER BY frequency DESC
+            LIMIT ?
+        """,
+            (Settings.MIN_SCHEDULE_OCCURRENCES, Settings.TOP_PATTERNS_LIMIT),
+        )
+
+        schedules = [dict(row) for row in cursor.fetchall()]
 
         print(f"Found {len(schedules)} regular schedules")
 
@@ -120,32 +105,28 @@ class PatternMatcher:
         cursor = self.conn.cursor()
 
         # For each recurring flight, check distance variation
-        cursor.execute("""
+        # (spread between closest and farthest pass above MIN_VARIATION_KM)
+        cursor.execute(
+            """
             SELECT 
                 callsign,
                 COUNT(*) as flights,
-                AVG(min_distance_km) as avg_distance,
-                MIN(min_distance_km) as min_distance,
-                MAX(min_distance_km) as max_distance,
-                (MAX(min_distance_km) - MIN(min_distance_km)) as distance_variation
+                AVG(min_distance_km) as avg_distance_km,
+                (MAX(min_distance_km) - MIN(min_distance_km)) as variation_km
             FROM flights
             WHERE callsign IS NOT NULL
             GROUP BY callsign
-            HAVING flights >= 5
-            ORDER BY distance_variation DESC
-            LIMIT 20
-        """)
-
-        variations = []
-        for row in cursor.fetchall():
-            if row["distance_variation"] > 5:  # More than 5km variation
-                variations.append(
-                    {
-                        "callsign": row["callsign"],
-                        "flights": row["flights"],
-                        "avg_distance_km": row["avg_distance"],
-                        "variation_km": row["distance_variation"],
-                    }
-                )
+            HAVING flights >= ? AND variation_km > ?
+            ORDER BY variation_km DESC
+            LIMIT ?
+        """,
+            (
+                Settings.MIN_VARIATION_FLIGHTS,
+                Settings.MIN_VARIATION_KM,
+                Settings.TOP_VARIATIONS_LIMIT,
+            ),
+        )
+
+        variations = [dict(row) for row in cursor.fetchall()]
 
         return {"high_variation_routes": variations, "count": len(variations)}
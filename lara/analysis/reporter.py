@@ -3,7 +3,9 @@ Report Generator
 Creates comprehensive analysis reports in various formats.
 """
 
+import gzip
 import json
+from functools import partial
 from typing import Dict, Any
 
 
@@ -12,6 +14,14 @@ class ReportGenerator:
     Generates analysis reports in multiple formats.
     """
 
+    def __init__(self):
+        """Initialize report generator with its format writers."""
+        self._writers = {
+            "json": self._generate_json_report,
+            "txt": self._generate_text_report,
+            "html": self._generate_html_report,
+        }
+
     def generate_report(
         self, analysis_results: Dict[str, Any], output_path: str, format: str = "json"
     ):
@@ -23,50 +33,57 @@ class ReportGenerator:
             output_path: Output file path
             format: Report format ('json', 'txt', 'html')
         """
-        if format == "json":
-            self._generate_json_report(analysis_results, output_path)
-        elif format == "txt":
-            self._generate_text_report(analysis_results, output_path)
-        elif format == "html":
-            self._generate_html_report(analysis_results, output_path)
-        else:
+        writer = self._writers.get(format)
+        if writer is None:
             raise ValueError(f"Unsupported format: {format}")
 
+        writer(analysis_results, output_path)
+
     def _generate_json_report(self, results: Dict[str, Any], output_path: str):
-        """Generate JSON report."""
-        with open(output_path, "w") as f:
+        """
+        Generate JSON report.
+
+        Paths ending in '.gz' (e.g. 'report.json.gz') are written gzip
+        compressed at the fastest level.
+        """
+        if str(output_path).endswith(".gz"):
+            opener = partial(gzip.open, mode="wt", compresslevel=1, encoding="utf-8")
+        else:
+            opener = partial(open, mode="w")
+
+        with opener(output_path) as f:
             json.dump(results, f, indent=2, default=str)
 
     def _generate_text_report(self, results: Dict[str, Any], output_path: str):
         """Generate text report."""
-        with open(output_path, "w") as f:
-            f.write("=" * 70 + "\n")
-            f.write("LARA FLIGHT ANALYSIS REPORT\n")
-            f.write("=" * 70 + "\n\n")
-
-            f.write(f"Generated: {results['metadata']['analysis_date']}\n")
-            f.write(f"Database: {results['metadata']['database']}\n\n")
+        stats = results["statistics"]["overview"]
+        corridors = results["corridors"]
 
+        parts = [
+            "=" * 70 + "\n",
+            "LARA FLIGHT ANALYSIS REPORT\n",
+            "=" * 70 + "\n\n",
+            f"Generated: {results['metadata']['analysis_date']}\n",
+            f"Database: {results['metadata']['database']}\n\n",
             # Overview
-            stats = results["statistics"]["overview"]
-            f.write("OVERVIEW\n")
-            f.write("-" * 70 + "\n")
-            f.write(f"Total Flights: {stats['total_flights']:,}\n")
-            f.write(f"Unique Aircraft: {stats['unique_aircraft']:,}\n")
-            f.write(f"Total Positions: {stats['total_positions']:,}\n\n")
-
+            "OVERVIEW\n",
+            "-" * 70 + "\n",
+            f"Total Flights: {stats['total_flights']:,}\n",
+            f"Unique Aircraft: {stats['unique_aircraft']:,}\n",
+            f"Total Positions: {stats['total_positions']:,}\n\n",
             # Corridors
-            corridors = results["corridors"]
-            f.write("FLIGHT CORRIDORS (Top 10)\n")
-            f.write("-" * 70 + "\n")
-            for corridor in corridors["corridors"][:10]:
-                f.write(
-                    f"  #{corridor['rank']:2d}: ({corridor['center_lat']:.4f}, {corridor['center_lon']:.4f})\n"
-                )
-                f.write(
-                    f"       Flights: {corridor['unique_flights']}, Positions: {corridor['total_positions']}\n"
-                )
-            f.write("\n")
+            "FLIGHT CORRIDORS (Top 10)\n",
+            "-" * 70 + "\n",
+        ]
+        for corridor in corridors["corridors"][:10]:
+            parts.append(
+                f"  #{corridor['rank']:2d}: ({corridor['center_lat']:.4f}, {corridor['center_lon']:.4f})\n"
+                f"       Flights: {corridor['unique_flights']}, Positions: {corridor['total_positions']}\n"
+            )
+        parts.append("\n")
+
+        with open(output_path, "w") as f:
+            f.write("".join(parts))
 
     def _generate_html_report(self, results: Dict[str, Any], output_path: str):
         """Generate HTML report."""
@@ -108,8 +125,7 @@ class ReportGenerator:
         </tr>
 """
 
-        for corridor in results["corridors"]["corridors"][:10]:
-            html += f"""
+        rows = "".join(f"""
         <tr>
             <td>{corridor['rank']}</td>
             <td>({corridor['center_lat']:.4f}, {corridor['center_lon']:.4f})</td>
@@ -117,13 +133,13 @@ class ReportGenerator:
             <td>{corridor['total_positions']}</td>
             <td>{corridor['avg_altitude_m']:.0f} m</td>
         </tr>
-"""
+""" for corridor in results["corridors"]["corridors"][:10])
 
-        html += """
+        footer = """
     </table>
 </body>
 </html>
 """
 
         with open(output_path, "w") as f:
-            f.write(html)
+            f.write("".join((html, rows, footer)))
@@ -3,10 +3,20 @@ Statistical Analysis Engine
 Provides comprehensive statistical analysis of flight data.
 """
 
-from typing import Dict, Any, List
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Mapping, Optional
 from lara.config import Settings
 
 
+def _bucket_count_sql(column: str, bounded: bool = True) -> str:
+    """Return the COUNT(*) statement for one class of a positions column."""
+    if bounded:
+        return f"SELECT COUNT(*) FROM positions WHERE {column} >= ? AND {column} < ?"
+    return f"SELECT COUNT(*) FROM positions WHERE {column} >= ?"
+
+
 class StatisticsEngine:
     """
     Comprehensive statistical analysis engine.
@@ -22,18 +32,60 @@ class StatisticsEngine:
         self.conn = db_conn
 
     def get_comprehensive_stats(self) -> Dict[str, Any]:
-        """Get complete statistical overview."""
-        return {
-            "overview": self._get_overview(),
-            "altitude_distribution": self._get_altitude_distribution(),
-            "distance_distribution": self._get_distance_distribution(),
-            "hourly_pattern": self._get_hourly_pattern(),
-            "weekday_pattern": self._get_weekday_pattern(),
+        """
+        Get complete statistical overview.
+
+        The sections are independent aggregates, so for file-backed
+        databases each one runs on its own read-only connection in a
+        thread pool; sqlite3 releases the GIL while a query executes.
+        In-memory databases and connections with an open transaction
+        fall back to running serially on the shared connection.
+        """
+        sections = {
+            "overview": self._get_overview,
+            "altitude_distribution": self._get_altitude_distribution,
+            "distance_distribution": self._get_distance_distribution,
+            "hourly_pattern": self._get_hourly_pattern,
+            "weekday_pattern": self._get_weekday_pattern,
         }
 
-    def _get_overview(self) -> Dict[str, Any]:
+        db_path = self._database_path()
+        if db_path is None:
+            return {name: query() for name, query in sections.items()}
+
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {
+                name: executor.submit(self._run_readonly, db_path, query)
+                for name, query in sections.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def _database_path(self) -> Optional[str]:
+        """Return the main database file if it can be opened concurrently."""
+        if self.conn.in_transaction:
+            # Uncommitted rows are invisible to other connections
+            return None
+
+        for _, name, path in self.conn.execute("PRAGMA database_list"):
+            if name == "main":
+                return path or None
+        return None
+
+    @staticmethod
+    def _run_readonly(db_path: str, query) -> Any:
+        """Run a section query on a private read-only connection."""
+        # as_uri() percent-quotes '#', '?' and '%' so they stay in the path
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            conn.row_factory = sqlite3.Row
+            return query(conn)
+        finally:
+            conn.close()
+
+    def _get_overview(self, conn=None) -> Dict[str, Any]:
         """Get basic overview statistics."""
-        cursor = self.conn.cursor()
+        cursor = (conn or self.conn).cursor()
 
         cursor.execute("""
             SELECT 
@@ -53,83 +105,68 @@ class StatisticsEngine:
 
         return dict(row)
 
-    def _get_altitude_distribution(self) -> List[Dict[str, Any]]:
+    def _get_altitude_distribution(self, conn=None) -> List[Dict[str, Any]]:
         """Get altitude distribution by class."""
-        cursor = self.conn.cursor()
+        return [
+            {
+                "class": class_name,
+                "min_altitude_m": lo,
+                "max_altitude_m": hi,
+                "count": count,
+            }
+            for class_name, lo, hi, count in self._count_buckets(
+                "altitude_m", Settings.ALTITUDE_CLASSES, conn
+            )
+        ]
 
-        distribution = []
-        for class_name, (min_alt, max_alt) in Settings.ALTITUDE_CLASSES.items():
-            if max_alt == float("inf"):
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM positions
-                    WHERE altitude_m >= ?
-                """,
-                    (min_alt,),
-                )
-            else:
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM positions
-                    WHERE altitude_m >= ? AND altitude_m < ?
-                """,
-                    (min_alt, max_alt),
-                )
-
-            count = cursor.fetchone()["count"]
-            distribution.append(
-                {
-                    "class": class_name,
-                    "min_altitude_m": min_alt,
-                    "max_altitude_m": max_alt if max_alt != float("inf") else None,
-                    "count": count,
-                }
+    def _get_distance_distribution(self, conn=None) -> List[Dict[str, Any]]:
+        """Get distance distribution by class."""
+        return [
+            {
+                "class": class_name,
+                "min_distance_km": lo,
+                "max_distance_km": hi,
+                "count": count,
+            }
+            for class_name, lo, hi, count in self._count_buckets(
+                "distance_from_home_km", Settings.DISTANCE_CLASSES, conn
             )
+        ]
 
-        return distribution
+    def _count_buckets(
+        self, column: str, classes: Mapping[str, tuple], conn=None
+    ) -> List[tuple]:
+        """
+        Count positions per class of ``column``.
 
-    def _get_distance_distribution(self) -> List[Dict[str, Any]]:
-        """Get distance distribution by class."""
-        cursor = self.conn.cursor()
+        Each class is one bounded ``COUNT(*)`` so SQLite can range-scan
+        the column index between both bounds; a single join against all
+        bounds cannot use the upper bound and scans to the index end.
+
+        Args:
+            column: positions column to bucket (trusted, not user input)
+            classes: Mapping of class name to (min, max), max may be inf
+            conn: Connection to query instead of the engine's own
+
+        Returns:
+            List of (class_name, min, max_or_None, count) in class order
+        """
+        cursor = (conn or self.conn).cursor()
 
-        distribution = []
-        for class_name, (min_dist, max_dist) in Settings.DISTANCE_CLASSES.items():
-            if max_dist == float("inf"):
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM positions
-                    WHERE distance_from_home_km >= ?
-                """,
-                    (min_dist,),
-                )
+        buckets = []
+        for class_name, (lo, hi) in classes.items():
+            if hi == float("inf"):
+                cursor.execute(_bucket_count_sql(column, bounded=False), (lo,))
+                hi = None
             else:
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM positions
-                    WHERE distance_from_home_km >= ? AND distance_from_home_km < ?
-                """,
-                    (min_dist, max_dist),
-                )
-
-            count = cursor.fetchone()["count"]
-            distribution.append(
-                {
-                    "class": class_name,
-                    "min_distance_km": min_dist,
-                    "max_distance_km": max_dist if max_dist != float("inf") else None,
-                    "count": count,
-                }
-            )
+                cursor.execute(_bucket_count_sql(column), (lo, hi))
+            buckets.append((class_name, lo, hi, cursor.fetchone()[0]))
 
-        return distribution
+        return buckets
 
-    def _get_hourly_pattern(self) -> List[Dict[str, Any]]:
+    def _get_hourly_pattern(self, conn=None) -> List[Dict[str, Any]]:
         """Get hourly traffic pattern."""
-        cursor = self.conn.cursor()
+        cursor = (conn or self.conn).cursor()
 
         cursor.execute("""
             SELECT 
@@ -144,9 +181,9 @@ class StatisticsEngine:
 
         return [dict(row) for row in cursor.fetchall()]
 
-    def _get_weekday_pattern(self) -> List[Dict[str, Any]]:
+    def _get_weekday_pattern(self, conn=None) -> List[Dict[str, Any]]:
         """Get weekday traffic pattern."""
-        cursor = self.conn.cursor()
+        cursor = (conn or self.conn).cursor()
 
         cursor.execute("""
             SELECT 
@@ -203,7 +240,8 @@ class StatisticsEngine:
         """Analyze airline patterns."""
         cursor = self.conn.cursor()
 
-        cursor.execute("""
+        cursor.execute(
+            """
             SELECT 
                 SUBSTR(callsign, 1, 3) as airline_code,
                 COUNT(*) as flight_count,
@@ -215,7 +253,9 @@ class StatisticsEngine:
             GROUP BY airline_code
             HAVING flight_count > 1
             ORDER BY flight_count DESC
-            LIMIT 30
-        """)
+            LIMIT ?
+        """,
+            (Settings.TOP_AIRLINES_LIMIT,),
+        )
 
         return {"top_airlines": [dict(row) for row in cursor.fetchall()]}
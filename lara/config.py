@@ -6,46 +6,96 @@ It includes physical constants, analysis settings, visualization options, and
 runtime configuration loaded from YAML files.
 """
 
+import copy
 import os
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Final, Mapping, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # libyaml not available
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _Loader
+
 # =============================================================================
 # Physical Constants
 # =============================================================================
 
 
-class Constants:
+@dataclass(frozen=True)
+class _Constants:
     """Physical constants representing real-world measurements."""
 
     EARTH_RADIUS_KM: float = 6371.0  # Earth's radius for distance calculations
     METERS_TO_FEET: float = 3.28084  # Altitude conversion factor
     MS_TO_KMH: float = 3.6  # Velocity conversion: m/s to km/h
+    MS_TO_KNOTS: float = 1.94384  # Velocity conversion: m/s to knots
     KM_PER_DEGREE_LAT: float = 111.32  # Distance per degree latitude at equator
 
 
+Constants = _Constants()
+
+
 # =============================================================================
 # Analysis & Tracking Settings
 # =============================================================================
 
+# Altitude range definitions for classification (meters)
+ALTITUDE_RANGES: Final[Tuple[Tuple[float, float, str], ...]] = (
+    (0, 1000, "0-1000m"),
+    (1000, 3000, "1000-3000m"),
+    (3000, 6000, "3000-6000m"),
+    (6000, 9000, "6000-9000m"),
+    (9000, 12000, "9000-12000m"),
+    (12000, float("inf"), "12000m+"),
+)
+
+# Altitude classification boundaries (meters)
+ALTITUDE_CLASSES: Final[Mapping[str, Tuple[float, float]]] = MappingProxyType(
+    {
+        "very_low": (0, 1000),
+        "low": (1000, 3000),
+        "medium": (3000, 6000),
+        "high": (6000, 9000),
+        "very_high": (9000, 12000),
+        "cruise": (12000, float("inf")),
+    }
+)
+
+# Distance classification boundaries (kilometers)
+DISTANCE_CLASSES: Final[Mapping[str, Tuple[float, float]]] = MappingProxyType(
+    {
+        "very_close": (0, 5),
+        "close": (5, 10),
+        "medium": (10, 20),
+        "far": (20, 30),
+        "very_far": (30, float("inf")),
+    }
+)
 
-class Settings:
-    """Configurable settings for flight tracking and analysis algorithms."""
+
+@dataclass(frozen=True)
+class _Settings:
+    """
+    Configurable settings for flight tracking and analysis algorithms.
+
+    Used through the frozen module-level ``Settings`` instance; mapping
+    fields are read-only views so the defaults cannot be mutated.
+    """
 
     # --- Flight Tracking ---
     FLIGHT_SESSION_TIMEOUT_MINUTES: int = 30  # Max gap to consider same flight
     MIN_UPDATE_INTERVAL: int = 10  # Minimum seconds between API requests
+    ARCHIVE_CHECK_ITERATIONS: int = 360  # Scans between archival runs (if enabled)
 
-    # Altitude range definitions for classification (meters)
-    ALTITUDE_RANGES = [
-        (0, 1000, "0-1000m"),
-        (1000, 3000, "1000-3000m"),
-        (3000, 6000, "3000-6000m"),
-        (6000, 9000, "6000-9000m"),
-        (9000, 12000, "9000-12000m"),
-        (12000, float("inf"), "12000m+"),
-    ]
+    ALTITUDE_RANGES: Tuple[Tuple[float, float, str], ...] = ALTITUDE_RANGES
 
     # --- Corridor Detection ---
     HEADING_TOLERANCE_DEG: float = 20.0  # Angular tolerance for same direction (±deg)
@@ -61,31 +111,27 @@ class Settings:
     # --- Pattern Detection ---
     MIN_PATTERN_OCCURRENCES: int = 5  # Minimum repetitions to identify pattern
     ROUTE_SIMILARITY_THRESHOLD: float = 0.8  # Route similarity threshold (0-1)
-
-    # Altitude classification boundaries (meters)
-    ALTITUDE_CLASSES: Dict[str, tuple[float, float]] = {
-        "very_low": (0, 1000),
-        "low": (1000, 3000),
-        "medium": (3000, 6000),
-        "high": (6000, 9000),
-        "very_high": (9000, 12000),
-        "cruise": (12000, float("inf")),
-    }
-
-    # Distance classification boundaries (kilometers)
-    DISTANCE_CLASSES: Dict[str, tuple[float, float]] = {
-        "very_close": (0, 5),
-        "close": (5, 10),
-        "medium": (10, 20),
-        "far": (20, 30),
-        "very_far": (30, float("inf")),
-    }
+    MIN_SCHEDULE_OCCURRENCES: int = 3  # Minimum same-hour repeats for a schedule
+    MIN_VARIATION_FLIGHTS: int = 5  # Minimum flights to judge route variation
+    MIN_VARIATION_KM: float = 5.0  # Minimum spread of closest approach (km)
+    TOP_PATTERNS_LIMIT: int = 50  # Max recurring flights/schedules reported
+    TOP_VARIATIONS_LIMIT: int = 20  # Max high-variation routes reported
+    TOP_AIRLINES_LIMIT: int = 30  # Max airlines in airline analysis
+
+    # Classification boundaries, shared with the module-level tables
+    ALTITUDE_CLASSES: Mapping[str, Tuple[float, float]] = field(
+        default_factory=lambda: ALTITUDE_CLASSES
+    )
+    DISTANCE_CLASSES: Mapping[str, Tuple[float, float]] = field(
+        default_factory=lambda: DISTANCE_CLASSES
+    )
 
     # --- Visualization ---
     DEFAULT_MAP_STYLE: str = "CartoDB.Positron"  # Base map tile style
     DEFAULT_ZOOM: int = 10  # Initial map zoom level
     FLIGHT_PATH_WEIGHT: int = 2  # Flight path line thickness
     FLIGHT_PATH_OPACITY: float = 0.6  # Flight path transparency (0-1)
+    FLIGHT_PATH_SIMPLIFY_DEG: float = 0.0005  # Path simplification (~50 m, 0=off)
     MARKER_RADIUS: int = 8  # Position marker size (pixels)
     MARKER_OPACITY: float = 0.7  # Marker border transparency (0-1)
     MARKER_FILL_OPACITY: float = 0.5  # Marker fill transparency (0-1)
@@ -93,16 +139,17 @@ class Settings:
     CORRIDOR_BORDER_WEIGHT: int = 2  # Corridor border line thickness
 
 
+Settings = _Settings()
+
+
 # =============================================================================
 # Color Schemes
 # =============================================================================
 
 
-class Colors:
-    """Color definitions for visualizations."""
-
-    # Altitude-based color coding (hex colors)
-    ALTITUDE_COLORS: Dict[str, str] = {
+# Altitude-based color coding (hex colors)
+ALTITUDE_COLORS: Final[Mapping[str, str]] = MappingProxyType(
+    {
         "very_low": "#ff3b3b",  # Red: 0-1000m
         "low": "#ff7a18",  # Orange: 1000-3000m
         "medium": "#f5e663",  # Yellow: 3000-6000m
@@ -110,24 +157,35 @@ class Colors:
         "very_high": "#00b4ff",  # Blue: 9000-12000m
         "cruise": "#7c3aed",  # Purple: 12000m+
     }
-
-    # Traffic rank colors (most to least traffic)
-    RANKED_COLORS = [
-        "#e74c3c",  # Rank 1: Red (highest traffic)
-        "#f17c15",  # Rank 2: Orange
-        "#ffd015",  # Rank 3: Yellow
-        "#2ecc71",  # Rank 4-5: Green
-        "#3498db",  # Rank 6+: Blue
-    ]
-
-    # Heatmap gradient stops (neon plasma theme)
-    HEATMAP_GRADIENT: Dict[float, str] = {
+)
+
+# Traffic rank colors (most to least traffic)
+RANKED_COLORS: Final[Tuple[str, ...]] = (
+    "#e74c3c",  # Rank 1: Red (highest traffic)
+    "#f17c15",  # Rank 2: Orange
+    "#ffd015",  # Rank 3: Yellow
+    "#2ecc71",  # Rank 4-5: Green
+    "#3498db",  # Rank 6+: Blue
+)
+
+# Heatmap gradient stops (neon plasma theme)
+HEATMAP_GRADIENT: Final[Mapping[float, str]] = MappingProxyType(
+    {
         0.0: "#120018",  # Dark purple
         0.25: "#6a00ff",  # Purple
         0.5: "#ff2fd2",  # Magenta
         0.75: "#ff9f1c",  # Orange
         1.0: "#fff200",  # Yellow
     }
+)
+
+
+class Colors:
+    """Color definitions for visualizations."""
+
+    ALTITUDE_COLORS: Mapping[str, str] = ALTITUDE_COLORS
+    RANKED_COLORS: Tuple[str, ...] = RANKED_COLORS
+    HEATMAP_GRADIENT: Mapping[float, str] = HEATMAP_GRADIENT
 
     FLIGHT_PATH_COLOR: str = "#3498db"  # Default flight path color (blue)
 
@@ -137,6 +195,99 @@ class Colors:
 # =============================================================================
 
 
+# Parsed YAML files keyed by absolute path -> (mtime_ns, size, content)
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+
+
+def _load_yaml_cached(path: str) -> Any:
+    """
+    Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    Entries are validated against the file's modification time and size
+    and evicted least-recently-used beyond ``_YAML_CACHE_SIZE``.
+
+    Args:
+        path: Path to YAML file
+
+    Returns:
+        Parsed YAML content (a private copy the caller may mutate)
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+
+    entry = _YAML_CACHE.get(key)
+    if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(entry[2])
+
+    with open(key, "r", encoding="utf-8") as f:
+        content = yaml.load(f, Loader=_Loader)
+
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, content)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+
+    return copy.deepcopy(content)
+
+
+# Background parses started by preload_config, keyed by absolute path
+_PRELOADS: Dict[str, Future] = {}
+_preload_executor: Optional[ThreadPoolExecutor] = None
+
+
+def preload_config(path: str) -> None:
+    """
+    Start reading and parsing a config file in a background thread.
+
+    The parse lands in the YAML cache, so a later ``Config(path)`` only
+    waits for it instead of reading the file itself. Lets disk I/O and
+    parsing overlap with slow imports during startup. Missing or broken
+    files are ignored here and reported by the regular load.
+
+    Args:
+        path: Path to YAML configuration file
+    """
+    global _preload_executor
+
+    key = os.path.abspath(path)
+    if key in _PRELOADS:
+        return
+
+    if _preload_executor is None:
+        _preload_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lara-config"
+        )
+    _PRELOADS[key] = _preload_executor.submit(_load_yaml_cached, key)
+
+
+def _await_preload(path: str) -> None:
+    """Wait for a pending preload of ``path``, if one was started."""
+    future = _PRELOADS.pop(os.path.abspath(path), None)
+    if future is not None:
+        future.exception()  # Errors resurface on the regular load
+
+
+_MISSING = object()
+
+# Required config entries: (key path, accepted types, value check)
+_CONFIG_SCHEMA: Tuple[
+    Tuple[Tuple[str, ...], Tuple[type, ...], Optional[Callable[[Any], bool]]], ...
+] = (
+    (("location", "latitude"), (float, int), lambda v: -90 <= v <= 90),
+    (("location", "longitude"), (float, int), lambda v: -180 <= v <= 180),
+    (("tracking", "radius_km"), (float, int), lambda v: v > 0),
+    (("database", "path"), (str,), None),
+)
+
+
+@lru_cache(maxsize=512)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dot-notation config key, memoized for repeated lookups."""
+    return tuple(key.split("."))
+
+
 class Config:
     """
     Runtime configuration manager for LARA.
@@ -172,13 +323,13 @@ class Config:
             return self._get_default_config()
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-                if self._validate_config(config):
-                    return config
-                else:
-                    print("Warning: Invalid config structure, using defaults")
-                    return self._get_default_config()
+            _await_preload(self.config_path)
+            config = _load_yaml_cached(self.config_path)
+            if self._validate_config(config):
+                return config
+            else:
+                print("Warning: Invalid config structure, using defaults")
+                return self._get_default_config()
         except Exception as e:
             print(f"Warning: Could not load config file: {e}")
             return self._get_default_config()
@@ -193,30 +344,19 @@ class Config:
         Returns:
             True if valid, False otherwise
         """
-        try:
-            # Required: location section
-            assert "location" in config
-            assert "latitude" in config["location"]
-            assert "longitude" in config["location"]
-            assert isinstance(config["location"]["latitude"], (float, int))
-            assert isinstance(config["location"]["longitude"], (float, int))
-            assert -90 <= config["location"]["latitude"] <= 90
-            assert -180 <= config["location"]["longitude"] <= 180
-
-            # Required: tracking section
-            assert "tracking" in config
-            assert "radius_km" in config["tracking"]
-            assert isinstance(config["tracking"]["radius_km"], (float, int))
-            assert config["tracking"]["radius_km"] > 0
-
-            # Required: database section
-            assert "database" in config
-            assert "path" in config["database"]
-            assert isinstance(config["database"]["path"], str)
-
-            return True
-        except (AssertionError, KeyError, TypeError):
-            return False
+        for path, types, check in _CONFIG_SCHEMA:
+            value = config
+            for k in path:
+                if not isinstance(value, dict):
+                    return False
+                value = value.get(k, _MISSING)
+
+            if not isinstance(value, types):
+                return False
+            if check is not None and not check(value):
+                return False
+
+        return True
 
     def _get_default_config(self) -> Dict[str, Any]:
         """
@@ -253,39 +393,52 @@ class Config:
 
         try:
             with open(self.config_path, "w", encoding="utf-8") as f:
-                yaml.dump(self._config, f, default_flow_style=False)
+                yaml.dump(self._config, f, Dumper=_Dumper, default_flow_style=False)
         except Exception as e:
             print(f"Error saving config: {e}")
             raise
+        finally:
+            # mtime/size may not change within the timestamp granularity
+            _YAML_CACHE.pop(os.path.abspath(self.config_path), None)
 
     # --- Property Accessors ---
 
-    @property
+    # Cached property name -> dot-notation key it is derived from
+    _PROPERTY_KEYS: Dict[str, str] = {
+        "home_latitude": "location.latitude",
+        "home_longitude": "location.longitude",
+        "location_name": "location.name",
+        "radius_km": "tracking.radius_km",
+        "update_interval": "tracking.update_interval_seconds",
+        "db_path": "database.path",
+    }
+
+    @cached_property
     def home_latitude(self) -> float:
         """Get home location latitude in degrees."""
         return float(self._config["location"]["latitude"])
 
-    @property
+    @cached_property
     def home_longitude(self) -> float:
         """Get home location longitude in degrees."""
         return float(self._config["location"]["longitude"])
 
-    @property
+    @cached_property
     def location_name(self) -> str:
         """Get descriptive location name."""
         return self._config["location"].get("name", "Unknown Location")
 
-    @property
+    @cached_property
     def radius_km(self) -> float:
         """Get tracking radius in kilometers."""
         return float(self._config["tracking"]["radius_km"])
 
-    @property
+    @cached_property
     def update_interval(self) -> int:
         """Get API update interval in seconds."""
         return int(self._config["tracking"]["update_interval_seconds"])
 
-    @property
+    @cached_property
     def db_path(self) -> str:
         """Get database file path."""
         return self._config["database"]["path"]
@@ -307,8 +460,12 @@ class Config:
             >>> config.get('tracking.radius_km', 25)
             50
         """
-        keys = key.split(".")
+        if "." not in key:
+            value = self._config.get(key)
+            return default if value is None else value
+
         value = self._config
+        keys = _split_key(key)
 
         for k in keys:
             if isinstance(value, dict):
@@ -331,14 +488,26 @@ class Config:
         Example:
             >>> config.set('tracking.radius_km', 50)
         """
-        keys = key.split(".")
-        config = self._config
+        if "." not in key:
+            self._config[key] = value
+        else:
+            keys = _split_key(key)
+            config = self._config
+
+            # Navigate to parent of target key, creating missing sections
+            for k in keys[:-1]:
+                config = config.setdefault(k, {})
+
+            # Set final value
+            config[keys[-1]] = value
+
+        # Drop cached properties derived from the changed key or its children
+        for name, source in self._PROPERTY_KEYS.items():
+            if source == key or source.startswith(key + "."):
+                self.__dict__.pop(name, None)
 
-        # Navigate to parent of target key
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
 
-        # Set final value
-        config[keys[-1]] = value
+# Opt-in startup preload: importing lara.config early (lara/__init__ does)
+# overlaps the config read with the remaining package imports
+if os.environ.get("LARA_CONFIG"):
+    preload_config(os.environ["LARA_CONFIG"])
@@ -17,14 +17,23 @@ Example:
     >>> collector.run()
 """
 
-# Core tracking components
-from .database import FlightDatabase
-from .collector import FlightCollector
-from .reader import FlightReader
-from .auth import OpenSkyAuth, OpenSkyBasicAuth, create_auth_from_config
+import importlib
+
+# Core tracking components, imported on first attribute access (PEP 562) so
+# that `import lara.tracking` does not pull in requests/sqlite3 up front
+_LAZY_IMPORTS = {
+    "Config": ("lara.config", "Config"),
+    "FlightDatabase": (".database", "FlightDatabase"),
+    "FlightCollector": (".collector", "FlightCollector"),
+    "FlightReader": (".reader", "FlightReader"),
+    "OpenSkyAuth": (".auth", "OpenSkyAuth"),
+    "OpenSkyBasicAuth": (".auth", "OpenSkyBasicAuth"),
+    "create_auth_from_config": (".auth", "create_auth_from_config"),
+}
 
 __all__ = [
     # Main classes
+    "Config",
     "FlightDatabase",
     "FlightCollector",
     "FlightReader",
@@ -33,3 +42,18 @@ __all__ = [
     "OpenSkyBasicAuth",
     "create_auth_from_config",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
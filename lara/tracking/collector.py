@@ -2,17 +2,36 @@
 LARA Flight Collector with OAuth2 Authentication
 """
 
+import logging
+import random
 import requests
+import sys
 import time
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .database import FlightDatabase
 from lara.config import Config, Settings, Constants
-from lara.utils import haversine_distance, get_bounding_box, parse_state_vector
-from .auth import create_auth_from_config
+from lara.utils import (
+    HomePoint,
+    get_bounding_box,
+    haversine_from,
+    json_loads,
+    parse_state_vector,
+    parse_states_columnar,
+    validate_coordinates_batch,
+)
+from .geo_fast import haversine_batch
+from .auth import create_auth_from_config, create_session
 
 OPENSKY_URL = "https://opensky-network.org/api/states/all"
 OPENSKY_TIMEOUT = 10
+RATE_LIMIT_BACKOFF_BASE = 60  # Seconds, ceiling of the first wait (30-60 s)
+RATE_LIMIT_BACKOFF_CAP = 300
+FLIGHT_ID_CACHE_SIZE = 2048  # Recently seen (icao24, callsign) sessions
+
+logger = logging.getLogger(__name__)
 
 
 class FlightCollector:
@@ -29,14 +48,48 @@ class FlightCollector:
         self.db = FlightDatabase(config.db_path)
         self.home_lat = config.home_latitude
         self.home_lon = config.home_longitude
+        self.home = HomePoint(self.home_lat, self.home_lon)
         self.radius_km = config.radius_km
         self.update_interval = max(config.update_interval, Settings.MIN_UPDATE_INTERVAL)
+        self.archive_after_days = config.get("database.archive_after_days")
         self.api_url = OPENSKY_URL
         self.api_timeout = OPENSKY_TIMEOUT
 
+        # Query box is fixed for the collector's lifetime
+        try:
+            lamin, lomin, lamax, lomax = get_bounding_box(
+                self.home_lat, self.home_lon, self.radius_km
+            )
+            self._bbox_params: Optional[Dict[str, float]] = {
+                "lamin": lamin,
+                "lomin": lomin,
+                "lamax": lamax,
+                "lomax": lomax,
+            }
+        except Exception as e:
+            logger.error("⚠️  Error calculating bounding box: %s", e)
+            self._bbox_params = None
+
+        # Scan-by-scan console table only on a terminal; logging otherwise
+        self.interactive = sys.stdout.isatty()
+
         # Initialize OAuth2 authentication
         self.auth = create_auth_from_config(config)
 
+        # Keep-alive session reused for every poll
+        self._session = create_session()
+
+        # (icao24, callsign) -> (flight_id, last seen epoch), oldest first
+        self._flight_id_cache: OrderedDict = OrderedDict()
+        self._session_timeout = Settings.FLIGHT_SESSION_TIMEOUT_MINUTES * 60
+
+        # icao24 -> (flight_id, rounded lat, lon, altitude, seen epoch) of the
+        # last stored position; repeats within a flight only advance last_seen.
+        # Entries for a scan are staged until its bulk write succeeds
+        self._last_pos: Dict[str, Tuple[int, float, float, float, float]] = {}
+        self._pending_last_pos: Dict[str, Tuple[int, float, float, float, float]] = {}
+        self._pending_touches: List[Tuple[str, int]] = []
+
         self.iteration_count = 0
         self.last_date = None
         self.consecutive_empty_scans = 0
@@ -51,17 +104,10 @@ class FlightCollector:
         Returns:
             List of state vectors from API, or empty list if no data
         """
-        # Get bounding box for API query
-        try:
-            lamin, lomin, lamax, lomax = get_bounding_box(
-                self.home_lat, self.home_lon, self.radius_km
-            )
-        except Exception as e:
-            print(f"⚠️  Error calculating bounding box: {e}")
+        params = self._bbox_params
+        if params is None:
             return []
 
-        params = {"lamin": lamin, "lomin": lomin, "lamax": lamax, "lomax": lomax}
-
         # Enforce minimum time between requests
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
@@ -70,18 +116,13 @@ class FlightCollector:
             time.sleep(self.update_interval - time_since_last)
 
         try:
-            # Use OAuth2 if available, otherwise anonymous
-            if self.auth:
-                response = self.auth.make_authenticated_request(
-                    self.api_url, params=params, timeout=self.api_timeout
-                )
-            else:
-                response = requests.get(
-                    self.api_url, params=params, timeout=self.api_timeout
-                )
-
+            # Spacing is measured between request starts, so the run loop's
+            # schedule isn't pushed back by the API's response time
             self.last_request_time = time.time()
 
+            # Use OAuth2 if available, otherwise anonymous
+            response = self._get(params)
+
             # Handle rate limiting (429 error)
             if response.status_code == 429:
                 self.rate_limit_count += 1
@@ -94,38 +135,35 @@ class FlightCollector:
                     except Exception:
                         wait_time = 60
                 else:
-                    wait_time = min(60 * self.rate_limit_count, 300)
+                    wait_time = self._backoff_delay()
 
-                print("⚠️  Rate limited by OpenSky Network (429)")
-                print(f"   This is hit #{self.rate_limit_count}")
-                print(f"   Waiting {wait_time} seconds before retrying...")
+                logger.warning(
+                    "⚠️  Rate limited by OpenSky Network (429), hit #%d; "
+                    "waiting %.0f seconds before retrying...",
+                    self.rate_limit_count,
+                    wait_time,
+                )
 
                 if not self.auth:
-                    print("   💡 Tip: Set up OAuth2 authentication for better limits")
-                    print("   💡 Download credentials.json from opensky-network.org")
+                    logger.info(
+                        "   💡 Tip: Set up OAuth2 authentication for better limits "
+                        "(download credentials.json from opensky-network.org)"
+                    )
 
                 time.sleep(wait_time)
 
                 # Try again after waiting
                 try:
-                    if self.auth:
-                        response = self.auth.make_authenticated_request(
-                            self.api_url, params=params, timeout=self.api_timeout
-                        )
-                    else:
-                        response = requests.get(
-                            self.api_url, params=params, timeout=self.api_timeout
-                        )
-
                     self.last_request_time = time.time()
+                    response = self._get(params)
 
                     if response.status_code == 429:
-                        print(
+                        logger.warning(
                             "   Still rate limited after waiting. Skipping this scan."
                         )
                         return []
                 except Exception as e:
-                    print(f"   Retry failed: {e}")
+                    logger.error("   Retry failed: %s", e)
                     return []
 
             # Raise for other HTTP errors
@@ -134,7 +172,8 @@ class FlightCollector:
             # Reset rate limit counter on success
             self.rate_limit_count = 0
 
-            data = response.json()
+            # Decode the raw body; orjson when installed (see lara.utils)
+            data = json_loads(response.content)
 
             # Handle different response structures
             if not data:
@@ -154,7 +193,7 @@ class FlightCollector:
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401:
-                print(
+                logger.error(
                     "❌ Authentication failed (401): Your OAuth2 credentials may be invalid, check your credentials.json file"
                 )
                 return []
@@ -162,27 +201,127 @@ class FlightCollector:
                 # Already handled above
                 return []
             else:
-                print(f"❌ HTTP Error {e.response.status_code}: {e}")
+                logger.error("❌ HTTP Error %s: %s", e.response.status_code, e)
                 return []
 
         except requests.exceptions.Timeout:
-            print(f"⚠️  API request timeout after {self.api_timeout}s")
+            logger.warning("⚠️  API request timeout after %ss", self.api_timeout)
             return []
 
         except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching data: {e}")
+            logger.error("❌ Error fetching data: %s", e)
             return []
 
         except ValueError as e:
-            print(f"❌ Error parsing API response: {e}")
+            logger.error("❌ Error parsing API response: %s", e)
             return []
 
         except Exception as e:
-            print(f"❌ Unexpected error fetching flights: {e}")
+            logger.error("❌ Unexpected error fetching flights: %s", e)
             return []
 
-    def process_flight(self, state: list, timestamp: str) -> Optional[Dict[str, Any]]:
-        """Process a single flight state vector."""
+    def _get(self, params: Dict[str, float]) -> requests.Response:
+        """Send one states request on the shared session, authenticated if set up."""
+        if self.auth:
+            return self.auth.make_authenticated_request(
+                self.api_url,
+                params=params,
+                timeout=self.api_timeout,
+                session=self._session,
+            )
+        return self._session.get(self.api_url, params=params, timeout=self.api_timeout)
+
+    def _backoff_delay(self) -> float:
+        """
+        Exponential backoff with equal jitter for repeated 429 responses.
+
+        Half the ceiling is always waited, so a retry never follows the 429
+        immediately; the other half is randomized to spread out clients.
+
+        Returns:
+            Seconds to wait, uniform in [ceiling / 2, ceiling] with
+            ceiling = min(cap, base * 2^(hits-1))
+        """
+        exponent = max(self.rate_limit_count - 1, 0)
+        ceiling = min(RATE_LIMIT_BACKOFF_CAP, RATE_LIMIT_BACKOFF_BASE * 2**exponent)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def _lookup_flight_id(
+        self, icao24: str, callsign: str, origin_country: str, timestamp: str
+    ) -> int:
+        """
+        Resolve the flight session for an aircraft, avoiding the database
+        for aircraft seen within the session timeout.
+
+        On a cache hit the flight's last_seen is advanced by the position
+        write (see ``FlightDatabase.add_positions_bulk``).
+
+        Args:
+            icao24: Aircraft ICAO 24-bit address
+            callsign: Flight callsign
+            origin_country: Country of origin
+            timestamp: Current timestamp (ISO format)
+
+        Returns:
+            Flight ID
+        """
+        key = (icao24, callsign)
+        seen_at = datetime.fromisoformat(timestamp).timestamp()
+
+        entry = self._flight_id_cache.get(key)
+        if entry and 0 <= seen_at - entry[1] < self._session_timeout:
+            flight_id = entry[0]
+            self._flight_id_cache.move_to_end(key)
+        else:
+            flight_id = self.db.get_or_create_flight(
+                icao24, callsign, origin_country, timestamp
+            )
+
+        self._flight_id_cache[key] = (flight_id, seen_at)
+        if len(self._flight_id_cache) > FLIGHT_ID_CACHE_SIZE:
+            self._flight_id_cache.popitem(last=False)
+
+        return flight_id
+
+    def compute_distances(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Distance from home for a whole scan in one vectorized pass.
+
+        Args:
+            columns: Scan decoded by ``parse_states_columnar``
+
+        Returns:
+            Distances in km, NaN for malformed states or missing positions
+        """
+        lats = columns["latitude"]
+        return haversine_batch(
+            self.home_lat,
+            self.home_lon,
+            lats,
+            columns["longitude"],
+            np.empty(len(lats), dtype=np.float64),
+        )
+
+    def process_flight(
+        self,
+        state: list,
+        timestamp: str,
+        pending: Optional[list] = None,
+        distance: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Process a single flight state vector.
+
+        Args:
+            state: Raw state vector from the API
+            timestamp: Scan timestamp
+            pending: If given, the position row is appended here for a later
+                ``add_positions_bulk`` call instead of being written immediately
+            distance: Precomputed distance from home; skips the radius check
+
+        Returns:
+            Flight info dictionary, or None if the state was skipped
+        """
         try:
             if not state or not isinstance(state, list):
                 return None
@@ -195,10 +334,11 @@ class FlightCollector:
             if lat is None or lon is None:
                 return None
 
-            distance = haversine_distance(self.home_lat, self.home_lon, lat, lon)
+            if distance is None:
+                distance = haversine_from(self.home, lat, lon)
 
-            if distance > self.radius_km:
-                return None
+                if distance > self.radius_km:
+                    return None
 
             icao24 = state_data.get("icao24")
             if not icao24:
@@ -207,11 +347,35 @@ class FlightCollector:
             callsign = state_data.get("callsign") or "UNKNOWN"
             origin_country = state_data.get("origin_country") or "Unknown"
 
-            flight_id = self.db.get_or_create_flight(
+            flight_id = self._lookup_flight_id(
                 icao24, callsign, origin_country, timestamp
             )
 
-            self.db.add_position(flight_id, state_data, distance, timestamp)
+            altitude = state_data.get("baro_altitude")
+            position_key = (
+                flight_id,
+                round(lat, 5),
+                round(lon, 5),
+                round(altitude or 0),
+            )
+            last = self._last_pos.get(icao24)
+
+            if last is not None and last[:4] == position_key:
+                # Aircraft hasn't moved at reporting resolution
+                if pending is None:
+                    self.db.add_positions_bulk([], touched=[(timestamp, flight_id)])
+                else:
+                    self._pending_touches.append((timestamp, flight_id))
+            elif pending is None:
+                self.db.add_position(flight_id, state_data, distance, timestamp)
+            else:
+                pending.append((flight_id, state_data, distance, timestamp))
+
+            entry = position_key + (datetime.fromisoformat(timestamp).timestamp(),)
+            if pending is None:
+                self._last_pos[icao24] = entry
+            else:
+                self._pending_last_pos[icao24] = entry
 
             return {
                 "flight_id": flight_id,
@@ -225,6 +389,31 @@ class FlightCollector:
         except Exception:
             return None
 
+    def _archive_old_flights(self):
+        """Move flights older than database.archive_after_days to the archive."""
+        try:
+            archived = self.db.archive_older_than(int(self.archive_after_days))
+            if archived:
+                logger.info("🗄️  Archived %d flight(s)", archived)
+        except Exception as e:
+            logger.warning("⚠️  Archival failed: %s", e)
+
+    def _trim_position_cache(self, now: float):
+        """Forget last positions of aircraft gone longer than a session."""
+        cutoff = now - self._session_timeout
+        self._last_pos = {
+            icao24: entry
+            for icao24, entry in self._last_pos.items()
+            if entry[4] >= cutoff
+        }
+
+    def _report_scan(self, message: str, *args):
+        """Finish the scan's console line, or log it when not on a terminal."""
+        if self.interactive:
+            print(message % args)
+        else:
+            logger.info("Scan #%d: " + message, self.iteration_count, *args)
+
     def display_flight_info(self, flight_info: Dict[str, Any]):
         """Display flight information to console."""
         callsign = flight_info.get("callsign", "UNKNOWN")
@@ -296,10 +485,11 @@ class FlightCollector:
         timestamp = datetime.now().isoformat()
         current_date = datetime.now().date()
 
-        print(
-            f"[{datetime.now().strftime('%H:%M:%S')}] Scan #{self.iteration_count}...",
-            end=" ",
-        )
+        if self.interactive:
+            print(
+                f"[{datetime.now().strftime('%H:%M:%S')}] Scan #{self.iteration_count}...",
+                end=" ",
+            )
 
         flights = self.fetch_flights()
 
@@ -308,39 +498,71 @@ class FlightCollector:
             self.total_empty_scans += 1
 
             if self.consecutive_empty_scans == 1:
-                print("No flights detected")
+                self._report_scan("No flights detected")
             elif self.consecutive_empty_scans >= 2:
-                print(
-                    f"No flights detected ({self.consecutive_empty_scans} consecutive)"
+                self._report_scan(
+                    "No flights detected (%d consecutive)",
+                    self.consecutive_empty_scans,
                 )
 
             return 0
 
         detected_flights = []
-        for state in flights:
-            flight_info = self.process_flight(state, timestamp)
+        pending_positions = []
+        # Columnar decode and radius filter for the whole scan before any
+        # per-aircraft parsing or database work
+        columns = parse_states_columnar(flights)
+        distances = self.compute_distances(columns)
+        in_range = (distances <= self.radius_km) & validate_coordinates_batch(
+            columns["latitude"], columns["longitude"]
+        )
+        for index in np.flatnonzero(in_range):
+            flight_info = self.process_flight(
+                flights[index],
+                timestamp,
+                pending_positions,
+                distance=float(distances[index]),
+            )
             if flight_info:
                 detected_flights.append(flight_info)
 
+        # One transaction for all positions of this scan
+        touches, self._pending_touches = self._pending_touches, []
+        last_positions, self._pending_last_pos = self._pending_last_pos, {}
+        self.db.add_positions_bulk(pending_positions, touched=touches)
+        self._last_pos.update(last_positions)
+
+        if self.iteration_count % 10 == 0:
+            self._trim_position_cache(time.time())
+
         if not detected_flights:
             self.consecutive_empty_scans += 1
             self.total_empty_scans += 1
-            print("No flights within tracking radius")
+            self._report_scan("No flights within tracking radius")
             return 0
 
         detected_flights.sort(key=lambda x: x["distance"])
 
-        print(f"Found {len(detected_flights)} flight(s)")
-
-        for flight_info in detected_flights:
-            self.display_flight_info(flight_info)
+        self._report_scan("Found %d flight(s)", len(detected_flights))
+
+        if self.interactive:
+            for flight_info in detected_flights:
+                self.display_flight_info(flight_info)
+        elif logger.isEnabledFor(logging.DEBUG):
+            for flight_info in detected_flights:
+                logger.debug(
+                    "  %s | %.1f km | %s m",
+                    flight_info["callsign"],
+                    flight_info["distance"],
+                    flight_info["altitude"],
+                )
 
         if self.last_date != current_date:
             if self.last_date:
                 try:
                     self.db.update_daily_stats(self.last_date.isoformat())
                 except Exception as e:
-                    print(f"⚠️  Error updating daily stats: {e}")
+                    logger.warning("⚠️  Error updating daily stats: %s", e)
             self.last_date = current_date
 
         return len(detected_flights)
@@ -353,13 +575,23 @@ class FlightCollector:
         print("\n🔄 Starting data collection... (Press Ctrl+C to stop)\n")
 
         try:
+            # Scans start on a fixed schedule; time spent fetching and
+            # writing comes out of the interval instead of adding to it
+            next_scan = time.monotonic()
             while True:
+                next_scan += self.update_interval
                 try:
                     self.run_single_iteration()
                 except Exception as e:
                     print(f"\n⚠️  Error in iteration {self.iteration_count}: {e}")
                     print("   Continuing with next scan...")
 
+                if (
+                    self.archive_after_days
+                    and self.iteration_count % Settings.ARCHIVE_CHECK_ITERATIONS == 0
+                ):
+                    self._archive_old_flights()
+
                 if self.iteration_count % 10 == 0:
                     try:
                         stats = self.db.get_statistics()
@@ -385,7 +617,12 @@ class FlightCollector:
                     except Exception as e:
                         print(f"⚠️  Could not display stats: {e}")
 
-                time.sleep(self.update_interval)
+                delay = next_scan - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Overran (e.g. a 429 wait); restart the schedule from now
+                    next_scan = time.monotonic()
 
         except KeyboardInterrupt:
             self._handle_shutdown()
@@ -433,3 +670,6 @@ class FlightCollector:
         except Exception as e:
             print(f"⚠️  Error displaying final statistics: {e}")
             print(f"💾 Data saved to: {self.config.db_path}")
+
+        self._session.close()
+        self.db.close()
@@ -3,14 +3,197 @@ LARA Database Management
 SQLite database operations for storing and querying flight data.
 """
 
+import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Iterable, Iterator, Optional, List, Dict, Any, Tuple
 from lara.config import Settings
 
+logger = logging.getLogger(__name__)
+
+# Connection tuning applied once per connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # Readers don't block the collector's writes
+    "PRAGMA synchronous=NORMAL",  # Durable in WAL mode, fsync at checkpoints
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+
+def configure_connection(conn: sqlite3.Connection, query_only: bool = False):
+    """
+    Apply LARA's SQLite tuning to a connection.
+
+    Args:
+        conn: Open connection
+        query_only: Reject writes on this connection (for readers)
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None  # Plain tuples whatever the connection uses
+    for pragma in _CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    if query_only:
+        cursor.execute("PRAGMA query_only=1")
+
+    mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    if mode != "wal":
+        logger.warning(
+            "SQLite journal mode is %s, not WAL; readers and the collector "
+            "will block each other",
+            mode,
+        )
+
+
+def optimize_connection(conn: sqlite3.Connection):
+    """
+    Let SQLite refresh planner statistics before a connection closes.
+
+    Best effort: skipped silently if the database can't be written.
+    """
+    try:
+        conn.execute("PRAGMA query_only=0")
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+
+
+# Hot-path statements; constant text lets sqlite3's statement cache reuse
+# the prepared statements on the persistent connection
+SQL_GET_FLIGHT = """
+    SELECT id FROM flights
+    WHERE icao24 = ? AND callsign = ?
+    AND last_seen > ?
+    ORDER BY last_seen DESC LIMIT 1
+"""
+
+SQL_UPDATE_LASTSEEN = "UPDATE flights SET last_seen = ? WHERE id = ?"
+
+# Lookup and last_seen bump in one statement (RETURNING needs SQLite 3.35+)
+SQL_TOUCH_FLIGHT = """
+    UPDATE flights SET last_seen = ?
+    WHERE id = (
+        SELECT id FROM flights
+        WHERE icao24 = ? AND callsign = ?
+        AND last_seen > ?
+        ORDER BY last_seen DESC LIMIT 1
+    )
+    RETURNING id
+"""
+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+SQL_AIRCRAFT_KNOWN = "SELECT 1 FROM flights WHERE icao24 = ? LIMIT 1"
+
+# Running totals behind get_statistics(), kept in the singleton row id = 1
+SQL_REBUILD_COUNTERS = """
+    INSERT OR REPLACE INTO stats_counters (
+        id, total_flights, unique_aircraft, total_positions, sum_altitude,
+        count_altitude, min_distance, first_observation, last_observation
+    )
+    SELECT
+        1,
+        COUNT(*),
+        COUNT(DISTINCT icao24),
+        (SELECT COUNT(*) FROM positions),
+        (SELECT COALESCE(SUM(altitude_m), 0) FROM positions),
+        (SELECT COUNT(altitude_m) FROM positions),
+        (SELECT MIN(distance_from_home_km) FROM positions),
+        MIN(first_seen),
+        MAX(last_seen)
+    FROM flights
+"""
+
+SQL_COUNT_FLIGHT = """
+    UPDATE stats_counters SET
+        total_flights = total_flights + 1,
+        unique_aircraft = unique_aircraft + ?,
+        first_observation = MIN(COALESCE(first_observation, ?), ?),
+        last_observation = MAX(COALESCE(last_observation, ?), ?)
+    WHERE id = 1
+"""
+
+SQL_COUNT_LASTSEEN = """
+    UPDATE stats_counters SET
+        last_observation = MAX(COALESCE(last_observation, ?), ?)
+    WHERE id = 1
+"""
+
+SQL_COUNT_POSITIONS = """
+    UPDATE stats_counters SET
+        total_positions = total_positions + ?,
+        sum_altitude = sum_altitude + ?,
+        count_altitude = count_altitude + ?,
+        min_distance = COALESCE(MIN(min_distance, ?), ?, min_distance),
+        last_observation = MAX(COALESCE(last_observation, ?), ?)
+    WHERE id = 1
+"""
+
+SQL_INSERT_FLIGHT = """
+    INSERT INTO flights (
+        icao24, callsign, origin_country, country_id, first_seen, last_seen
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_COUNTRY = "INSERT OR IGNORE INTO countries (name) VALUES (?)"
+
+SQL_GET_COUNTRY = "SELECT id FROM countries WHERE name = ?"
+
+SQL_INSERT_POSITION = """
+    INSERT INTO positions (
+        flight_id, timestamp, latitude, longitude, altitude_m, geo_altitude_m,
+        velocity_ms, heading, vertical_rate_ms, distance_from_home_km,
+        on_ground, squawk
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Applies one scan's per-flight aggregates; NULLs keep the stored extremes
+SQL_UPDATE_FLIGHT_STATS = """
+    UPDATE flights SET
+        last_seen = MAX(COALESCE(last_seen, ?), ?),
+        position_count = position_count + ?,
+        min_distance_km = COALESCE(MIN(min_distance_km, ?), ?, min_distance_km),
+        max_altitude_m = COALESCE(MAX(max_altitude_m, ?), ?, max_altitude_m),
+        min_altitude_m = COALESCE(MIN(min_altitude_m, ?), ?, min_altitude_m)
+    WHERE id = ?
+"""
+
+# Flight session window; last_seen is compared as an ISO string against a
+# cutoff computed here, so SQLite can range-seek the index instead of
+# calling datetime() on every candidate row
+_SESSION_TIMEOUT = timedelta(minutes=Settings.FLIGHT_SESSION_TIMEOUT_MINUTES)
+
+# archive_older_than() rewrites the live file with VACUUM (holding the
+# writer lock) only once this share of its pages is free; smaller gaps are
+# reused by later inserts anyway
+VACUUM_FREE_FRACTION = 0.25
+
+
+@lru_cache(maxsize=256)
+def _iso_timestamp(timestamp: str) -> str:
+    """
+    Canonical 'T'-separated ISO form of a timestamp.
+
+    first_seen/last_seen are compared as text, which only orders correctly
+    when every value uses the same separator ('2024-01-01 12:10:00' sorts
+    before '2024-01-01T12:00:00'), so all written and bound values go
+    through here. Cached since a scan stamps every row with one timestamp.
+    """
+    return datetime.fromisoformat(timestamp).isoformat()
+
 
 class FlightDatabase:
-    """Manages SQLite database for flight data storage."""
+    """
+    Manages SQLite database for flight data storage.
+
+    Holds one long-lived connection in autocommit mode; writes are grouped
+    into explicit transactions and serialized with a lock so the instance
+    can be shared between threads.
+    """
 
     def __init__(self, db_path: str):
         """
@@ -20,17 +203,65 @@ class FlightDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._country_ids: Dict[str, int] = {}
         self._ensure_data_directory()
+        self._conn = self._connect()
         self.init_database()
 
     def _ensure_data_directory(self):
         """Ensure the data directory exists."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection and apply tuning pragmas."""
+        conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run a block of statements in a single transaction.
+
+        Yields:
+            Cursor on the shared connection; committed on success,
+            rolled back if the block raises
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            # Take the write lock up front: a deferred transaction that
+            # upgrades from read to write can't wait on the busy timeout
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                # Ids handed out inside the rolled-back transaction are void
+                self._country_ids.clear()
+                raise
+            cursor.execute("COMMIT")
+
     def init_database(self):
         """Initialize database with required tables and indexes."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            self._create_schema(cursor)
+
+            # Give the planner statistics once there is data to describe
+            has_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if (
+                not has_stats
+                and cursor.execute("SELECT 1 FROM flights LIMIT 1").fetchone()
+            ):
+                cursor.execute("ANALYZE")
+
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create tables and indexes if they don't exist."""
 
         # Table for unique flights (one entry per flight session)
         cursor.execute("""
@@ -39,6 +270,7 @@ class FlightDatabase:
                 icao24 TEXT NOT NULL,
                 callsign TEXT,
                 origin_country TEXT,
+                country_id INTEGER REFERENCES countries(id),
                 first_seen TIMESTAMP,
                 last_seen TIMESTAMP,
                 min_distance_km REAL,
@@ -50,6 +282,15 @@ class FlightDatabase:
             )
         """)
 
+        # Country dimension; flights reference it through country_id
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS countries (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        """)
+        self._migrate_country_ids(cursor)
+
         # Table for position updates (tracking route over time)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS positions (
@@ -70,6 +311,23 @@ class FlightDatabase:
             )
         """)
 
+        # Running totals for get_statistics(); built once from existing data
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_flights INTEGER NOT NULL,
+                unique_aircraft INTEGER NOT NULL,
+                total_positions INTEGER NOT NULL,
+                sum_altitude REAL NOT NULL,
+                count_altitude INTEGER NOT NULL,
+                min_distance REAL,
+                first_observation TIMESTAMP,
+                last_observation TIMESTAMP
+            )
+        """)
+        if cursor.execute("SELECT 1 FROM stats_counters").fetchone() is None:
+            cursor.execute(SQL_REBUILD_COUNTERS)
+
         # Table for daily statistics
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS daily_stats (
@@ -83,24 +341,130 @@ class FlightDatabase:
         """)
 
         # Create indexes for better query performance
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_flights_icao24 ON flights(icao24)"
-        )
+        # Session lookup in get_or_create_flight: equality on icao24/callsign,
+        # newest last_seen first; also covers plain icao24 lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_flights_icao_call_lastseen
+            ON flights(icao24, callsign, last_seen DESC)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_flights_icao24")
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_flights_callsign ON flights(callsign)"
         )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_flights_first_seen ON flights(first_seen)"
         )
+        # Closest-approach listings; rows without a distance are never ranked
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_flights_min_dist ON flights(min_distance_km)
+            WHERE min_distance_km IS NOT NULL
+        """)
+        # Route retrieval: a flight's positions already in time order, and
+        # covering for the track columns the map plotter reads; also serves
+        # plain flight_id lookups, replacing idx_positions_flight_(id|ts)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_positions_flight_track
+            ON positions(flight_id, timestamp, latitude, longitude, altitude_m)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_positions_flight_id")
+        cursor.execute("DROP INDEX IF EXISTS idx_positions_flight_ts")
+        # Covers the closest-point join in FlightReader.get_closest_flights
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_positions_flight_dist
+            ON positions(flight_id, distance_from_home_km, latitude, longitude)
+        """)
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_positions_flight_id ON positions(flight_id)"
+            "CREATE INDEX IF NOT EXISTS idx_positions_timestamp ON positions(timestamp)"
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_positions_timestamp ON positions(timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_positions_alt ON positions(altitude_m)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_positions_dist ON positions(distance_from_home_km)"
         )
+        self._create_callsign_index(cursor)
+
+    def _create_callsign_index(self, cursor: sqlite3.Cursor):
+        """
+        Maintain flights_fts, a trigram index over flights.callsign.
+
+        Substring searches (``callsign LIKE '%DLH%'``) cannot use a B-tree
+        index; the trigram tokenizer answers them from the FTS index. Skipped
+        with a warning when SQLite is built without FTS5.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'flights_fts'"
+        ).fetchone()
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS flights_fts USING fts5(
+                    callsign, content='flights', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning("Callsign search index unavailable: %s", e)
+            return
+
+        # External-content table: the triggers keep it in step with flights
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS flights_fts_ai AFTER INSERT ON flights
+            BEGIN
+                INSERT INTO flights_fts (rowid, callsign)
+                VALUES (new.id, new.callsign);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS flights_fts_ad AFTER DELETE ON flights
+            BEGIN
+                INSERT INTO flights_fts (flights_fts, rowid, callsign)
+                VALUES ('delete', old.id, old.callsign);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS flights_fts_au
+            AFTER UPDATE OF callsign ON flights
+            BEGIN
+                INSERT INTO flights_fts (flights_fts, rowid, callsign)
+                VALUES ('delete', old.id, old.callsign);
+                INSERT INTO flights_fts (rowid, callsign)
+                VALUES (new.id, new.callsign);
+            END
+        """)
+        if not exists:
+            cursor.execute("INSERT INTO flights_fts (flights_fts) VALUES ('rebuild')")
+
+    def _migrate_country_ids(self, cursor: sqlite3.Cursor):
+        """Add flights.country_id to older databases and backfill it."""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(flights)")}
+        if "country_id" not in columns:
+            cursor.execute(
+                "ALTER TABLE flights ADD COLUMN country_id INTEGER REFERENCES countries(id)"
+            )
+
+        cursor.execute("""
+            INSERT OR IGNORE INTO countries (name)
+            SELECT DISTINCT origin_country FROM flights
+            WHERE country_id IS NULL AND origin_country IS NOT NULL
+        """)
+        cursor.execute("""
+            UPDATE flights
+            SET country_id = (SELECT id FROM countries WHERE name = origin_country)
+            WHERE country_id IS NULL AND origin_country IS NOT NULL
+        """)
 
-        conn.commit()
-        conn.close()
+    def _get_country_id(
+        self, cursor: sqlite3.Cursor, name: Optional[str]
+    ) -> Optional[int]:
+        """Resolve a country name to its id, inserting it on first use."""
+        if name is None:
+            return None
+        country_id = self._country_ids.get(name)
+        if country_id is None:
+            cursor.execute(SQL_INSERT_COUNTRY, (name,))
+            country_id = cursor.execute(SQL_GET_COUNTRY, (name,)).fetchone()[0]
+            self._country_ids[name] = country_id
+        return country_id
 
     def get_or_create_flight(
         self, icao24: str, callsign: Optional[str], origin_country: str, timestamp: str
@@ -120,41 +484,61 @@ class FlightDatabase:
         Returns:
             Flight ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Look for active flight (seen within timeout period)
-        cursor.execute(
-            f"""
-            SELECT id FROM flights 
-            WHERE icao24 = ? AND callsign = ?
-            AND datetime(last_seen) > datetime(?, '-{Settings.FLIGHT_SESSION_TIMEOUT_MINUTES} minutes')
-            ORDER BY last_seen DESC LIMIT 1
-        """,
-            (icao24, callsign, timestamp),
-        )
+        with self._transaction() as cursor:
+            return self._get_or_create_flight(
+                cursor, icao24, callsign, origin_country, timestamp
+            )
 
-        result = cursor.fetchone()
+    def _get_or_create_flight(
+        self,
+        cursor: sqlite3.Cursor,
+        icao24: str,
+        callsign: Optional[str],
+        origin_country: str,
+        timestamp: str,
+    ) -> int:
+        """Look up or insert a flight session inside an open transaction."""
+        timestamp = _iso_timestamp(timestamp)
+        cutoff = (datetime.fromisoformat(timestamp) - _SESSION_TIMEOUT).isoformat()
+
+        # Look for active flight (seen within timeout period) and bump last_seen
+        if _HAS_RETURNING:
+            result = cursor.execute(
+                SQL_TOUCH_FLIGHT, (timestamp, icao24, callsign, cutoff)
+            ).fetchone()
+        else:
+            result = cursor.execute(
+                SQL_GET_FLIGHT, (icao24, callsign, cutoff)
+            ).fetchone()
+            if result:
+                cursor.execute(SQL_UPDATE_LASTSEEN, (timestamp, result[0]))
 
         if result:
             flight_id = result[0]
-            # Update last_seen
+            cursor.execute(SQL_COUNT_LASTSEEN, (timestamp, timestamp))
+        else:
+            new_aircraft = (
+                cursor.execute(SQL_AIRCRAFT_KNOWN, (icao24,)).fetchone() is None
+            )
             cursor.execute(
-                "UPDATE flights SET last_seen = ? WHERE id = ?", (timestamp, flight_id)
+                SQL_COUNT_FLIGHT,
+                (int(new_aircraft), timestamp, timestamp, timestamp, timestamp),
             )
-        else:
+
             # Create new flight entry
             cursor.execute(
-                """
-                INSERT INTO flights (icao24, callsign, origin_country, first_seen, last_seen)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (icao24, callsign, origin_country, timestamp, timestamp),
+                SQL_INSERT_FLIGHT,
+                (
+                    icao24,
+                    callsign,
+                    origin_country,
+                    self._get_country_id(cursor, origin_country),
+                    timestamp,
+                    timestamp,
+                ),
             )
             flight_id = cursor.lastrowid
 
-        conn.commit()
-        conn.close()
         return flight_id
 
     def add_position(
@@ -173,70 +557,119 @@ class FlightDatabase:
             distance_km: Distance from home location
             timestamp: Position timestamp
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.add_positions_bulk([(flight_id, state_data, distance_km, timestamp)])
 
-        # Insert position
-        cursor.execute(
-            """
-            INSERT INTO positions (
-                flight_id, timestamp, latitude, longitude, altitude_m, geo_altitude_m,
-                velocity_ms, heading, vertical_rate_ms, distance_from_home_km, 
-                on_ground, squawk
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                flight_id,
-                timestamp,
-                state_data.get("latitude"),
-                state_data.get("longitude"),
-                state_data.get("baro_altitude"),
-                state_data.get("geo_altitude"),
-                state_data.get("velocity"),
-                state_data.get("true_track"),
-                state_data.get("vertical_rate"),
-                distance_km,
-                state_data.get("on_ground"),
-                state_data.get("squawk"),
-            ),
-        )
+    def add_positions_bulk(
+        self,
+        rows: Iterable[Tuple[int, Dict[str, Any], float, str]],
+        touched: Iterable[Tuple[str, int]] = (),
+    ) -> int:
+        """
+        Add many position updates in a single transaction.
 
-        # Update flight statistics
-        altitude = state_data.get("baro_altitude") or state_data.get("geo_altitude")
+        Each flight's aggregates and last_seen are advanced from its rows.
 
-        if altitude:
-            cursor.execute(
-                """
-                UPDATE flights SET
-                    position_count = position_count + 1,
-                    min_distance_km = COALESCE(MIN(min_distance_km, ?), ?),
-                    max_altitude_m = COALESCE(MAX(max_altitude_m, ?), ?),
-                    min_altitude_m = COALESCE(MIN(min_altitude_m, ?), ?)
-                WHERE id = ?
-            """,
+        Args:
+            rows: (flight_id, state_data, distance_km, timestamp) tuples
+            touched: (timestamp, flight_id) pairs for flights that were seen
+                without a new position; only their last_seen is advanced
+
+        Returns:
+            Number of positions inserted
+        """
+        pos_rows = []
+        # flight_id -> [count, min distance, max altitude, min altitude, last ts]
+        aggregates: Dict[int, list] = {}
+        for flight_id, state_data, distance_km, timestamp in rows:
+            timestamp = _iso_timestamp(timestamp)
+            pos_rows.append(
                 (
-                    distance_km,
-                    distance_km,
-                    altitude,
-                    altitude,
-                    altitude,
-                    altitude,
                     flight_id,
-                ),
+                    timestamp,
+                    state_data.get("latitude"),
+                    state_data.get("longitude"),
+                    state_data.get("baro_altitude"),
+                    state_data.get("geo_altitude"),
+                    state_data.get("velocity"),
+                    state_data.get("true_track"),
+                    state_data.get("vertical_rate"),
+                    distance_km,
+                    state_data.get("on_ground"),
+                    state_data.get("squawk"),
+                )
             )
-        else:
-            cursor.execute(
-                """
-                UPDATE flights SET
-                    position_count = position_count + 1,
-                    min_distance_km = COALESCE(MIN(min_distance_km, ?), ?)
-                WHERE id = ?
-            """,
-                (distance_km, distance_km, flight_id),
+            altitude = (
+                state_data.get("baro_altitude") or state_data.get("geo_altitude")
+            ) or None
+
+            agg = aggregates.get(flight_id)
+            if agg is None:
+                aggregates[flight_id] = [1, distance_km, altitude, altitude, timestamp]
+                continue
+            agg[0] += 1
+            agg[4] = max(agg[4], timestamp)
+            if distance_km is not None:
+                agg[1] = distance_km if agg[1] is None else min(agg[1], distance_km)
+            if altitude is not None:
+                agg[2] = altitude if agg[2] is None else max(agg[2], altitude)
+                agg[3] = altitude if agg[3] is None else min(agg[3], altitude)
+
+        # One UPDATE per flight rather than per position
+        upd_rows = [
+            (
+                last_ts,
+                last_ts,
+                count,
+                min_dist,
+                min_dist,
+                max_alt,
+                max_alt,
+                min_alt,
+                min_alt,
+                flight_id,
             )
-
-        conn.commit()
-        conn.close()
+            for flight_id, (
+                count,
+                min_dist,
+                max_alt,
+                min_alt,
+                last_ts,
+            ) in aggregates.items()
+        ]
+
+        touched = [(_iso_timestamp(ts), flight_id) for ts, flight_id in touched]
+        if not pos_rows and not touched:
+            return 0
+
+        with self._transaction() as cursor:
+            if pos_rows:
+                cursor.executemany(SQL_INSERT_POSITION, pos_rows)
+                cursor.executemany(SQL_UPDATE_FLIGHT_STATS, upd_rows)
+                cursor.execute(SQL_COUNT_POSITIONS, self._position_totals(pos_rows))
+            if touched:
+                cursor.executemany(SQL_UPDATE_LASTSEEN, touched)
+                last_ts = max(ts for ts, _ in touched)
+                cursor.execute(SQL_COUNT_LASTSEEN, (last_ts, last_ts))
+
+        return len(pos_rows)
+
+    @staticmethod
+    def _position_totals(pos_rows: List[tuple]) -> tuple:
+        """Parameters for SQL_COUNT_POSITIONS from stored position rows."""
+        altitudes = [row[4] for row in pos_rows if row[4] is not None]
+        min_distance = min(
+            (row[9] for row in pos_rows if row[9] is not None), default=None
+        )
+        last_ts = max(row[1] for row in pos_rows)
+        return (
+            len(pos_rows),
+            sum(altitudes),
+            len(altitudes),
+            min_distance,
+            min_distance,
+            last_ts,
+            last_ts,
+        )
 
     def update_daily_stats(self, date: str):
         """
@@ -245,11 +678,9 @@ class FlightDatabase:
         Args:
             date: Date in ISO format (YYYY-MM-DD)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
+        with self._transaction() as cursor:
+            cursor.execute(
+                """
             INSERT OR REPLACE INTO daily_stats 
             (date, total_flights, total_positions, avg_altitude_m, min_distance_km, updated_at)
             SELECT 
@@ -263,48 +694,178 @@ class FlightDatabase:
             LEFT JOIN positions p ON f.id = p.flight_id
             WHERE DATE(p.timestamp) = DATE(?)
         """,
-            (date, date),
-        )
-
-        conn.commit()
-        conn.close()
+                (date, date),
+            )
 
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get overall database statistics.
 
         Returns:
-            Dictionary with statistical data
+            Dictionary with statistical data, read from the running
+            totals maintained on every write
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT f.id) as total_flights,
-                COUNT(DISTINCT f.icao24) as unique_aircraft,
-                COUNT(p.id) as total_positions,
-                AVG(p.altitude_m) as avg_altitude,
-                MIN(p.distance_from_home_km) as closest_approach,
-                MIN(f.first_seen) as first_observation,
-                MAX(f.last_seen) as last_observation
-            FROM flights f
-            LEFT JOIN positions p ON f.id = p.flight_id
-        """)
-
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute("""
+            SELECT
+                total_flights, unique_aircraft, total_positions,
+                sum_altitude, count_altitude, min_distance,
+                first_observation, last_observation
+            FROM stats_counters WHERE id = 1
+        """).fetchone()
 
         return {
-            "total_flights": row[0] or 0,
-            "unique_aircraft": row[1] or 0,
-            "total_positions": row[2] or 0,
-            "avg_altitude_m": row[3] or 0,
-            "closest_approach_km": row[4],
-            "first_observation": row[5],
-            "last_observation": row[6],
+            "total_flights": row[0],
+            "unique_aircraft": row[1],
+            "total_positions": row[2],
+            "avg_altitude_m": row[3] / row[4] if row[4] else 0,
+            "closest_approach_km": row[5],
+            "first_observation": row[6],
+            "last_observation": row[7],
         }
 
+    def rebuild_statistics(self):
+        """
+        Recompute the running totals behind get_statistics() from scratch.
+
+        Needed after rows are deleted or edited outside FlightDatabase.
+        """
+        with self._transaction() as cursor:
+            cursor.execute(SQL_REBUILD_COUNTERS)
+
+    def archive_older_than(
+        self, days: int, archive_path: Optional[str] = None, vacuum: bool = True
+    ) -> int:
+        """
+        Move flights not seen for ``days`` days, with their positions, into
+        an archive database so the live tables stay small.
+
+        Args:
+            days: Age threshold on last_seen (at least 1, so active
+                sessions are never moved)
+            archive_path: Target database; defaults to
+                ``<db name>_archive_YYYYMM.db`` next to this database
+            vacuum: Reclaim the freed pages afterwards, once they make up
+                VACUUM_FREE_FRACTION of the file
+
+        Returns:
+            Number of flights archived
+        """
+        if days < 1:
+            raise ValueError("days must be at least 1")
+
+        now = datetime.now()
+        cutoff = (now - timedelta(days=days)).isoformat()
+        if archive_path is None:
+            db_file = Path(self.db_path)
+            archive_path = str(
+                db_file.with_name(f"{db_file.stem}_archive_{now:%Y%m}{db_file.suffix}")
+            )
+
+        # Full LARA schema (tables, indexes, counters) in the archive
+        FlightDatabase(archive_path).close()
+
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS arch", (archive_path,))
+            try:
+                archived = self._copy_to_archive(cutoff)
+                if archived:
+                    self._delete_archived()
+            finally:
+                self._conn.execute("DROP TABLE IF EXISTS temp.archive_ids")
+                self._conn.execute("DETACH DATABASE arch")
+
+            if archived and vacuum:
+                self._vacuum_if_fragmented()
+
+        if archived:
+            archive = FlightDatabase(archive_path)
+            archive.rebuild_statistics()
+            archive.close()
+
+        return archived
+
+    def _copy_to_archive(self, cutoff: str) -> int:
+        """
+        Copy flights last seen before ``cutoff``, with their positions, into
+        the attached ``arch`` database and commit.
+
+        Both files are in WAL mode, where SQLite commits each attached
+        database separately, so the copy is committed on its own before
+        anything is deleted. Rows are keyed on id, so re-running after an
+        interrupted archival skips rows that already arrived.
+
+        Returns:
+            Number of flights selected (kept in ``temp.archive_ids``)
+        """
+        with self._transaction() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE archive_ids AS "
+                "SELECT id FROM main.flights WHERE last_seen < ?",
+                (cutoff,),
+            )
+            archived = cursor.execute("SELECT COUNT(*) FROM archive_ids").fetchone()[0]
+            if not archived:
+                return 0
+
+            cursor.execute(
+                "INSERT OR IGNORE INTO arch.countries "
+                "SELECT id, name FROM main.countries"
+            )
+            for table, key in (("flights", "id"), ("positions", "flight_id")):
+                # Explicit columns: migrated databases order them differently
+                columns = ", ".join(
+                    row[1]
+                    for row in cursor.execute(
+                        f"PRAGMA main.table_info({table})"
+                    ).fetchall()
+                )
+                cursor.execute(
+                    f"INSERT OR IGNORE INTO arch.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table} "
+                    f"WHERE {key} IN (SELECT id FROM archive_ids)"
+                )
+        return archived
+
+    def _delete_archived(self):
+        """
+        Delete the flights in ``temp.archive_ids`` from the live tables once
+        every one of them and their positions is present in ``arch``.
+
+        Raises:
+            sqlite3.DatabaseError: If any selected row is missing from the
+                archive; nothing is deleted
+        """
+        with self._transaction() as cursor:
+            missing = cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM archive_ids
+                        WHERE id NOT IN (SELECT id FROM arch.flights))
+                    + (SELECT COUNT(*) FROM main.positions
+                        WHERE flight_id IN (SELECT id FROM archive_ids)
+                        AND id NOT IN (SELECT id FROM arch.positions))
+            """).fetchone()[0]
+            if missing:
+                raise sqlite3.DatabaseError(
+                    f"{missing} row(s) did not reach the archive; nothing deleted"
+                )
+
+            cursor.execute(
+                "DELETE FROM main.positions "
+                "WHERE flight_id IN (SELECT id FROM archive_ids)"
+            )
+            cursor.execute(
+                "DELETE FROM main.flights WHERE id IN (SELECT id FROM archive_ids)"
+            )
+            cursor.execute(SQL_REBUILD_COUNTERS)
+
+    def _vacuum_if_fragmented(self):
+        """VACUUM only once VACUUM_FREE_FRACTION of the file is free pages."""
+        free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        total = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        if total and free / total >= VACUUM_FREE_FRACTION:
+            self._conn.execute("VACUUM")
+
     def get_flight_by_id(self, flight_id: int) -> Optional[Dict[str, Any]]:
         """
         Get flight details by ID.
@@ -315,13 +876,10 @@ class FlightDatabase:
         Returns:
             Flight data dictionary or None
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM flights WHERE id = ?", (flight_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM flights WHERE id = ?", (flight_id,)
+            ).fetchone()
 
         return dict(row) if row else None
 
@@ -335,24 +893,22 @@ class FlightDatabase:
         Returns:
             List of position dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
+        with self._lock:
+            rows = self._conn.execute(
+                """
             SELECT * FROM positions 
             WHERE flight_id = ? 
             ORDER BY timestamp
         """,
-            (flight_id,),
-        )
-
-        rows = cursor.fetchall()
-        conn.close()
+                (flight_id,),
+            ).fetchall()
 
         return [dict(row) for row in rows]
 
     def close(self):
         """Close database connection."""
-        pass  # Using context managers, no persistent connection
+        with self._lock:
+            if self._conn is not None:
+                optimize_connection(self._conn)
+                self._conn.close()
+                self._conn = None
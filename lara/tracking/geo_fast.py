@@ -0,0 +1,53 @@
+"""
+LARA Compiled Geometry
+Numba-compiled distance kernels for the collector's per-scan hot path.
+Falls back to the NumPy/pure-Python implementations in lara.utils when
+numba is not installed (``pip install lara[speedups]``).
+"""
+
+import numpy as np
+
+from lara.utils import haversine_distance, haversine_distances
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba not installed
+    NUMBA_AVAILABLE = False
+
+# Scalar kernel; lara.utils JIT-compiles it when numba is installed
+haversine = haversine_distance
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, parallel=True)
+    def haversine_batch(
+        lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray, out: np.ndarray
+    ) -> np.ndarray:
+        """
+        Distances from one point to many, written into ``out``.
+
+        Args:
+            lat0: Reference latitude in degrees
+            lon0: Reference longitude in degrees
+            lats: Latitudes in degrees
+            lons: Longitudes in degrees
+            out: Output array, same length as ``lats``
+
+        Returns:
+            ``out``; NaN where a coordinate is NaN
+        """
+        for i in prange(lats.shape[0]):
+            out[i] = haversine_distance(lat0, lon0, lats[i], lons[i])
+        return out
+
+else:
+
+    def haversine_batch(
+        lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray, out: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized NumPy fallback with the same signature as the numba kernel."""
+        out[:] = haversine_distances(lat0, lon0, lats, lons)
+        return out
@@ -5,7 +5,55 @@ Query and analyze stored flight data.
 
 import sqlite3
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from lara.config import ALTITUDE_RANGES
+from .database import configure_connection, optimize_connection
+
+
+def _altitude_bands_sql() -> str:
+    """
+    Build one COUNT per lara.config.ALTITUDE_RANGES band, each a range seek
+    on idx_positions_alt instead of evaluating a CASE ladder for every row.
+
+    The lowest band is open below and the highest open above, so every
+    position with an altitude is counted once.
+    """
+    last = len(ALTITUDE_RANGES) - 1
+    bands = []
+    for i, (lo, hi, label) in enumerate(ALTITUDE_RANGES):
+        conditions = []
+        if i > 0:
+            conditions.append(f"altitude_m >= {lo!r}")
+        if i < last:
+            conditions.append(f"altitude_m < {hi!r}")
+        bands.append(
+            f"(SELECT COUNT(*) FROM positions WHERE {' AND '.join(conditions)})"
+            f' AS "{label}"'
+        )
+    return "SELECT " + ", ".join(bands)
+
+
+SQL_ALTITUDE_BANDS = _altitude_bands_sql()
+
+# Labels for get_altitude_distribution, in band order
+_ALTITUDE_LABELS = tuple(label for _, _, label in ALTITUDE_RANGES)
+
+
+@lru_cache(maxsize=64)
+def _column_names(description: tuple) -> Tuple[str, ...]:
+    """Column names for a result set, computed once per query shape."""
+    return tuple(column[0] for column in description)
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    """Row factory producing plain dicts, the shape every query returns."""
+    return dict(zip(_column_names(cursor.description), row))
+
+
+# Every reader query is a static SQL string with bound parameters, so each
+# is prepared once per connection and then served from this cache
+STATEMENT_CACHE_SIZE = 256
 
 
 class FlightReader:
@@ -19,12 +67,15 @@ class FlightReader:
             db_path: Path to database file
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        self.conn.row_factory = _dict_row
+        configure_connection(self.conn, query_only=True)
+        self._country_ids: Optional[bool] = None
 
     def close(self):
         """Close database connection."""
         if self.conn:
+            optimize_connection(self.conn)
             self.conn.close()
 
     def get_overview(self) -> Dict[str, Any]:
@@ -76,7 +127,7 @@ class FlightReader:
             (cutoff, limit),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def get_top_airlines(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most common airlines/callsigns."""
@@ -98,27 +149,60 @@ class FlightReader:
             (limit,),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
+
+    def _has_country_ids(self) -> bool:
+        """Whether flights reference the countries table (checked once)."""
+        if self._country_ids is None:
+            columns = self.conn.execute("PRAGMA table_info(flights)").fetchall()
+            self._country_ids = any(col["name"] == "country_id" for col in columns)
+        return self._country_ids
 
     def get_countries(self, limit: int = 15) -> List[Dict[str, Any]]:
         """Get flights by country."""
         cursor = self.conn.cursor()
 
+        if not self._has_country_ids():
+            # Database predates the countries table
+            cursor.execute(
+                """
+                SELECT 
+                    origin_country,
+                    COUNT(*) as flight_count,
+                    AVG(min_distance_km) as avg_min_distance
+                FROM flights
+                GROUP BY origin_country
+                ORDER BY flight_count DESC
+                LIMIT ?
+            """,
+                (limit,),
+            )
+            return cursor.fetchall()
+
+        # Group on the integer key, resolve names for the top rows only
         cursor.execute(
             """
             SELECT 
-                origin_country,
-                COUNT(*) as flight_count,
-                AVG(min_distance_km) as avg_min_distance
-            FROM flights
-            GROUP BY origin_country
-            ORDER BY flight_count DESC
-            LIMIT ?
+                c.name as origin_country,
+                agg.flight_count,
+                agg.avg_min_distance
+            FROM (
+                SELECT 
+                    country_id,
+                    COUNT(*) as flight_count,
+                    AVG(min_distance_km) as avg_min_distance
+                FROM flights
+                GROUP BY country_id
+                ORDER BY flight_count DESC
+                LIMIT ?
+            ) agg
+            LEFT JOIN countries c ON c.id = agg.country_id
+            ORDER BY agg.flight_count DESC
         """,
             (limit,),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def get_hourly_distribution(self) -> List[Dict[str, Any]]:
         """Get flight distribution by hour of day."""
@@ -133,43 +217,28 @@ class FlightReader:
             ORDER BY hour
         """)
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def get_altitude_distribution(self) -> List[Dict[str, Any]]:
         """Get altitude distribution."""
         cursor = self.conn.cursor()
 
-        cursor.execute("""
-            SELECT 
-                CASE 
-                    WHEN altitude_m < 1000 THEN '0-1000m'
-                    WHEN altitude_m < 3000 THEN '1000-3000m'
-                    WHEN altitude_m < 6000 THEN '3000-6000m'
-                    WHEN altitude_m < 9000 THEN '6000-9000m'
-                    WHEN altitude_m < 12000 THEN '9000-12000m'
-                    ELSE '12000m+'
-                END as altitude_range,
-                COUNT(*) as count
-            FROM positions
-            WHERE altitude_m IS NOT NULL
-            GROUP BY altitude_range
-            ORDER BY 
-                CASE 
-                    WHEN altitude_m < 1000 THEN 1
-                    WHEN altitude_m < 3000 THEN 2
-                    WHEN altitude_m < 6000 THEN 3
-                    WHEN altitude_m < 9000 THEN 4
-                    WHEN altitude_m < 12000 THEN 5
-                    ELSE 6
-                END
-        """)
+        cursor.execute(SQL_ALTITUDE_BANDS)
+        counts = cursor.fetchone()
 
-        return [dict(row) for row in cursor.fetchall()]
+        return [
+            {"altitude_range": label, "count": counts[label]}
+            for label in _ALTITUDE_LABELS
+            if counts[label]
+        ]
 
     def get_closest_flights(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get flights that came closest to home."""
         cursor = self.conn.cursor()
 
+        # Top flights from idx_flights_min_dist, then one closest position
+        # per flight from idx_positions_flight_dist (ties can't duplicate)
+
         cursor.execute(
             """
             SELECT 
@@ -181,17 +250,24 @@ class FlightReader:
                 f.min_altitude_m,
                 p.latitude,
                 p.longitude
-            FROM flights f
-            LEFT JOIN positions p ON f.id = p.flight_id 
-                AND p.distance_from_home_km = f.min_distance_km
-            WHERE f.min_distance_km IS NOT NULL
+            FROM (
+                SELECT * FROM flights
+                WHERE min_distance_km IS NOT NULL
+                ORDER BY min_distance_km ASC
+                LIMIT ?
+            ) f
+            LEFT JOIN positions p ON p.id = (
+                SELECT id FROM positions
+                WHERE flight_id = f.id
+                ORDER BY distance_from_home_km
+                LIMIT 1
+            )
             ORDER BY f.min_distance_km ASC
-            LIMIT ?
         """,
             (limit,),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def get_daily_stats(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get daily statistics."""
@@ -209,10 +285,37 @@ class FlightReader:
             GROUP BY DATE(first_seen)
             ORDER BY date DESC
         """,
-            (f"-{days} days",),
+            (f"-{int(days)} days",),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
+
+    def get_all_stats(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Get every summary statistic in one read transaction.
+
+        The shared lock is taken once for all queries, and the results
+        come from a single snapshot even while the collector writes.
+
+        Args:
+            days: Days of daily statistics to include
+
+        Returns:
+            Dictionary keyed by the name of each individual query
+        """
+        self.conn.execute("BEGIN")
+        try:
+            return {
+                "overview": self.get_overview(),
+                "top_airlines": self.get_top_airlines(),
+                "countries": self.get_countries(),
+                "hourly_distribution": self.get_hourly_distribution(),
+                "altitude_distribution": self.get_altitude_distribution(),
+                "daily_stats": self.get_daily_stats(days),
+                "closest_flights": self.get_closest_flights(),
+            }
+        finally:
+            self.conn.execute("COMMIT")
 
     def search_flight(self, callsign: str) -> List[Dict[str, Any]]:
         """Search for specific flight by callsign."""
@@ -234,7 +337,7 @@ class FlightReader:
             (f"%{callsign}%",),
         )
 
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
     def get_flight_route(self, flight_id: int) -> Optional[tuple]:
         """
@@ -243,6 +346,25 @@ class FlightReader:
         Returns:
             Tuple of (flight_data, positions_list)
         """
+        route = self.iter_flight_route(flight_id)
+        if route is None:
+            return None
+
+        flight, positions = route
+        return (flight, list(positions))
+
+    def iter_flight_route(
+        self, flight_id: int
+    ) -> Optional[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+        """
+        Get a flight's route with positions streamed from the cursor.
+
+        Long tracks are never held in memory at once; consume the
+        iterator before closing the reader.
+
+        Returns:
+            Tuple of (flight_data, positions_iterator)
+        """
         cursor = self.conn.cursor()
 
         # Get flight info
@@ -262,6 +384,4 @@ class FlightReader:
             (flight_id,),
         )
 
-        positions = cursor.fetchall()
-
-        return (dict(flight), [dict(p) for p in positions])
+        return (flight, iter(cursor))
@@ -3,11 +3,48 @@ LARA Utility Functions
 Common utility functions for distance calculations and data processing.
 """
 
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
 from math import radians, sin, cos, sqrt, atan2, degrees
-from typing import Tuple
-from .config import Constants
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, Final, Sequence, Tuple
 
+import numpy as np
 
+from .config import ALTITUDE_CLASSES, DISTANCE_CLASSES, Constants
+
+# JSON decoding for str/bytes payloads; orjson is an optional speedup and
+# its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    from orjson import loads as json_loads  # noqa: F401
+except ImportError:  # orjson not installed
+    from json import loads as json_loads  # noqa: F401
+
+# Scalar geometry helpers are JIT-compiled when numba is installed; the
+# decorated functions keep their pure-Python behaviour otherwise. No
+# fastmath: it lets LLVM assume inputs are never NaN, and NaN coordinates
+# from malformed states must come out as NaN distances
+try:
+    from numba import njit
+
+    _jit = njit(cache=True)
+except ImportError:  # numba not installed
+
+    def _jit(func):
+        return func
+
+
+# Module-level floats so compiled code can treat them as constants
+_EARTH_RADIUS_KM: Final = Constants.EARTH_RADIUS_KM
+_KM_PER_DEGREE_LAT: Final = Constants.KM_PER_DEGREE_LAT
+_METERS_TO_FEET: Final = Constants.METERS_TO_FEET
+_MS_TO_KMH: Final = Constants.MS_TO_KMH
+_MS_TO_KNOTS: Final = Constants.MS_TO_KNOTS
+
+
+@_jit
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate great circle distance between two points using Haversine formula.
@@ -30,16 +67,132 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
         7.23
     """
     # Convert to radians
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
 
     # Haversine formula
+    dlat = phi2 - phi1
+    dlon = radians(lon2) - radians(lon1)
+
+    a = sin(dlat / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    return _EARTH_RADIUS_KM * c
+
+
+@dataclass(frozen=True)
+class HomePoint:
+    """Fixed reference point with its trigonometry precomputed."""
+
+    lat: float
+    lon: float
+    lat_rad: float = field(init=False, repr=False)
+    lon_rad: float = field(init=False, repr=False)
+    cos_lat: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "lat_rad", radians(self.lat))
+        object.__setattr__(self, "lon_rad", radians(self.lon))
+        object.__setattr__(self, "cos_lat", cos(self.lat_rad))
+
+
+def haversine_from(home: HomePoint, lat: float, lon: float) -> float:
+    """
+    Haversine distance from a fixed home point.
+
+    Same result as ``haversine_distance(home.lat, home.lon, lat, lon)``
+    but reuses the home point's radians and cosine.
+
+    Args:
+        home: Reference point
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+
+    Returns:
+        Distance in kilometers
+    """
+    phi2 = radians(lat)
+    dlat = phi2 - home.lat_rad
+    dlon = radians(lon) - home.lon_rad
+
+    a = sin(dlat / 2) ** 2 + home.cos_lat * cos(phi2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    return _EARTH_RADIUS_KM * c
+
+
+def haversine_distances(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized Haversine distance from one point to many.
+
+    Args:
+        lat: Reference latitude in degrees
+        lon: Reference longitude in degrees
+        lats: Latitudes in degrees
+        lons: Longitudes in degrees
+
+    Returns:
+        Distances in kilometers; NaN where a coordinate is NaN
+    """
+    lat1 = np.radians(lat)
+    lat2 = np.radians(lats)
     dlat = lat2 - lat1
+    dlon = np.radians(lons) - np.radians(lon)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * Constants.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def parallel_offsets(
+    start_lats: np.ndarray,
+    start_lons: np.ndarray,
+    end_lats: np.ndarray,
+    end_lons: np.ndarray,
+    offsets_km: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized endpoints of lines running parallel to many segments.
+
+    Each segment is shifted perpendicular to its initial bearing, once to
+    each side, along great circles.
+
+    Args:
+        start_lats, start_lons: Segment start points in degrees
+        end_lats, end_lons: Segment end points in degrees
+        offsets_km: Shift distance per segment in kilometers
+
+    Returns:
+        Array of shape (N, 2, 2, 2): segment, side (right, left),
+        endpoint (start, end), (lat, lon) in degrees
+    """
+    lat1 = np.radians(np.asarray(start_lats, dtype=np.float64))
+    lon1 = np.radians(np.asarray(start_lons, dtype=np.float64))
+    lat2 = np.radians(np.asarray(end_lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(end_lons, dtype=np.float64))
+    delta = np.asarray(offsets_km, dtype=np.float64) / Constants.EARTH_RADIUS_KM
+
     dlon = lon2 - lon1
+    bearing = np.arctan2(
+        np.sin(dlon) * np.cos(lat2),
+        np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon),
+    )
 
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    # Broadcast to (N, side, endpoint)
+    lat = np.stack([lat1, lat2], axis=-1)[:, None, :]
+    lon = np.stack([lon1, lon2], axis=-1)[:, None, :]
+    perp = (bearing[:, None] + np.array([np.pi / 2, -np.pi / 2]))[:, :, None]
+    delta = delta[:, None, None]
 
-    return Constants.EARTH_RADIUS_KM * c
+    new_lat = np.arcsin(
+        np.sin(lat) * np.cos(delta) + np.cos(lat) * np.sin(delta) * np.cos(perp)
+    )
+    new_lon = lon + np.arctan2(
+        np.sin(perp) * np.sin(delta) * np.cos(lat),
+        np.cos(delta) - np.sin(lat) * np.sin(new_lat),
+    )
+    return np.degrees(np.stack([new_lat, new_lon], axis=-1))
 
 
 def perpendicular_distance(lat: float, lon: float, line) -> float:
@@ -58,21 +211,36 @@ def perpendicular_distance(lat: float, lon: float, line) -> float:
     Returns:
         Distance in kilometers
     """
+    return _perpendicular_distance(
+        lat, lon, line.start_lat, line.start_lon, line.end_lat, line.end_lon
+    )
+
+
+@_jit
+def _perpendicular_distance(
+    lat: float,
+    lon: float,
+    start_lat: float,
+    start_lon: float,
+    end_lat: float,
+    end_lon: float,
+) -> float:
+    """Scalar core of perpendicular_distance, free of Python objects."""
     # Simple approximation using cross product
     # For small distances this is sufficiently accurate
 
     # Vector from line start to point
-    dx1 = lon - line.start_lon
-    dy1 = lat - line.start_lat
+    dx1 = lon - start_lon
+    dy1 = lat - start_lat
 
     # Vector along line
-    dx2 = line.end_lon - line.start_lon
-    dy2 = line.end_lat - line.start_lat
+    dx2 = end_lon - start_lon
+    dy2 = end_lat - start_lat
 
     # Normalize line vector
     line_length = sqrt(dx2**2 + dy2**2)
     if line_length < 1e-10:
-        return haversine_distance(lat, lon, line.start_lat, line.start_lon)
+        return haversine_distance(lat, lon, start_lat, start_lon)
 
     dx2 /= line_length
     dy2 /= line_length
@@ -81,9 +249,59 @@ def perpendicular_distance(lat: float, lon: float, line) -> float:
     cross = abs(dx1 * dy2 - dy1 * dx2)
 
     # Convert to kilometers (approximate)
-    return cross * Constants.KM_PER_DEGREE_LAT  # degrees to km
+    return cross * _KM_PER_DEGREE_LAT  # degrees to km
 
 
+def simplify_path(points: Sequence[Sequence[float]], epsilon_deg: float) -> np.ndarray:
+    """
+    Simplify a polyline with the Ramer-Douglas-Peucker algorithm.
+
+    Drops every vertex that lies within ``epsilon_deg`` of the line through
+    the vertices kept around it. Distances are planar in degrees, which is
+    what a map renderer draws; endpoints are always kept.
+
+    Args:
+        points: Sequence of (lat, lon) pairs in drawing order
+        epsilon_deg: Tolerance in degrees (0.0005 is roughly 50 m); 0 or less
+            returns the points unchanged
+
+    Returns:
+        Array of shape (n, 2) with the kept points, in order
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(pts)
+    if n < 3 or epsilon_deg <= 0:
+        return pts
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start = pts[first]
+        inner = pts[first + 1 : last] - start
+        dlat, dlon = pts[last] - start
+        length = sqrt(dlat * dlat + dlon * dlon)
+        if length < 1e-12:
+            # Closed loop: fall back to distance from the shared endpoint
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(dlat * inner[:, 1] - dlon * inner[:, 0]) / length
+
+        k = int(np.argmax(dist))
+        if dist[k] > epsilon_deg:
+            split = first + 1 + k
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return pts[keep]
+
+
+@_jit
 def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate bearing (direction) from point 1 to point 2.
@@ -99,12 +317,13 @@ def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
     Returns:
         Bearing in degrees (0-360, where 0/360=North, 90=East, 180=South, 270=West)
     """
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
 
-    dlon = lon2 - lon1
+    dlon = radians(lon2) - radians(lon1)
 
-    x = sin(dlon) * cos(lat2)
-    y = cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(dlon)
+    x = sin(dlon) * cos(phi2)
+    y = cos(phi1) * sin(phi2) - sin(phi1) * cos(phi2) * cos(dlon)
 
     bearing = atan2(x, y)
     bearing = degrees(bearing)
@@ -113,6 +332,7 @@ def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
     return bearing
 
 
+@lru_cache(maxsize=64)
 def get_bounding_box(
     lat: float, lon: float, radius_km: float
 ) -> Tuple[float, float, float, float]:
@@ -145,6 +365,47 @@ def get_bounding_box(
     )
 
 
+# Class lookup tables: lower bounds of every class after the first, in order
+_ALT_EDGES: Final = tuple(lo for lo, _ in ALTITUDE_CLASSES.values())[1:]
+_ALT_LABELS: Final = tuple(ALTITUDE_CLASSES)
+_DIST_EDGES: Final = tuple(lo for lo, _ in DISTANCE_CLASSES.values())[1:]
+_DIST_LABELS: Final = tuple(DISTANCE_CLASSES)
+
+
+def classify_altitude(altitude_m: float) -> str:
+    """
+    Map an altitude to its Settings.ALTITUDE_CLASSES name.
+
+    Args:
+        altitude_m: Altitude in meters (values below 0 count as lowest class)
+
+    Returns:
+        Altitude class name
+
+    Example:
+        >>> classify_altitude(3500)
+        'medium'
+    """
+    return _ALT_LABELS[bisect_right(_ALT_EDGES, altitude_m)]
+
+
+def classify_distance(distance_km: float) -> str:
+    """
+    Map a distance from home to its Settings.DISTANCE_CLASSES name.
+
+    Args:
+        distance_km: Distance in kilometers
+
+    Returns:
+        Distance class name
+
+    Example:
+        >>> classify_distance(12.0)
+        'medium'
+    """
+    return _DIST_LABELS[bisect_right(_DIST_EDGES, distance_km)]
+
+
 def format_altitude(altitude_m: float, include_feet: bool = True) -> str:
     """
     Format altitude with optional feet conversion.
@@ -164,7 +425,7 @@ def format_altitude(altitude_m: float, include_feet: bool = True) -> str:
         return "N/A"
 
     if include_feet:
-        feet = altitude_m * Constants.METERS_TO_FEET
+        feet = altitude_m * _METERS_TO_FEET
         return f"{altitude_m:.0f} m ({feet:.0f} ft)"
 
     return f"{altitude_m:.0f} m"
@@ -189,9 +450,9 @@ def format_speed(velocity_ms: float, unit: str = "kmh") -> str:
         return "N/A"
 
     if unit == "kmh":
-        return f"{velocity_ms * Constants.MS_TO_KMH:.1f} km/h"
+        return f"{velocity_ms * _MS_TO_KMH:.1f} km/h"
     elif unit == "knots":
-        return f"{velocity_ms * 1.94384:.1f} knots"
+        return f"{velocity_ms * _MS_TO_KNOTS:.1f} knots"
     else:  # ms
         return f"{velocity_ms:.1f} m/s"
 
@@ -213,9 +474,11 @@ def format_duration(seconds: int) -> str:
     if seconds is None or seconds < 0:
         return "N/A"
 
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
+    if seconds < 60:
+        return f"{seconds}s"
+
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
 
     parts = []
     if hours > 0:
@@ -248,6 +511,20 @@ def validate_coordinates(lat: float, lon: float) -> bool:
     return -90 <= lat <= 90 and -180 <= lon <= 180
 
 
+def validate_coordinates_batch(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized validate_coordinates.
+
+    Args:
+        lats: Latitudes in degrees
+        lons: Longitudes in degrees
+
+    Returns:
+        Boolean mask, False where a coordinate is out of range or NaN
+    """
+    return (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+
+
 def parse_state_vector(state: list) -> dict:
     """
     Parse OpenSky Network state vector into dictionary.
@@ -293,3 +570,65 @@ def parse_state_vector(state: list) -> dict:
         "geo_altitude": state[13],
         "squawk": state[14] if len(state) > 14 else None,
     }
+
+
+# Numeric state vector fields decoded by parse_states_columnar (name -> index)
+STATE_NUMERIC_FIELDS: Final = MappingProxyType(
+    {
+        "longitude": 5,
+        "latitude": 6,
+        "baro_altitude": 7,
+        "velocity": 9,
+        "true_track": 10,
+        "vertical_rate": 11,
+        "geo_altitude": 13,
+    }
+)
+
+_pick_numeric = itemgetter(*STATE_NUMERIC_FIELDS.values())
+
+
+def parse_states_columnar(states: list) -> Dict[str, np.ndarray]:
+    """
+    Decode a whole scan of state vectors into one array per numeric field.
+
+    Args:
+        states: State vectors from OpenSky API
+
+    Returns:
+        Dictionary of float64 arrays keyed like ``parse_state_vector``
+        (see STATE_NUMERIC_FIELDS), aligned with ``states``; NaN where a
+        value is null or the state is malformed
+    """
+    try:
+        # Fast path: one C-level pick per state, one conversion per scan
+        rows = np.array([_pick_numeric(s) for s in states], dtype=np.float64)
+        columns = rows.reshape(-1, len(STATE_NUMERIC_FIELDS)).T.copy()
+        return dict(zip(STATE_NUMERIC_FIELDS, columns))
+    except (TypeError, IndexError, KeyError, ValueError):
+        pass
+
+    # Some state is short, not a list or holds a non-numeric value; decode
+    # value by value so only the bad entries become NaN
+    return {
+        name: np.array(
+            [
+                _float_or_nan(s[index])
+                if isinstance(s, list) and len(s) > index
+                else np.nan
+                for s in states
+            ],
+            dtype=np.float64,
+        )
+        for name, index in STATE_NUMERIC_FIELDS.items()
+    }
+
+
+def _float_or_nan(value: Any) -> float:
+    """Convert one state vector value to float, NaN if null or non-numeric."""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
@@ -3,122 +3,22 @@ Interactive Dashboard
 Creates comprehensive visualization dashboard.
 """
 
+import gzip
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
+from lara.tracking.database import configure_connection
 from .map_generator import MapGenerator
 from .flight_plotter import FlightPlotter
 from .heatmap_generator import HeatmapGenerator
+from .tile_cache import REGISTER_SCRIPT, write_service_worker
 
-
-class Dashboard:
+# Static dashboard index page (no placeholders), encoded once
+_INDEX_HTML = (
     """
-    Creates comprehensive visualization dashboard.
-    """
-
-    def __init__(
-        self,
-        db_path: str,
-        center_lat: float,
-        center_lon: float,
-        output_dir: str = "visualizations",
-    ):
-        """
-        Initialize dashboard.
-
-        Args:
-            db_path: Path to LARA database
-            center_lat: Home latitude
-            center_lon: Home longitude
-            output_dir: Output directory for visualizations
-        """
-        self.db_path = db_path
-        self.center_lat = center_lat
-        self.center_lon = center_lon
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-
-    def generate_complete_dashboard(self, analysis_results: Dict[str, Any] = None):
-        """
-        Generate complete visualization dashboard.
-
-        Args:
-            analysis_results: Optional analysis results from lara.analysis
-        """
-        print("\n" + "=" * 70)
-        print("🗺️  GENERATING VISUALIZATION DASHBOARD")
-        print("=" * 70)
-
-        # 1. Corridor map
-        print("\n1. Generating corridor map...")
-        self._generate_corridor_map(analysis_results)
-
-        # 2. Traffic heatmap
-        print("\n2. Generating traffic heatmap...")
-        heatmap = HeatmapGenerator(self.db_path, self.center_lat, self.center_lon)
-        heatmap.generate_traffic_heatmap(str(self.output_dir / "traffic_heatmap.html"))
-        heatmap.close()
-
-        # 3. Recent flights
-        print("\n3. Generating recent flights map...")
-        plotter = FlightPlotter(self.db_path, self.center_lat, self.center_lon)
-        plotter.plot_recent_flights(
-            hours=24, output_file=str(self.output_dir / "recent_flights_24h.html")
-        )
-        plotter.close()
-
-        # 4. Altitude heatmap
-        print("\n4. Generating altitude heatmap...")
-        heatmap = HeatmapGenerator(self.db_path, self.center_lat, self.center_lon)
-        heatmap.generate_altitude_heatmap(
-            str(self.output_dir / "altitude_heatmap.html")
-        )
-        heatmap.close()
-
-        # 5. Live View
-        print("\n5. Generating live view...")
-        plotter = FlightPlotter(self.db_path, self.center_lat, self.center_lon)
-        plotter.plot_live(output_file=str(self.output_dir / "live_view.html"))
-        plotter.close()
-
-        # 6. Generate index page
-        print("\n6. Generating dashboard index...")
-        self._generate_index_page()
-
-        print("\n" + "=" * 70)
-        print(f"✅ Dashboard generated in: {self.output_dir}")
-        print("=" * 70)
-        print(f"\nOpen: {self.output_dir / 'index.html'}")
-
-    def _generate_corridor_map(self, analysis_results: Dict[str, Any] = None):
-        """Generate corridor visualization map."""
-        map_gen = MapGenerator(self.center_lat, self.center_lon)
-
-        if analysis_results and "corridors" in analysis_results:
-            corridors = analysis_results["corridors"].get("corridors", [])
-
-            for corridor in corridors[:20]:  # Top 20
-                map_gen.add_corridor(corridor, corridor["rank"])
-        else:
-            # Fallback: query from database
-            from lara.analysis import FlightAnalyzer
-
-            analyzer = FlightAnalyzer(self.db_path)
-            result = analyzer.analyze_corridors()
-            analyzer.close()
-
-            for corridor in result["corridors"][:20]:
-                map_gen.add_corridor(corridor, corridor["rank"])
-
-        map_gen.save(str(self.output_dir / "corridors.html"))
-
-    def _generate_index_page(self):
-        """Generate HTML index page for dashboard."""
-        html = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -255,14 +155,201 @@ class Dashboard:
         <p>LARA - Local Air Route Analysis<br>
         Data visualization powered by Folium & OpenStreetMap</p>
     </div>
+    """
+    + REGISTER_SCRIPT
+    + """
 </body>
 </html>
 """
+).encode("utf-8")
+
+_INDEX_HTML_GZ = gzip.compress(_INDEX_HTML, compresslevel=9, mtime=0)
+
+
+def _write_gzip_copy(path: Path):
+    """
+    Write ``<path>.gz`` next to a generated page.
+
+    Static servers with precompressed-file support (nginx ``gzip_static``,
+    Caddy ``precompressed``) then send it as-is instead of compressing
+    every response.
+    """
+    gz_path = path.with_name(path.name + ".gz")
+    gz_path.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
 
-        with open(self.output_dir / "index.html", "w") as f:
-            f.write(html)
+
+class Dashboard:
+    """
+    Creates comprehensive visualization dashboard.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        center_lat: float,
+        center_lon: float,
+        output_dir: str = "visualizations",
+        max_workers: int = 4,
+    ):
+        """
+        Initialize dashboard.
+
+        Args:
+            db_path: Path to LARA database
+            center_lat: Home latitude
+            center_lon: Home longitude
+            output_dir: Output directory for visualizations
+            max_workers: Visualizations generated concurrently (1 = sequential)
+        """
+        self.db_path = db_path
+        self.center_lat = center_lat
+        self.center_lon = center_lon
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        self.max_workers = max(1, max_workers)
+
+        # Every job runs on a pool thread, which opens its own tuned
+        # read-only connection on first use (see _thread_conn)
+        self._local = threading.local()
+        self._worker_conns: List[sqlite3.Connection] = []
+        self._worker_lock = threading.Lock()
+
+    def _open_conn(self) -> sqlite3.Connection:
+        """Open a tuned read-only connection to the database."""
+        # Worker connections are closed from the calling thread afterwards
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn, query_only=True)
+        return conn
+
+    def _thread_conn(self) -> sqlite3.Connection:
+        """Connection for the current thread, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open_conn()
+            with self._worker_lock:
+                self._worker_conns.append(conn)
+        return conn
+
+    def generate_complete_dashboard(self, analysis_results: Dict[str, Any] = None):
+        """
+        Generate complete visualization dashboard.
+
+        The visualizations are independent read-only jobs writing separate
+        files, so they run concurrently (WAL lets the readers overlap).
+
+        Args:
+            analysis_results: Optional analysis results from lara.analysis
+        """
+        print("\n" + "=" * 70)
+        print("🗺️  GENERATING VISUALIZATION DASHBOARD")
+        print("=" * 70)
+
+        out = self.output_dir
+        # (label, page written, generator)
+        steps = [
+            (
+                "Corridor map",
+                "corridors.html",
+                lambda path: self._generate_corridor_map(analysis_results),
+            ),
+            (
+                "Traffic heatmap",
+                "traffic_heatmap.html",
+                lambda path: self._heatmap().generate_traffic_heatmap(path),
+            ),
+            (
+                "Recent flights map",
+                "recent_flights_24h.html",
+                lambda path: self._plotter().plot_recent_flights(
+                    hours=24, output_file=path
+                ),
+            ),
+            (
+                "Altitude heatmap",
+                "altitude_heatmap.html",
+                lambda path: self._heatmap().generate_altitude_heatmap(path),
+            ),
+            (
+                "Live view",
+                "live_view.html",
+                lambda path: self._plotter().plot_live(output_file=path),
+            ),
+        ]
+
+        def run(page: str, generate) -> Path:
+            path = out / page
+            generate(str(path))
+            _write_gzip_copy(path)
+            return path
+
+        # Jobs report back through their result; progress is printed here,
+        # in step order, as each one is collected
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(run, page, gen) for _, page, gen in steps]
+                for number, (step, future) in enumerate(zip(steps, futures), 1):
+                    path = future.result()
+                    print(f"\n✅ {number}. {step[0]}: {path}")
+        finally:
+            self._close_worker_conns()
+
+        # Generate index page
+        print(f"\n{len(steps) + 1}. Generating dashboard index...")
+        self._generate_index_page()
+
+        print("\n" + "=" * 70)
+        print(f"✅ Dashboard generated in: {self.output_dir}")
+        print("=" * 70)
+        print(f"\nOpen: {self.output_dir / 'index.html'}")
+
+    def _heatmap(self) -> HeatmapGenerator:
+        """Heatmap generator on the current thread's connection."""
+        return HeatmapGenerator(
+            self.db_path, self.center_lat, self.center_lon, conn=self._thread_conn()
+        )
+
+    def _plotter(self) -> FlightPlotter:
+        """Flight plotter on the current thread's connection."""
+        return FlightPlotter(
+            self.db_path, self.center_lat, self.center_lon, conn=self._thread_conn()
+        )
+
+    def _close_worker_conns(self):
+        """Close connections opened by worker threads."""
+        with self._worker_lock:
+            conns, self._worker_conns = self._worker_conns, []
+        for conn in conns:
+            conn.close()
+
+    def _generate_corridor_map(self, analysis_results: Dict[str, Any] = None):
+        """Generate corridor visualization map."""
+        map_gen = MapGenerator(self.center_lat, self.center_lon)
+
+        if analysis_results and "corridors" in analysis_results:
+            corridors = analysis_results["corridors"].get("corridors", [])
+
+            map_gen.add_corridors(corridors[:20])  # Top 20
+        else:
+            # Fallback: query from database
+            from lara.analysis import FlightAnalyzer
+
+            analyzer = FlightAnalyzer(self.db_path)
+            try:
+                corridors = analyzer.top_corridors(20)
+            finally:
+                analyzer.close()
+
+            map_gen.add_corridors(corridors)
+
+        map_gen.save(str(self.output_dir / "corridors.html"))
+
+    def _generate_index_page(self):
+        """Generate HTML index page and the tile cache it registers."""
+        (self.output_dir / "index.html").write_bytes(_INDEX_HTML)
+        (self.output_dir / "index.html.gz").write_bytes(_INDEX_HTML_GZ)
+        write_service_worker(self.output_dir)
 
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close any database connections still held by worker threads."""
+        self._close_worker_conns()
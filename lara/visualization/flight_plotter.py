@@ -4,220 +4,32 @@ Specialized plotting for individual flights and routes, including live tracking.
 """
 
 import sqlite3
+from itertools import groupby
+from operator import itemgetter
+from string import Template
+from typing import Dict, Optional
+
+from .live_proxy import OPENSKY_STATES_URL
 from .map_generator import MapGenerator
+from .tile_cache import REGISTER_SCRIPT
+from lara.tracking.database import configure_connection, optimize_connection
 from lara.utils import get_bounding_box
 
+# Position columns MapGenerator.add_flight_path reads; all of them are in
+# idx_positions_flight_track, so track queries never touch the table rows
+_TRACK_COLUMNS = "flight_id, latitude, longitude, altitude_m"
 
-class FlightPlotter:
-    """
-    Plots individual flight paths on maps, including real-time live tracking.
-    """
-
-    def __init__(self, db_path: str, center_lat: float, center_lon: float):
-        """
-        Initialize flight plotter.
-
-        Args:
-            db_path: Path to LARA database
-            center_lat: Home latitude
-            center_lon: Home longitude
-        """
-        self.db_path = db_path
-        self.center_lat = center_lat
-        self.center_lon = center_lon
-        self.radius_km = 50  # Default radius, will be read from config if available
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-
-    def plot_flight(self, flight_id: int, output_file: str):
-        """
-        Plot a single flight path.
-
-        Args:
-            flight_id: Flight ID
-            output_file: Output HTML filename
-        """
-        cursor = self.conn.cursor()
-
-        # Get flight info
-        cursor.execute("SELECT * FROM flights WHERE id = ?", (flight_id,))
-        flight = cursor.fetchone()
-
-        if not flight:
-            print(f"❌ Flight {flight_id} not found")
-            return
-
-        # Get positions
-        cursor.execute(
-            """
-            SELECT * FROM positions 
-            WHERE flight_id = ? 
-            ORDER BY timestamp
-        """,
-            (flight_id,),
-        )
-        positions = [dict(row) for row in cursor.fetchall()]
-
-        # Create map
-        map_gen = MapGenerator(self.center_lat, self.center_lon)
-
-        # Add flight path
-        map_gen.add_flight_path(positions, dict(flight))
-
-        # Add position markers
-        # map_gen.add_position_markers(positions)
-
-        # Save
-        map_gen.save(output_file)
-
-    def plot_recent_flights(
-        self, hours: int = 24, output_file: str = "recent_flights.html"
-    ):
-        """
-        Plot all recent flights.
-
-        Args:
-            hours: Number of hours to look back
-            output_file: Output HTML filename
-        """
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT f.*, COUNT(p.id) as position_count
-            FROM flights f
-            LEFT JOIN positions p ON f.id = p.flight_id
-            WHERE f.first_seen >= datetime('now', ?)
-            GROUP BY f.id
-            HAVING position_count > 0
-        """,
-            (f"-{hours} hours",),
-        )
-
-        flights = cursor.fetchall()
-
-        print(f"📍 Plotting {len(flights)} recent flights...")
-
-        # Create map
-        map_gen = MapGenerator(self.center_lat, self.center_lon)
-
-        # Add each flight
-        for flight in flights:
-            cursor.execute(
-                """
-                SELECT * FROM positions 
-                WHERE flight_id = ? 
-                ORDER BY timestamp
-            """,
-                (flight["id"],),
-            )
-            positions = [dict(row) for row in cursor.fetchall()]
-
-            map_gen.add_flight_path(positions, dict(flight))
-
-        # Save
-        map_gen.save(output_file)
-
-    def plot_callsign(self, callsign: str, output_file: str):
-        """
-        Plot all occurrences of a specific callsign.
-
-        Args:
-            callsign: Flight callsign
-            output_file: Output HTML filename
-        """
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT * FROM flights 
-            WHERE callsign LIKE ?
-            ORDER BY first_seen DESC
-        """,
-            (f"%{callsign}%",),
-        )
-
-        flights = cursor.fetchall()
-
-        if not flights:
-            print(f"❌ No flights found for callsign: {callsign}")
-            return
+# Recently seen flights that have a track; position_count is kept by
+# FlightDatabase, so no positions need to be counted or joined
+_RECENT_FLIGHTS = "first_seen >= datetime('now', ?) AND position_count > 0"
 
-        print(f"📍 Plotting {len(flights)} flights for {callsign}...")
+# Ids of flights whose callsign contains the bound term; the trigram index
+# built by Database answers the substring LIKE without scanning flights
+_CALLSIGN_IDS_FTS = "SELECT rowid FROM flights_fts WHERE callsign LIKE ?"
+_CALLSIGN_IDS_SCAN = "SELECT id FROM flights WHERE callsign LIKE ?"
 
-        # Create map
-        map_gen = MapGenerator(self.center_lat, self.center_lon)
-
-        # Add each occurrence
-        for flight in flights:
-            cursor.execute(
-                """
-                SELECT * FROM positions 
-                WHERE flight_id = ? 
-                ORDER BY timestamp
-            """,
-                (flight["id"],),
-            )
-            positions = [dict(row) for row in cursor.fetchall()]
-
-            map_gen.add_flight_path(positions, dict(flight))
-
-        # Save
-        map_gen.save(output_file)
-
-    def plot_live(self, output_file: str = "live_flights.html"):
-        """
-        Create a live flight tracking map with real-time updates.
-
-        This generates an HTML file with embedded JavaScript that fetches
-        flight data directly from OpenSky Network API every 10 seconds.
-        Uses anonymous API access (no credentials required).
-
-        Features:
-        - Auto-refresh every 10 seconds (OpenSky rate limit compliant)
-        - Color-coded by altitude
-        - Flight info popups
-        - Loading indicators
-        - Error handling for rate limits
-
-        Args:
-            output_file: Output HTML filename
-
-        Note:
-            Anonymous API access has strict rate limits (max ~100 requests/day).
-            For production use, consider server-side proxying with credentials.
-        """
-        print("🔴 Generating live flight tracking map...")
-
-        # Calculate bounding box for API query
-        lat_min, lon_min, lat_max, lon_max = get_bounding_box(
-            self.center_lat, self.center_lon, self.radius_km
-        )
-
-        # Generate HTML with embedded JavaScript for live updates
-        html_content = self._generate_live_html(lat_min, lon_min, lat_max, lon_max)
-
-        # Write to file
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        print(f"✅ Live tracking map saved to: {output_file}")
-        print("   Updates every 10 seconds using OpenSky Network API")
-        print("   ⚠️  Anonymous access is rate-limited (~100 requests/day)")
-
-    def _generate_live_html(
-        self, lat_min: float, lon_min: float, lat_max: float, lon_max: float
-    ) -> str:
-        """
-        Generate complete HTML with embedded JavaScript for live tracking.
-
-        Args:
-            lat_min, lon_min, lat_max, lon_max: Bounding box coordinates
-
-        Returns:
-            Complete HTML string
-        """
-        html = f"""<!DOCTYPE html>
+# Live tracking page; JavaScript braces stay literal, "$$" is a literal "$"
+_LIVE_HTML = Template("""<!DOCTYPE html>
 <html>
 <head>
     <title>LARA Live Flight Tracking</title>
@@ -231,21 +43,21 @@ class FlightPlotter:
           crossorigin=""/>
     
     <style>
-        body {{
+        body {
             margin: 0;
             padding: 0;
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: #1a1a1a;
             color: #ffffff;
-        }}
-        #map {{
+        }
+        #map {
             position: absolute;
             top: 80px;
             left: 0;
             right: 0;
             bottom: 0;
-        }}
-        .header {{
+        }
+        .header {
             position: fixed;
             top: 0;
             left: 0;
@@ -258,18 +70,18 @@ class FlightPlotter:
             align-items: center;
             justify-content: space-between;
             padding: 0 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0;
             font-size: 1.8em;
             font-weight: 300;
-        }}
-        .status {{
+        }
+        .status {
             display: flex;
             align-items: center;
             gap: 20px;
-        }}
-        .status-item {{
+        }
+        .status-item {
             display: flex;
             align-items: center;
             gap: 8px;
@@ -277,37 +89,37 @@ class FlightPlotter:
             padding: 8px 16px;
             border-radius: 20px;
             font-size: 0.9em;
-        }}
-        .status-dot {{
+        }
+        .status-dot {
             width: 10px;
             height: 10px;
             border-radius: 50%;
             animation: pulse 2s infinite;
-        }}
-        .status-dot.active {{
+        }
+        .status-dot.active {
             background: #00ff88;
-        }}
-        .status-dot.error {{
+        }
+        .status-dot.error {
             background: #ff4444;
-        }}
-        .status-dot.loading {{
+        }
+        .status-dot.loading {
             background: #ffaa00;
-        }}
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.3; }}
-        }}
-        .leaflet-popup-content {{
+        }
+        @keyframes pulse {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.3; }
+        }
+        .leaflet-popup-content {
             color: #000;
             min-width: 200px;
-        }}
-        .flight-info {{
+        }
+        .flight-info {
             font-family: monospace;
             font-size: 0.9em;
-        }}
-        .flight-info strong {{
+        }
+        .flight-info strong {
             color: #667eea;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -336,43 +148,45 @@ class FlightPlotter:
 
     <script>
         // Configuration
-        const HOME_LAT = {self.center_lat};
-        const HOME_LON = {self.center_lon};
-        const RADIUS_KM = {self.radius_km};
-        const API_URL = 'https://opensky-network.org/api/states/all';
+        const HOME_LAT = ${center_lat};
+        const HOME_LON = ${center_lon};
+        const RADIUS_KM = ${radius_km};
+        const HOME_LATLNG = L.latLng(HOME_LAT, HOME_LON);
+        const RADIUS_M = RADIUS_KM * 1000;
+        const API_URL = '${api_url}';
         const UPDATE_INTERVAL = 10000; // 10 seconds (OpenSky minimum)
         
         // Bounding box
-        const BOUNDS = {{
-            lamin: {lat_min},
-            lomin: {lon_min},
-            lamax: {lat_max},
-            lomax: {lon_max}
-        }};
+        const BOUNDS = {
+            lamin: ${lat_min},
+            lomin: ${lon_min},
+            lamax: ${lat_max},
+            lomax: ${lon_max}
+        };
 
         // Initialize map
         const map = L.map('map').setView([HOME_LAT, HOME_LON], 10);
         
         // Add tile layer (light theme to match other LARA maps)
-        L.tileLayer('https://{{s}}.basemaps.cartocdn.com/light_all/{{z}}/{{x}}/{{y}}{{r}}.png', {{
+        L.tileLayer('https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png', {
             attribution: 'LARA Live Tracking | &copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a>',
             maxZoom: 19
-        }}).addTo(map);
+        }).addTo(map);
 
         // Add home marker
-        const homeIcon = L.icon({{
+        const homeIcon = L.icon({
             iconUrl: 'data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSIjZmYwMDAwIj48cGF0aCBkPSJNMTAgMjB2LTZoNHY2aDV2LThoM0wxMiAzbC05IDloM3Y4eiIvPjwvc3ZnPg==',
             iconSize: [32, 32],
             iconAnchor: [16, 32],
             popupAnchor: [0, -32]
-        }});
+        });
         
-        L.marker([HOME_LAT, HOME_LON], {{ icon: homeIcon }})
+        L.marker([HOME_LAT, HOME_LON], { icon: homeIcon })
             .bindPopup('<b>Home Location</b>')
             .addTo(map);
 
         // Flight markers storage
-        let flightMarkers = {{}};
+        let flightMarkers = {};
         let lastUpdate = null;
         let updateTimer = null;
         let isUpdating = false;
@@ -383,13 +197,13 @@ class FlightPlotter:
         const flightCount = document.getElementById('flight-count');
         const lastUpdateEl = document.getElementById('last-update');
 
-        function setStatus(status, text) {{
+        function setStatus(status, text) {
             statusDot.className = 'status-dot ' + status;
             statusText.textContent = text;
-        }}
+        }
 
         // Altitude color mapping (matches LARA visualization)
-        function getAltitudeColor(altitude) {{
+        function getAltitudeColor(altitude) {
             if (!altitude) return '#999999';
             if (altitude < 1000) return '#ff3b3b';      // very_low
             if (altitude < 3000) return '#ff7a18';      // low
@@ -397,164 +211,183 @@ class FlightPlotter:
             if (altitude < 9000) return '#00e5a8';      // high
             if (altitude < 12000) return '#00b4ff';     // very_high
             return '#7c3aed';                           // cruise
-        }}
-
-        // Haversine distance calculation
-        function haversineDistance(lat1, lon1, lat2, lon2) {{
-            const R = 6371; // Earth radius in km
-            const dLat = (lat2 - lat1) * Math.PI / 180;
-            const dLon = (lon2 - lon1) * Math.PI / 180;
-            const a = Math.sin(dLat/2) * Math.sin(dLat/2) +
-                      Math.cos(lat1 * Math.PI / 180) * Math.cos(lat2 * Math.PI / 180) *
-                      Math.sin(dLon/2) * Math.sin(dLon/2);
-            const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1-a));
-            return R * c;
-        }}
-
-        // Create or update flight marker
-        function updateFlightMarker(state) {{
+        }
+
+        // Plane icon markup; rotation and colour are patched in place later
+        const PLANE_ICON = L.divIcon({
+            className: 'plane-marker',
+            html: `<div style="transform: rotate(0deg); width: 24px; height: 24px;">
+                    <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24">
+                        <path d="M21 16v-2l-8-5V3.5c0-.83-.67-1.5-1.5-1.5S10 2.67 10 3.5V9l-8 5v2l8-2.5V19l-2 1.5V22l3.5-1 3.5 1v-1.5L13 19v-5.5l8 2.5z"/>
+                    </svg>
+                   </div>`,
+            iconSize: [24, 24],
+            iconAnchor: [12, 12]
+        });
+
+        // Icon style changes queued for the next animation frame
+        let pendingStyles = [];
+
+        function flushStyles() {
+            const batch = pendingStyles;
+            pendingStyles = [];
+            batch.forEach(marker => {
+                marker.el.style.transform = 'rotate(' + marker.rotation + 'deg)';
+                marker.el.firstElementChild.setAttribute('fill', marker.color);
+                marker.styleQueued = false;
+            });
+        }
+
+        // Restyle only when heading or altitude band changed since last tick
+        function queueStyle(marker, rotation, color) {
+            if (marker.rotation === rotation && marker.color === color) return;
+            marker.rotation = rotation;
+            marker.color = color;
+            if (marker.styleQueued) return;
+            marker.styleQueued = true;
+            if (pendingStyles.length === 0) requestAnimationFrame(flushStyles);
+            pendingStyles.push(marker);
+        }
+
+        // Popup content, built from the marker's latest state when opened
+        function popupContent(marker) {
+            const state = marker.state;
             const icao24 = state[0];
             const callsign = state[1] ? state[1].trim() : 'Unknown';
             const origin = state[2] || 'Unknown';
-            const lon = state[5];
-            const lat = state[6];
             const altitude = state[7] || state[13]; // baro or geo altitude
             const velocity = state[9];
             const heading = state[10];
             const onGround = state[8];
 
-            if (!lat || !lon) return;
-
-            // Calculate distance from home
-            const distance = haversineDistance(HOME_LAT, HOME_LON, lat, lon);
-
-            // Create plane icon with rotation
-            const color = getAltitudeColor(altitude);
-            const rotation = heading || 0;
-            
-            const planeIcon = L.divIcon({{
-                className: 'plane-marker',
-                html: `<div style="transform: rotate(${{rotation}}deg); width: 24px; height: 24px;">
-                        <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="${{color}}">
-                            <path d="M21 16v-2l-8-5V3.5c0-.83-.67-1.5-1.5-1.5S10 2.67 10 3.5V9l-8 5v2l8-2.5V19l-2 1.5V22l3.5-1 3.5 1v-1.5L13 19v-5.5l8 2.5z"/>
-                        </svg>
-                       </div>`,
-                iconSize: [24, 24],
-                iconAnchor: [12, 12]
-            }});
-
-            // Create popup content
-            const popupContent = `
+            return `
                 <div class="flight-info">
-                    <strong>Callsign:</strong> ${{callsign}}<br>
-                    <strong>ICAO24:</strong> ${{icao24}}<br>
-                    <strong>Origin:</strong> ${{origin}}<br>
-                    <strong>Altitude:</strong> ${{altitude ? Math.round(altitude) + ' m (' + Math.round(altitude * 3.28084) + ' ft)' : 'N/A'}}<br>
-                    <strong>Speed:</strong> ${{velocity ? Math.round(velocity * 3.6) + ' km/h' : 'N/A'}}<br>
-                    <strong>Heading:</strong> ${{heading ? Math.round(heading) + '°' : 'N/A'}}<br>
-                    <strong>Distance:</strong> ${{distance.toFixed(2)}} km<br>
-                    <strong>On Ground:</strong> ${{onGround ? 'Yes' : 'No'}}
+                    <strong>Callsign:</strong> $${callsign}<br>
+                    <strong>ICAO24:</strong> $${icao24}<br>
+                    <strong>Origin:</strong> $${origin}<br>
+                    <strong>Altitude:</strong> $${altitude ? Math.round(altitude) + ' m (' + Math.round(altitude * 3.28084) + ' ft)' : 'N/A'}<br>
+                    <strong>Speed:</strong> $${velocity ? Math.round(velocity * 3.6) + ' km/h' : 'N/A'}<br>
+                    <strong>Heading:</strong> $${heading ? Math.round(heading) + '°' : 'N/A'}<br>
+                    <strong>Distance:</strong> $${(marker.distanceM / 1000).toFixed(2)} km<br>
+                    <strong>On Ground:</strong> $${onGround ? 'Yes' : 'No'}
                 </div>
             `;
+        }
+
+        // Create or update flight marker (distanceM: metres from home)
+        function updateFlightMarker(state, distanceM) {
+            const icao24 = state[0];
+            const lon = state[5];
+            const lat = state[6];
+            const altitude = state[7] || state[13]; // baro or geo altitude
+            const heading = state[10];
+
+            if (!lat || !lon) return;
 
-            // Update or create marker
-            if (flightMarkers[icao24]) {{
-                flightMarkers[icao24].setLatLng([lat, lon]);
-                flightMarkers[icao24].setIcon(planeIcon);
-                flightMarkers[icao24].getPopup().setContent(popupContent);
-            }} else {{
-                flightMarkers[icao24] = L.marker([lat, lon], {{ icon: planeIcon }})
+            // Create the marker once; later ticks only move it
+            let marker = flightMarkers[icao24];
+            if (marker) {
+                marker.setLatLng([lat, lon]);
+            } else {
+                marker = L.marker([lat, lon], { icon: PLANE_ICON })
                     .bindPopup(popupContent)
                     .addTo(map);
-            }}
+                marker.el = marker.getElement().firstElementChild;
+                flightMarkers[icao24] = marker;
+            }
+
+            marker.state = state;
+            marker.distanceM = distanceM;
+            marker.lastSeen = Date.now();
+            queueStyle(marker, heading || 0, getAltitudeColor(altitude));
 
-            flightMarkers[icao24].lastSeen = Date.now();
-        }}
+            if (marker.isPopupOpen()) marker.getPopup().update();
+        }
 
         // Remove stale markers
-        function removeStaleMarkers() {{
+        function removeStaleMarkers() {
             const now = Date.now();
             const staleTime = 60000; // 1 minute
 
-            Object.keys(flightMarkers).forEach(icao24 => {{
-                if (now - flightMarkers[icao24].lastSeen > staleTime) {{
+            Object.keys(flightMarkers).forEach(icao24 => {
+                if (now - flightMarkers[icao24].lastSeen > staleTime) {
                     map.removeLayer(flightMarkers[icao24]);
                     delete flightMarkers[icao24];
-                }}
-            }});
-        }}
+                }
+            });
+        }
 
         // Fetch and update flights
-        async function updateFlights() {{
+        async function updateFlights() {
             if (isUpdating) return;
             isUpdating = true;
             
             setStatus('loading', 'Updating...');
 
-            try {{
-                const url = `${{API_URL}}?lamin=${{BOUNDS.lamin}}&lomin=${{BOUNDS.lomin}}&lamax=${{BOUNDS.lamax}}&lomax=${{BOUNDS.lomax}}`;
+            try {
+                const url = `$${API_URL}?lamin=$${BOUNDS.lamin}&lomin=$${BOUNDS.lomin}&lamax=$${BOUNDS.lamax}&lomax=$${BOUNDS.lomax}`;
                 const response = await fetch(url);
 
-                if (response.status === 429) {{
+                if (response.status === 429) {
                     setStatus('error', 'Rate limited - waiting...');
                     console.warn('OpenSky API rate limit reached');
                     isUpdating = false;
                     return;
-                }}
+                }
 
-                if (!response.ok) {{
-                    throw new Error(`HTTP ${{response.status}}`);
-                }}
+                if (!response.ok) {
+                    throw new Error(`HTTP $${response.status}`);
+                }
 
                 const data = await response.json();
                 const states = data.states || [];
 
                 // Update all flight markers
                 let visibleFlights = 0;
-                states.forEach(state => {{
+                states.forEach(state => {
                     const lat = state[6];
                     const lon = state[5];
-                    if (lat && lon) {{
-                        const distance = haversineDistance(HOME_LAT, HOME_LON, lat, lon);
-                        if (distance <= RADIUS_KM) {{
-                            updateFlightMarker(state);
+                    if (lat && lon) {
+                        const distanceM = HOME_LATLNG.distanceTo([lat, lon]);
+                        if (distanceM <= RADIUS_M) {
+                            updateFlightMarker(state, distanceM);
                             visibleFlights++;
-                        }}
-                    }}
-                }});
+                        }
+                    }
+                });
 
                 // Remove stale markers
                 removeStaleMarkers();
 
                 // Update status
                 setStatus('active', 'Live');
-                flightCount.textContent = `${{visibleFlights}} flight${{visibleFlights !== 1 ? 's' : ''}}`;
+                flightCount.textContent = `$${visibleFlights} flight$${visibleFlights !== 1 ? 's' : ''}`;
                 
                 const now = new Date();
                 lastUpdateEl.textContent = now.toLocaleTimeString();
                 lastUpdate = now;
 
-            }} catch (error) {{
+            } catch (error) {
                 console.error('Error fetching flights:', error);
                 setStatus('error', 'Update failed');
-            }} finally {{
+            } finally {
                 isUpdating = false;
-            }}
-        }}
+            }
+        }
 
         // Start auto-update
-        function startAutoUpdate() {{
+        function startAutoUpdate() {
             updateFlights(); // Initial update
             updateTimer = setInterval(updateFlights, UPDATE_INTERVAL);
-        }}
+        }
 
         // Stop auto-update
-        function stopAutoUpdate() {{
-            if (updateTimer) {{
+        function stopAutoUpdate() {
+            if (updateTimer) {
                 clearInterval(updateTimer);
                 updateTimer = null;
-            }}
-        }}
+            }
+        }
 
         // Initialize
         console.log('LARA Live Flight Tracking initialized');
@@ -564,16 +397,279 @@ class FlightPlotter:
         startAutoUpdate();
 
         // Cleanup on page unload
-        window.addEventListener('beforeunload', () => {{
+        window.addEventListener('beforeunload', () => {
             stopAutoUpdate();
-        }});
+        });
     </script>
+    ${register_tile_cache}
 </body>
-</html>"""
+</html>""")
+
+
+class FlightPlotter:
+    """
+    Plots individual flight paths on maps, including real-time live tracking.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        center_lat: float,
+        center_lon: float,
+        conn: Optional[sqlite3.Connection] = None,
+    ):
+        """
+        Initialize flight plotter.
+
+        Args:
+            db_path: Path to LARA database
+            center_lat: Home latitude
+            center_lon: Home longitude
+            conn: Existing connection to share (with ``sqlite3.Row`` rows);
+                left open by ``close()``
+        """
+        self.db_path = db_path
+        self.center_lat = center_lat
+        self.center_lon = center_lon
+        self.radius_km = 50  # Default radius, will be read from config if available
+        self._owns_conn = conn is None
+        if conn is None:
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            configure_connection(conn, query_only=True)
+        self.conn = conn
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'flights_fts'"
+        ).fetchone()
+        self._callsign_ids = _CALLSIGN_IDS_FTS if has_fts else _CALLSIGN_IDS_SCAN
+
+    def plot_flight(self, flight_id: int, output_file: str):
+        """
+        Plot a single flight path.
+
+        Args:
+            flight_id: Flight ID
+            output_file: Output HTML filename
+        """
+        cursor = self.conn.cursor()
+
+        # Get flight info
+        cursor.execute("SELECT * FROM flights WHERE id = ?", (flight_id,))
+        flight = cursor.fetchone()
+
+        if not flight:
+            print(f"❌ Flight {flight_id} not found")
+            return
+
+        # Get positions
+        cursor.execute(
+            f"""
+            SELECT {_TRACK_COLUMNS} FROM positions
+            WHERE flight_id = ?
+            ORDER BY timestamp
+        """,
+            (flight_id,),
+        )
+
+        # Create map
+        map_gen = MapGenerator(self.center_lat, self.center_lon)
+
+        # Add flight path, streamed straight from the cursor
+        map_gen.add_flight_path(cursor, dict(flight))
+
+        # Add position markers
+        # map_gen.add_position_markers(positions)
+
+        # Save
+        map_gen.save(output_file)
+
+    def plot_recent_flights(
+        self, hours: int = 24, output_file: str = "recent_flights.html"
+    ):
+        """
+        Plot all recent flights.
+
+        Args:
+            hours: Number of hours to look back
+            output_file: Output HTML filename
+        """
+        cursor = self.conn.cursor()
+        since = (f"-{hours} hours",)
+
+        cursor.execute(f"SELECT * FROM flights WHERE {_RECENT_FLIGHTS}", since)
+        flights = {flight["id"]: flight for flight in cursor}
+
+        print(f"📍 Plotting {len(flights)} recent flights...")
+
+        # Create map
+        map_gen = MapGenerator(self.center_lat, self.center_lon)
+
+        # All positions in one ordered query instead of one per flight
+        self._add_tracks(
+            map_gen,
+            flights,
+            f"""
+            SELECT {_TRACK_COLUMNS} FROM positions
+            WHERE flight_id IN (SELECT id FROM flights WHERE {_RECENT_FLIGHTS})
+            ORDER BY flight_id, timestamp
+        """,
+            since,
+        )
+
+        # Save
+        map_gen.save(output_file)
+
+    def plot_callsign(self, callsign: str, output_file: str):
+        """
+        Plot all occurrences of a specific callsign.
 
-        return html
+        Args:
+            callsign: Flight callsign
+            output_file: Output HTML filename
+        """
+        cursor = self.conn.cursor()
+
+        pattern = (f"%{callsign}%",)
+        cursor.execute(
+            f"""
+            SELECT * FROM flights
+            WHERE id IN ({self._callsign_ids})
+            ORDER BY first_seen DESC
+        """,
+            pattern,
+        )
+
+        flights = {flight["id"]: flight for flight in cursor}
+
+        if not flights:
+            print(f"❌ No flights found for callsign: {callsign}")
+            return
+
+        print(f"📍 Plotting {len(flights)} flights for {callsign}...")
+
+        # Create map
+        map_gen = MapGenerator(self.center_lat, self.center_lon)
+
+        # Add each occurrence
+        self._add_tracks(
+            map_gen,
+            flights,
+            f"""
+            SELECT {_TRACK_COLUMNS} FROM positions
+            WHERE flight_id IN ({self._callsign_ids})
+            ORDER BY flight_id, timestamp
+        """,
+            pattern,
+        )
+
+        # Save
+        map_gen.save(output_file)
+
+    def _add_tracks(
+        self,
+        map_gen: MapGenerator,
+        flights: Dict[int, sqlite3.Row],
+        query: str,
+        params: tuple,
+    ):
+        """
+        Stream a positions query onto the map, one path per flight.
+
+        Rows go from the cursor to ``add_flight_path`` without being
+        collected, so memory stays flat however many positions match.
+
+        Args:
+            map_gen: Map to draw on
+            flights: Flight rows by ID
+            query: SELECT over positions, ordered by flight_id then timestamp
+            params: Query parameters
+        """
+        cursor = self.conn.execute(query, params)
+        for flight_id, rows in groupby(cursor, key=itemgetter("flight_id")):
+            # Skip flights inserted between the two queries
+            flight = flights.get(flight_id)
+            if flight is not None:
+                map_gen.add_flight_path(rows, dict(flight))
+
+    def plot_live(
+        self, output_file: str = "live_flights.html", api_url: str = OPENSKY_STATES_URL
+    ):
+        """
+        Create a live flight tracking map with real-time updates.
+
+        This generates an HTML file with embedded JavaScript that fetches
+        flight data directly from OpenSky Network API every 10 seconds.
+        Uses anonymous API access (no credentials required).
+
+        Features:
+        - Auto-refresh every 10 seconds (OpenSky rate limit compliant)
+        - Color-coded by altitude
+        - Flight info popups
+        - Loading indicators
+        - Error handling for rate limits
+
+        Args:
+            output_file: Output HTML filename
+            api_url: States endpoint the page polls; pass ``PROXY_PATH`` when
+                serving the page with ``live_proxy.create_server``
+
+        Note:
+            Anonymous API access has strict rate limits (max ~100 requests/day).
+            Serving through ``live_proxy`` shares one upstream call per
+            refresh between all viewers.
+        """
+        print("🔴 Generating live flight tracking map...")
+
+        # Calculate bounding box for API query
+        lat_min, lon_min, lat_max, lon_max = get_bounding_box(
+            self.center_lat, self.center_lon, self.radius_km
+        )
+
+        # Generate HTML with embedded JavaScript for live updates
+        html_content = self._generate_live_html(
+            lat_min, lon_min, lat_max, lon_max, api_url
+        )
+
+        # Write to file
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(html_content)
+
+        print(f"✅ Live tracking map saved to: {output_file}")
+        print("   Updates every 10 seconds using OpenSky Network API")
+        print("   ⚠️  Anonymous access is rate-limited (~100 requests/day)")
+
+    def _generate_live_html(
+        self,
+        lat_min: float,
+        lon_min: float,
+        lat_max: float,
+        lon_max: float,
+        api_url: str = OPENSKY_STATES_URL,
+    ) -> str:
+        """
+        Generate complete HTML with embedded JavaScript for live tracking.
+
+        Args:
+            lat_min, lon_min, lat_max, lon_max: Bounding box coordinates
+            api_url: States endpoint the page polls
+
+        Returns:
+            Complete HTML string
+        """
+        return _LIVE_HTML.substitute(
+            center_lat=self.center_lat,
+            center_lon=self.center_lon,
+            radius_km=self.radius_km,
+            lat_min=lat_min,
+            lon_min=lon_min,
+            lat_max=lat_max,
+            lon_max=lon_max,
+            api_url=api_url,
+            register_tile_cache=REGISTER_SCRIPT,
+        )
 
     def close(self):
-        """Close database connection."""
-        if self.conn:
+        """Close database connection, unless it was passed in."""
+        if self.conn and self._owns_conn:
+            optimize_connection(self.conn)
             self.conn.close()
@@ -4,9 +4,46 @@ Creates density heatmaps of flight activity.
 """
 
 from folium import plugins
+import numpy as np
 import sqlite3
+from typing import Optional
 
 from lara.config import Colors
+from lara.tracking.database import configure_connection, optimize_connection
+
+MAX_HEATMAP_BINS = 512  # Grid cells per axis when binning heatmap points
+
+
+def bin_heat_points(data: np.ndarray, bins: Optional[int] = None) -> np.ndarray:
+    """
+    Aggregate weighted positions into a lat/lon grid, one point per cell.
+
+    Leaflet.heat sums nearby points into its own canvas grid anyway, so
+    pre-summing weights into cells much smaller than the blur radius looks
+    the same while serializing far fewer points.
+
+    Args:
+        data: Array of shape (N, 3) with latitude, longitude and weight
+        bins: Cells per axis (default: MAX_HEATMAP_BINS, a few hundred
+            metres per cell over the tracking radius)
+
+    Returns:
+        Array of shape (cells, 3) with cell centres and summed weights
+    """
+    if len(data) == 0:
+        return data
+    if bins is None:
+        bins = MAX_HEATMAP_BINS
+
+    weights, lat_edges, lon_edges = np.histogram2d(
+        data[:, 0], data[:, 1], bins=bins, weights=data[:, 2]
+    )
+    lat_idx, lon_idx = np.nonzero(weights)
+    lat_centres = (lat_edges[:-1] + lat_edges[1:]) / 2
+    lon_centres = (lon_edges[:-1] + lon_edges[1:]) / 2
+    return np.column_stack(
+        [lat_centres[lat_idx], lon_centres[lon_idx], weights[lat_idx, lon_idx]]
+    )
 
 
 class HeatmapGenerator:
@@ -14,7 +51,13 @@ class HeatmapGenerator:
     Generates heatmaps showing flight density.
     """
 
-    def __init__(self, db_path: str, center_lat: float, center_lon: float):
+    def __init__(
+        self,
+        db_path: str,
+        center_lat: float,
+        center_lon: float,
+        conn: Optional[sqlite3.Connection] = None,
+    ):
         """
         Initialize heatmap generator.
 
@@ -22,39 +65,43 @@ class HeatmapGenerator:
             db_path: Path to LARA database
             center_lat: Home latitude
             center_lon: Home longitude
+            conn: Existing connection to share (with ``sqlite3.Row`` rows);
+                left open by ``close()``
         """
         self.db_path = db_path
         self.center_lat = center_lat
         self.center_lon = center_lon
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
-
-    def generate_traffic_heatmap(self, output_file: str = "traffic_heatmap.html"):
+        self._owns_conn = conn is None
+        if conn is None:
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            configure_connection(conn, query_only=True)
+        self.conn = conn
+
+    def generate_traffic_heatmap(
+        self, output_file: str = "traffic_heatmap.html", bins: Optional[int] = None
+    ):
         """
         Generate heatmap of all flight traffic.
 
         Args:
             output_file: Output HTML filename
+            bins: Grid cells per axis (see ``bin_heat_points``)
         """
         print("🔥 Generating traffic density heatmap...")
 
-        cursor = self.conn.cursor()
-
         # Get all positions
-        cursor.execute("""
-            SELECT latitude, longitude, distance_from_home_km
+        coords = self._fetch_array("""
+            SELECT latitude, longitude
             FROM positions
             WHERE latitude IS NOT NULL AND longitude IS NOT NULL
         """)
 
-        # Prepare data for heatmap
-        heat_data = []
-        for row in cursor.fetchall():
-            # Weight by proximity (closer = higher weight)
-            weight = 1.0  # / (row['distance_from_home_km'] + 0.1)
-            heat_data.append([row["latitude"], row["longitude"], weight])
+        # Prepare data for heatmap; every position weighs the same
+        data = np.column_stack([coords, np.ones(len(coords))])
+        heat_data = bin_heat_points(data, bins).tolist()
 
-        print(f"   Plotting {len(heat_data)} positions...")
+        print(f"   Plotting {len(data)} positions in {len(heat_data)} cells...")
 
         # Create base map
         from .map_generator import MapGenerator
@@ -68,38 +115,35 @@ class HeatmapGenerator:
             max_zoom=18,
             radius=10,
             blur=25,
-            gradient=Colors.HEATMAP_GRADIENT,
+            gradient=dict(Colors.HEATMAP_GRADIENT),
         ).add_to(map_gen.map)
 
         # Save
         map_gen.save(output_file)
 
-    def generate_altitude_heatmap(self, output_file: str = "altitude_heatmap.html"):
+    def generate_altitude_heatmap(
+        self, output_file: str = "altitude_heatmap.html", bins: Optional[int] = None
+    ):
         """
         Generate heatmap weighted by altitude.
 
         Args:
             output_file: Output HTML filename
+            bins: Grid cells per axis (see ``bin_heat_points``)
         """
         print("🔥 Generating altitude heatmap...")
 
-        cursor = self.conn.cursor()
-
-        cursor.execute("""
-            SELECT latitude, longitude, altitude_m
+        # Weight by inverse altitude (lower = higher weight for noise analysis)
+        data = self._fetch_array("""
+            SELECT latitude, longitude, 1.0 / (altitude_m / 1000.0 + 0.1)
             FROM positions
-            WHERE latitude IS NOT NULL 
-            AND longitude IS NOT NULL 
+            WHERE latitude IS NOT NULL
+            AND longitude IS NOT NULL
             AND altitude_m IS NOT NULL
         """)
+        heat_data = bin_heat_points(data, bins).tolist()
 
-        # Weight by altitude (lower = higher weight for noise analysis)
-        heat_data = []
-        for row in cursor.fetchall():
-            weight = 1.0 / (row["altitude_m"] / 1000 + 0.1)  # Inverse altitude
-            heat_data.append([row["latitude"], row["longitude"], weight])
-
-        print(f"   Plotting {len(heat_data)} positions...")
+        print(f"   Plotting {len(data)} positions in {len(heat_data)} cells...")
 
         # Create base map
         from .map_generator import MapGenerator
@@ -112,13 +156,33 @@ class HeatmapGenerator:
             min_opacity=0.3,
             radius=10,
             blur=25,
-            gradient=Colors.HEATMAP_GRADIENT,
+            gradient=dict(Colors.HEATMAP_GRADIENT),
         ).add_to(map_gen.map)
 
         # Save
         map_gen.save(output_file)
 
+    def _fetch_array(self, query: str) -> np.ndarray:
+        """
+        Run a numeric query and return its rows as a float64 array.
+
+        Uses plain tuple rows rather than the connection's row factory,
+        which would build an object per position.
+
+        Args:
+            query: SELECT returning only non-NULL numeric columns
+
+        Returns:
+            Array of shape (rows, columns)
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query)
+        columns = len(cursor.description)
+        return np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, columns)
+
     def close(self):
-        """Close database connection."""
-        if self.conn:
+        """Close database connection, unless it was passed in."""
+        if self.conn and self._owns_conn:
+            optimize_connection(self.conn)
             self.conn.close()
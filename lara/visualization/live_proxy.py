@@ -0,0 +1,221 @@
+"""
+Live Tracking Proxy
+Serves the live tracking page and relays its OpenSky requests through a
+shared, gzip-compressed cache so any number of viewers cost one upstream
+call per refresh interval.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .tile_cache import SERVICE_WORKER_FILE, SERVICE_WORKER_JS
+
+logger = logging.getLogger(__name__)
+
+OPENSKY_STATES_URL = "https://opensky-network.org/api/states/all"
+PROXY_PATH = "/api/states"
+CACHE_TTL_S = 10.0  # Matches the page's UPDATE_INTERVAL
+UPSTREAM_TIMEOUT_S = 10
+
+
+class StatesCache:
+    """
+    Time-bounded cache of the OpenSky states for one fixed bounding box,
+    stored gzip-compressed.
+
+    The box is set by the server, never by clients, so viewers can't drive
+    extra upstream calls. Failed requests are cached for the TTL as well,
+    so a rate limit isn't hammered by every poll. One thread refreshes an
+    expired entry while the others keep getting the previous one.
+    """
+
+    def __init__(
+        self,
+        bounds: Tuple[float, float, float, float],
+        url: str = OPENSKY_STATES_URL,
+        ttl: float = CACHE_TTL_S,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            bounds: (lat_min, lon_min, lat_max, lon_max) to request
+            url: Upstream states endpoint
+            ttl: Seconds a response (or error) is served before refetching
+            session: HTTP session to use (default: a new requests.Session)
+        """
+        lat_min, lon_min, lat_max, lon_max = bounds
+        self.params = {
+            "lamin": lat_min,
+            "lomin": lon_min,
+            "lamax": lat_max,
+            "lomax": lon_max,
+        }
+        self.url = url
+        self.ttl = ttl
+        self.session = session or requests.Session()
+        # (expires_at, etag, gzip body, error); replaced whole, read unlocked
+        self._entry: Optional[
+            Tuple[float, str, bytes, Optional[requests.RequestException]]
+        ] = None
+        self._refresh_lock = threading.Lock()
+
+    def get(self) -> Tuple[str, bytes]:
+        """
+        Get the cached response, refreshing it once expired.
+
+        Returns:
+            Tuple of (ETag, gzip-compressed JSON body)
+
+        Raises:
+            requests.RequestException: Upstream request failed (cached for
+                the TTL like a response)
+        """
+        entry = self._entry
+        if entry is None or entry[0] <= time.monotonic():
+            # Only the first caller waits for a refresh; the rest keep
+            # serving the expired entry until it lands
+            if self._refresh_lock.acquire(blocking=entry is None):
+                try:
+                    entry = self._entry
+                    if entry is None or entry[0] <= time.monotonic():
+                        entry = self._entry = self._fetch()
+                finally:
+                    self._refresh_lock.release()
+
+        error = entry[3]
+        if error is not None:
+            # Fresh traceback each time, or re-raises would keep growing it
+            raise error.with_traceback(None)
+        return entry[1], entry[2]
+
+    def _fetch(self) -> Tuple[float, str, bytes, Optional[requests.RequestException]]:
+        """Request the states once and build a cache entry from the outcome."""
+        expires_at = time.monotonic() + self.ttl
+        try:
+            response = self.session.get(
+                self.url, params=self.params, timeout=UPSTREAM_TIMEOUT_S
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return expires_at, "", b"", e
+
+        body = response.content
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        return expires_at, etag, gzip.compress(body), None
+
+
+class LiveProxyHandler(BaseHTTPRequestHandler):
+    """
+    Serves the live page, the tile cache service worker and ``PROXY_PATH``
+    from a StatesCache; every other path is a 404.
+    """
+
+    def __init__(self, *args, cache: StatesCache, page: Path, **kwargs):
+        self.cache = cache
+        self.page = page
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        """Serve proxied states, the page or the service worker."""
+        path = urlsplit(self.path).path
+        if path == PROXY_PATH:
+            # The query is ignored: the cache always requests its own box
+            self._send_states()
+        elif path in ("/", "/" + self.page.name):
+            try:
+                body = self.page.read_bytes()
+            except OSError:
+                self.send_error(404)
+                return
+            self._send_static(body, "text/html; charset=utf-8")
+        elif path == "/" + SERVICE_WORKER_FILE:
+            self._send_static(SERVICE_WORKER_JS, "text/javascript")
+        else:
+            self.send_error(404)
+
+    def _send_static(self, body: bytes, content_type: str):
+        """Send a small in-memory file."""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_states(self):
+        """Send the cached states, gzipped if accepted, or a 304."""
+        try:
+            etag, gzip_body = self.cache.get()
+        except requests.HTTPError as e:
+            # Pass rate limits through; the page reports them
+            status = e.response.status_code if e.response is not None else 502
+            logger.warning("OpenSky request failed: %s", e)
+            self.send_error(status)
+            return
+        except requests.RequestException as e:
+            logger.warning("OpenSky request failed: %s", e)
+            self.send_error(502)
+            return
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip_body
+        else:
+            body = gzip.decompress(gzip_body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if body is gzip_body:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def create_server(
+    page: str,
+    cache: StatesCache,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for a live tracking page and its states proxy.
+
+    Generate the page with ``FlightPlotter.plot_live(api_url=PROXY_PATH)``,
+    then call ``serve_forever()`` on the result. Only the page itself, the
+    tile cache service worker and ``PROXY_PATH`` are served, never other
+    files from the page's directory.
+
+    Args:
+        page: Path of the generated live tracking page
+        cache: States cache for the page's bounding box
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        Bound, not yet serving, ThreadingHTTPServer
+    """
+    handler = partial(LiveProxyHandler, cache=cache, page=Path(page).resolve())
+    return ThreadingHTTPServer((host, port), handler)
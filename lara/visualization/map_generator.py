@@ -6,15 +6,24 @@ Updated to properly visualize linear flight corridors instead of circular cluste
 """
 
 import folium
-from typing import Dict, Any, List
+import numpy as np
+import sqlite3
+from types import MappingProxyType
+from typing import Dict, Any, Final, Iterable, List, Mapping, Optional, Sequence
 
 from lara.config import Settings, Colors
+from lara.utils import classify_altitude, parallel_offsets, simplify_path
 
-MAP_TILE_URLS = {
-    "CartoDB.DarkMatter": "https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png",
-    "CartoDB.Positron": "https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",
-    "OpenStreetMap": "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
-}
+MAP_TILE_URLS: Final[Mapping[str, str]] = MappingProxyType(
+    {
+        "CartoDB.DarkMatter": "https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png",
+        "CartoDB.Positron": "https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",
+        "OpenStreetMap": "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
+    }
+)
+
+# Corridors ranked past the palette share its last colour
+_LAST_RANK_COLOR: Final = len(Colors.RANKED_COLORS) - 1
 
 
 class MapGenerator:
@@ -52,6 +61,9 @@ class MapGenerator:
         # Create base map
         self.map = self._create_base_map()
 
+        # Flight paths share one layer, created with the first path
+        self._flight_layer: Optional[folium.FeatureGroup] = None
+
     def _create_base_map(self) -> folium.Map:
         """Create base Folium map with dark theme."""
 
@@ -75,36 +87,60 @@ class MapGenerator:
             icon=folium.Icon(color="red", icon="home", prefix="fa"),
         ).add_to(m)
 
+        # Page title and favicon
+        m.get_root().header.add_child(
+            folium.Element(
+                '<title>LARA Map</title>\n<link rel="icon" href="../docu/icon.ico">'
+            ),
+            name="lara_head",
+        )
+
         return m
 
     def add_flight_path(
-        self, positions: List[Dict[str, Any]], flight_info: Dict[str, Any]
+        self, positions: Iterable[Mapping[str, Any]], flight_info: Dict[str, Any]
     ):
         """
         Add a flight path to the map.
 
         Args:
-            positions: List of position dictionaries with lat/lon/altitude
+            positions: Positions with latitude/longitude (and optionally
+                altitude_m) keys, in time order; read once, so a cursor or
+                generator works
             flight_info: Flight metadata (callsign, icao24, etc.)
         """
-        if not positions:
+        # Read lat/lon/altitude in a single pass; NULLs become NaN. Query
+        # rows always carry altitude_m (sqlite3.Row has no .get), plain
+        # dicts may leave it out
+        track = np.array(
+            [
+                (
+                    p["latitude"],
+                    p["longitude"],
+                    (
+                        p["altitude_m"]
+                        if isinstance(p, sqlite3.Row)
+                        else p.get("altitude_m")
+                    ),
+                )
+                for p in positions
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        track = track[~np.isnan(track[:, :2]).any(axis=1)]
+        if not len(track):
             return
 
-        # Extract coordinates
-        coords = [
-            [p["latitude"], p["longitude"]]
-            for p in positions
-            if p["latitude"] and p["longitude"]
-        ]
+        # Round to ~1 m and drop vertices the eye can't see at map scale
+        coords = simplify_path(
+            np.round(track[:, :2], 5), Settings.FLIGHT_PATH_SIMPLIFY_DEG
+        ).tolist()
 
-        if not coords:
-            return
+        if self._flight_layer is None:
+            self._flight_layer = folium.FeatureGroup(name="Flights").add_to(self.map)
 
-        # Filter out None values before calculating average
-        altitudes = [
-            p["altitude_m"] for p in positions if p.get("altitude_m") is not None
-        ]
-        avg_altitude = sum(altitudes) / len(altitudes) if altitudes else 0.0
+        altitudes = track[:, 2][~np.isnan(track[:, 2])]
+        avg_altitude = float(altitudes.mean()) if len(altitudes) else 0.0
         # Color by altitude
         color = self._get_altitude_color(avg_altitude)
 
@@ -116,7 +152,7 @@ class MapGenerator:
             opacity=Settings.FLIGHT_PATH_OPACITY,
             popup=f"{flight_info.get('callsign', 'Unknown')} - {avg_altitude:.0f}m",
             tooltip=flight_info.get("callsign", "Unknown"),
-        ).add_to(self.map)
+        ).add_to(self._flight_layer)
 
     def add_corridor(self, corridor: Dict[str, Any], rank: int):
         """
@@ -136,12 +172,65 @@ class MapGenerator:
                 - linearity_score: Quality metric (0-1)
             rank: Corridor rank (for color coding and priority)
         """
+        self.add_corridors([corridor], ranks=[rank])
+
+    def add_corridors(
+        self,
+        corridors: Sequence[Dict[str, Any]],
+        ranks: Optional[Sequence[int]] = None,
+    ):
+        """
+        Add several corridors, computing their width indicators in one pass.
+
+        Args:
+            corridors: Corridor data dictionaries (see ``add_corridor``)
+            ranks: Rank per corridor (default: each corridor's ``rank`` key)
+        """
+        if not corridors:
+            return
+        if ranks is None:
+            ranks = [corridor["rank"] for corridor in corridors]
+
         # Extract corridor geometry
-        start_lat = corridor.get("start_lat", corridor["center_lat"])
-        start_lon = corridor.get("start_lon", corridor["center_lon"])
-        end_lat = corridor.get("end_lat", corridor["center_lat"])
-        end_lon = corridor.get("end_lon", corridor["center_lon"])
+        endpoints = np.array(
+            [
+                [
+                    corridor.get("start_lat", corridor["center_lat"]),
+                    corridor.get("start_lon", corridor["center_lon"]),
+                    corridor.get("end_lat", corridor["center_lat"]),
+                    corridor.get("end_lon", corridor["center_lon"]),
+                    # Quarter width for visual clarity
+                    corridor.get("width_km", 2.0) / 4,
+                ]
+                for corridor in corridors
+            ],
+            dtype=np.float64,
+        )
+        offsets = parallel_offsets(*endpoints.T)
+
+        for corridor, rank, (start_lat, start_lon, end_lat, end_lon, _), bounds in zip(
+            corridors, ranks, endpoints.tolist(), offsets
+        ):
+            self._draw_corridor(
+                corridor, rank, [[start_lat, start_lon], [end_lat, end_lon]], bounds
+            )
+
+    def _draw_corridor(
+        self,
+        corridor: Dict[str, Any],
+        rank: int,
+        locations: List[List[float]],
+        offsets: np.ndarray,
+    ):
+        """
+        Draw one corridor line and its width indicators.
 
+        Args:
+            corridor: Corridor data
+            rank: Corridor rank
+            locations: Start and end points of the centre line
+            offsets: Width boundary endpoints, shape (2, 2, 2)
+        """
         # Color based on rank
         color = self._get_rank_color(rank)
 
@@ -152,7 +241,7 @@ class MapGenerator:
 
         # Create main corridor line
         corridor_line = folium.PolyLine(
-            locations=[[start_lat, start_lon], [end_lat, end_lon]],
+            locations=locations,
             color=color,
             weight=weight,
             opacity=0.8,
@@ -162,10 +251,7 @@ class MapGenerator:
         corridor_line.add_to(self.map)
 
         # Add width indicator (parallel lines)
-        width_lines = self._create_width_indicators(
-            start_lat, start_lon, end_lat, end_lon, corridor.get("width_km", 2.0), color
-        )
-        for line in width_lines:
+        for line in self._create_width_indicators(offsets, color):
             line.add_to(self.map)
 
     def _create_corridor_popup(self, corridor: Dict[str, Any], rank: int) -> str:
@@ -203,93 +289,30 @@ class MapGenerator:
         return html
 
     def _create_width_indicators(
-        self,
-        start_lat: float,
-        start_lon: float,
-        end_lat: float,
-        end_lon: float,
-        width_km: float,
-        color: str,
+        self, offsets: np.ndarray, color: str
     ) -> List[folium.PolyLine]:
         """
         Create parallel lines to indicate corridor width.
 
         Args:
-            start_lat, start_lon: Start point
-            end_lat, end_lon: End point
-            width_km: Corridor width in km
+            offsets: Boundary endpoints for one corridor, shape (2, 2, 2)
+                as returned per segment by ``parallel_offsets``
             color: Line color
 
         Returns:
             List of polylines representing width boundaries
         """
-        import math
-
-        # Calculate perpendicular offset (half width on each side)
-        offset_km = width_km / 4  # Quarter width for visual clarity
-
-        # Calculate bearing
-        lat1, lon1, lat2, lon2 = map(
-            math.radians, [start_lat, start_lon, end_lat, end_lon]
-        )
-        dlon = lon2 - lon1
-        x = math.sin(dlon) * math.cos(lat2)
-        y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(
-            lat2
-        ) * math.cos(dlon)
-        bearing = math.atan2(x, y)
-
-        # Perpendicular bearing (±90°)
-        perp_bearing_1 = bearing + math.pi / 2
-        perp_bearing_2 = bearing - math.pi / 2
-
-        R = 6371  # Earth radius in km
-
-        # Calculate offset points
-        def offset_point(lat, lon, bearing, distance):
-            lat_rad = math.radians(lat)
-            lon_rad = math.radians(lon)
-
-            lat_new = math.asin(
-                math.sin(lat_rad) * math.cos(distance / R)
-                + math.cos(lat_rad) * math.sin(distance / R) * math.cos(bearing)
-            )
-            lon_new = lon_rad + math.atan2(
-                math.sin(bearing) * math.sin(distance / R) * math.cos(lat_rad),
-                math.cos(distance / R) - math.sin(lat_rad) * math.sin(lat_new),
+        # Dashed boundary lines, one per side
+        return [
+            folium.PolyLine(
+                locations=side.tolist(),
+                color=color,
+                weight=1,
+                opacity=0.4,
+                dash_array="5, 5",
             )
-
-            return math.degrees(lat_new), math.degrees(lon_new)
-
-        # Create parallel lines
-        start_offset_1 = offset_point(start_lat, start_lon, perp_bearing_1, offset_km)
-        end_offset_1 = offset_point(end_lat, end_lon, perp_bearing_1, offset_km)
-
-        start_offset_2 = offset_point(start_lat, start_lon, perp_bearing_2, offset_km)
-        end_offset_2 = offset_point(end_lat, end_lon, perp_bearing_2, offset_km)
-
-        lines = []
-
-        # Add dashed boundary lines
-        line1 = folium.PolyLine(
-            locations=[start_offset_1, end_offset_1],
-            color=color,
-            weight=1,
-            opacity=0.4,
-            dash_array="5, 5",
-        )
-        lines.append(line1)
-
-        line2 = folium.PolyLine(
-            locations=[start_offset_2, end_offset_2],
-            color=color,
-            weight=1,
-            opacity=0.4,
-            dash_array="5, 5",
-        )
-        lines.append(line2)
-
-        return lines
+            for side in offsets
+        ]
 
     def _get_altitude_color(self, altitude_m: float) -> str:
         """
@@ -301,18 +324,7 @@ class MapGenerator:
         Returns:
             Color hex code
         """
-        if altitude_m < 1000:
-            return Colors.ALTITUDE_COLORS["very_low"]
-        elif altitude_m < 3000:
-            return Colors.ALTITUDE_COLORS["low"]
-        elif altitude_m < 6000:
-            return Colors.ALTITUDE_COLORS["medium"]
-        elif altitude_m < 9000:
-            return Colors.ALTITUDE_COLORS["high"]
-        elif altitude_m < 12000:
-            return Colors.ALTITUDE_COLORS["very_high"]
-        else:
-            return Colors.ALTITUDE_COLORS["cruise"]
+        return Colors.ALTITUDE_COLORS[classify_altitude(altitude_m)]
 
     def _get_rank_color(self, rank: int) -> str:
         """
@@ -326,7 +338,7 @@ class MapGenerator:
         Returns:
             Color hex code
         """
-        return Colors.RANKED_COLORS[min(rank - 1, len(Colors.RANKED_COLORS) - 1)]
+        return Colors.RANKED_COLORS[min(rank - 1, _LAST_RANK_COLOR)]
 
     def save(self, filename: str):
         """
@@ -337,14 +349,4 @@ class MapGenerator:
         """
         self.map.save(filename)
 
-        # Modify HTML file to include title and favicon
-        with open(filename, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        line1 = "<title>LARA Map</title>"
-        line2 = '<link rel="icon" href="../docu/icon.ico">'
-        insert = "<head>\n    " + line1 + "\n    " + line2
-        html_content = html_content.replace("<head>", insert, 1)
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
         print(f"✅ Map saved to: {filename}")
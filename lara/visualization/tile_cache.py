@@ -0,0 +1,105 @@
+"""
+Tile Cache Service Worker
+Cache-first service worker for basemap tiles and Leaflet assets, so repeat
+dashboard visits load maps without refetching tiles. The cache is capped at
+a fixed number of entries (oldest evicted first) and entries are refetched
+once they are a week old.
+
+Service workers only register over http(s); pages opened from disk skip
+registration and fetch tiles as before.
+"""
+
+from pathlib import Path
+
+SERVICE_WORKER_FILE = "sw.js"
+
+SERVICE_WORKER_JS = b"""// LARA tile cache: cache-first for basemap tiles and Leaflet assets
+const CACHE = 'lara-tiles-v2';
+const CACHED_HOSTS = ['basemaps.cartocdn.com', 'tile.openstreetmap.org', 'unpkg.com'];
+const MAX_ENTRIES = 500;  // Oldest entries are evicted beyond this
+const MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;  // Refetch entries older than this
+const STAMP = 'X-Lara-Cached-At';
+
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(
+    caches.keys()
+        .then(names => Promise.all(names
+            .filter(name => name.startsWith('lara-tiles-') && name !== CACHE)
+            .map(name => caches.delete(name))))
+        .then(() => self.clients.claim())
+));
+
+// Tiles load as <img>, which gives opaque responses; those can't be aged
+// and count toward storage quota at a heavily padded size. The cached
+// hosts allow CORS, so refetch in cors mode and only cache readable
+// responses, falling back to the plain request otherwise.
+function fetchReadable(request) {
+    return fetch(request.url, {mode: 'cors', credentials: 'omit'})
+        .catch(() => fetch(request));
+}
+
+// Store a response stamped with its fetch time, then trim the cache to
+// MAX_ENTRIES; keys() lists entries oldest put first. Failures (e.g. a
+// full quota) only mean the response is not cached.
+function store(cache, request, response) {
+    const headers = new Headers(response.headers);
+    headers.set(STAMP, String(Date.now()));
+    return response.blob()
+        .then(body => cache.put(request, new Response(body, {
+            status: response.status,
+            statusText: response.statusText,
+            headers,
+        })))
+        .then(() => cache.keys())
+        .then(keys => Promise.all(keys
+            .slice(0, Math.max(keys.length - MAX_ENTRIES, 0))
+            .map(key => cache.delete(key))))
+        .catch(() => {});
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const host = new URL(request.url).hostname;
+    if (!CACHED_HOSTS.some(h => host === h || host.endsWith('.' + h))) return;
+
+    event.respondWith(
+        caches.open(CACHE).then(cache =>
+            cache.match(request).then(hit => {
+                if (hit && Date.now() - Number(hit.headers.get(STAMP)) < MAX_AGE_MS) {
+                    return hit;
+                }
+                return fetchReadable(request).then(response => {
+                    if (response.ok && response.type === 'cors') {
+                        event.waitUntil(store(cache, request, response.clone()));
+                    }
+                    return response;
+                }, error => hit || Promise.reject(error));
+            })
+        )
+    );
+});
+"""
+
+# Registration snippet for generated pages; a no-op on file:// pages
+REGISTER_SCRIPT = f"""<script>
+        if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {{
+            navigator.serviceWorker.register('{SERVICE_WORKER_FILE}').catch(() => {{}});
+        }}
+    </script>"""
+
+
+def write_service_worker(directory: Path) -> Path:
+    """
+    Write the tile cache service worker into a directory of pages.
+
+    Args:
+        directory: Directory the registering pages are served from
+
+    Returns:
+        Path of the written script
+    """
+    path = Path(directory) / SERVICE_WORKER_FILE
+    path.write_bytes(SERVICE_WORKER_JS)
+    return path
@@ -8,6 +8,7 @@ Usage:
 
 import sys
 import argparse
+import logging
 from pathlib import Path
 
 # Add parent directory to path
@@ -38,6 +39,16 @@ def main():
         print(f"❌ Error loading configuration: {e}")
         sys.exit(1)
 
+    # Module loggers (e.g. authentication) print plain messages like the UI
+    level_name = str(config.get("logging.level", "INFO")).upper()
+    level = logging.getLevelName(level_name)
+    known = isinstance(level, int)
+    logging.basicConfig(level=level if known else logging.INFO, format="%(message)s")
+    if not known:
+        logging.getLogger(__name__).warning(
+            "⚠️  Unknown logging.level %r, using INFO", level_name
+        )
+
     # Create and run collector
     try:
         collector = FlightCollector(config)
@@ -240,7 +240,7 @@ def search_flight(reader: FlightReader, callsign: str):
 
 def display_flight_route(reader: FlightReader, flight_id: int):
     """Display flight route."""
-    result = reader.get_flight_route(flight_id)
+    result = reader.iter_flight_route(flight_id)
 
     if not result:
         print(f"❌ Flight ID {flight_id} not found")
@@ -252,7 +252,7 @@ def display_flight_route(reader: FlightReader, flight_id: int):
     print("=" * 100)
     print(f"Country: {flight['origin_country']}")
     print(f"Duration: {flight['first_seen']} to {flight['last_seen']}")
-    print(f"Positions: {len(positions)}")
+    print(f"Positions: {flight['position_count']}")
     print("=" * 100)
     print(
         f"{'Time':<20} {'Lat':<12} {'Lon':<12} {'Altitude':<12} {'Speed':<12} {'Distance':<10}"
@@ -20,6 +20,9 @@ Examples:
 
     # Plot specific callsign
     python scripts/visualize.py --callsign DLH123 --output dlh123.html
+
+    # Serve live tracking through a shared OpenSky cache
+    python scripts/visualize.py --live --serve
 """
 
 import sys
@@ -32,6 +35,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from lara.config import Config
 from lara.visualization import MapGenerator, FlightPlotter, HeatmapGenerator, Dashboard
+from lara.visualization.live_proxy import PROXY_PATH, StatesCache, create_server
+from lara.utils import get_bounding_box
 from lara.analysis import FlightAnalyzer
 
 
@@ -56,6 +61,9 @@ Examples:
     
   Plot specific callsign:
     python3 scripts/visualize.py --callsign DLH123
+
+  Serve live tracking (one OpenSky request per refresh for all viewers):
+    python3 scripts/visualize.py --live --serve
         """,
     )
 
@@ -127,6 +135,16 @@ Examples:
         help="Output directory for dashboard (default: visualizations)",
     )
 
+    # Live tracking options
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="With --live: serve the map and proxy OpenSky through a shared cache",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port for --serve (default: 8000)"
+    )
+
     # Map options
     parser.add_argument(
         "--style",
@@ -189,9 +207,30 @@ Examples:
             # Plot live flights
             output = args.output or "live_flights.html"
             plotter = FlightPlotter(db_path, center_lat, center_lon)
-            plotter.plot_live(output)
+            if args.serve:
+                plotter.plot_live(output, api_url=PROXY_PATH)
+            else:
+                plotter.plot_live(output)
             plotter.close()
 
+            if args.serve:
+                page = Path(output).resolve()
+                bounds = get_bounding_box(
+                    plotter.center_lat, plotter.center_lon, plotter.radius_km
+                )
+                server = create_server(
+                    str(page), StatesCache(bounds), port=args.port
+                )
+                url = f"http://127.0.0.1:{server.server_port}/{page.name}"
+                print(f"🌐 Serving live map at {url} (Ctrl+C to stop)")
+                webbrowser.open(url)
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    print("\n👋 Live server stopped")
+                finally:
+                    server.server_close()
+
         elif args.heatmap:
             # Generate traffic heatmap
             output = args.output or "traffic_heatmap.html"
@@ -225,8 +264,7 @@ Examples:
             print("🗺️  Generating corridor map...")
             map_gen = MapGenerator(center_lat, center_lon, args.zoom, args.style)
 
-            for corridor in corridor_data["corridors"][:20]:
-                map_gen.add_corridor(corridor, corridor["rank"])
+            map_gen.add_corridors(corridor_data["corridors"][:20])
 
             map_gen.save(output)
 
@@ -29,12 +29,17 @@ setup(
         "requests>=2.31.0",
         "pyyaml>=6.0",
         "folium>=0.15.0",
+        "numpy>=1.21",
     ],
     extras_require={
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
         ],
+        "speedups": [
+            "orjson>=3.9",
+            "numba>=0.57",
+        ],
     },
     entry_points={
         "console_scripts": [
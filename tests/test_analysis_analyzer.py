@@ -73,6 +73,16 @@ class TestFlightAnalyzer:
         assert analyzer.statistics is not None
         analyzer.close()
 
+    def test_connection_tuned_read_only(self, full_db):
+        """Test the analyzer's connection is WAL and rejects writes."""
+        analyzer = FlightAnalyzer(full_db)
+        try:
+            assert analyzer.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with pytest.raises(sqlite3.OperationalError):
+                analyzer.conn.execute("DELETE FROM flights")
+        finally:
+            analyzer.close()
+
     def test_analyze_corridors(self, full_db):
         """Test corridor analysis method."""
         analyzer = FlightAnalyzer(full_db)
@@ -81,6 +91,12 @@ class TestFlightAnalyzer:
         assert "total_corridors" in result
         analyzer.close()
 
+    def test_top_corridors(self, full_db):
+        """Test top-N corridor shortcut."""
+        analyzer = FlightAnalyzer(full_db)
+        assert analyzer.top_corridors(20) == []
+        analyzer.close()
+
     def test_analyze_patterns(self, full_db):
         """Test pattern analysis method."""
         analyzer = FlightAnalyzer(full_db)
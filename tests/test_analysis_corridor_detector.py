@@ -255,6 +255,16 @@ class TestCorridorDetector:
             # Higher ranked should have more or equal flights
             assert corridors[i]["unique_flights"] >= corridors[i + 1]["unique_flights"]
 
+    def test_limit(self, multi_corridor_db):
+        """Test that limit caps returned corridors but not the total."""
+        detector = CorridorDetector(multi_corridor_db)
+        full = detector.detect_corridors(min_flights=3)
+        top = detector.detect_corridors(min_flights=3, limit=1)
+
+        assert full["total_corridors"] >= 2
+        assert top["total_corridors"] == full["total_corridors"]
+        assert top["corridors"] == full["corridors"][:1]
+
     def test_linearity_score(self, linear_corridor_db):
         """Test linearity score calculation."""
         detector = CorridorDetector(linear_corridor_db)
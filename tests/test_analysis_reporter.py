@@ -2,6 +2,7 @@
 Tests for reporting.
 """
 
+import gzip
 import json
 import pytest
 from lara.analysis.reporter import ReportGenerator
@@ -62,6 +63,18 @@ class TestReportGenerator:
         assert data["metadata"]["database"] == "test_db"
         assert data["statistics"]["overview"]["total_flights"] == 12345
 
+    def test_generate_gzip_json_report(self, tmp_path, sample_results):
+        """Test gzip-compressed JSON report generation."""
+        output_file = tmp_path / "report.json.gz"
+        generator = ReportGenerator()
+
+        generator.generate_report(sample_results, output_file, format="json")
+
+        with gzip.open(output_file, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        assert data["statistics"]["overview"]["total_flights"] == 12345
+
     def test_generate_text_report(self, tmp_path, sample_results):
         """Test text report generation."""
         output_file = tmp_path / "report.txt"
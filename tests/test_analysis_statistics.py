@@ -11,7 +11,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lara.analysis.statistics import StatisticsEngine
+from lara.analysis.statistics import StatisticsEngine, _bucket_count_sql
+from lara.tracking.database import FlightDatabase
 
 
 @pytest.fixture
@@ -98,6 +99,56 @@ class TestStatisticsEngine:
         assert "hourly_pattern" in stats
         assert "weekday_pattern" in stats
 
+    def test_comprehensive_stats_parallel_matches_serial(self, stats_db):
+        """Test threaded read-only sections match the shared connection."""
+        engine = StatisticsEngine(stats_db)
+        parallel = engine.get_comprehensive_stats()
+
+        assert engine._database_path() is not None
+        assert parallel["overview"] == engine._get_overview()
+        assert parallel["altitude_distribution"] == (
+            engine._get_altitude_distribution()
+        )
+        assert parallel["weekday_pattern"] == engine._get_weekday_pattern()
+
+    def test_comprehensive_stats_uri_special_path(self, tmp_path):
+        """Test read-only connections open paths containing '#'."""
+        db_dir = tmp_path / "we#ird"
+        db_dir.mkdir()
+        db_path = db_dir / "x.db"
+        FlightDatabase(str(db_path)).close()
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            stats = StatisticsEngine(conn).get_comprehensive_stats()
+        finally:
+            conn.close()
+
+        assert stats["overview"]["total_flights"] == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["we#ird"]
+
+    def test_comprehensive_stats_in_memory(self):
+        """Test in-memory databases fall back to serial queries."""
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            "CREATE TABLE flights (id INTEGER PRIMARY KEY, icao24 TEXT, "
+            "callsign TEXT, first_seen TIMESTAMP, last_seen TIMESTAMP, "
+            "min_distance_km REAL, max_altitude_m REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE positions (id INTEGER PRIMARY KEY, flight_id INTEGER, "
+            "altitude_m REAL, distance_from_home_km REAL)"
+        )
+
+        engine = StatisticsEngine(conn)
+        assert engine._database_path() is None
+
+        stats = engine.get_comprehensive_stats()
+        assert stats["overview"]["total_flights"] == 0
+        conn.close()
+
     def test_overview(self, stats_db):
         """Test overview statistics."""
         engine = StatisticsEngine(stats_db)
@@ -117,6 +168,43 @@ class TestStatisticsEngine:
         assert "very_low" in classes
         assert "medium" in classes
 
+    def test_altitude_distribution_counts(self, stats_db):
+        """Test bucket counts and open-ended upper bound."""
+        engine = StatisticsEngine(stats_db)
+        dist = {d["class"]: d for d in engine._get_altitude_distribution()}
+
+        assert dist["very_low"]["count"] == 0
+        assert dist["low"]["count"] == 20
+        assert dist["medium"]["count"] == 20
+        assert dist["very_high"]["count"] == 20
+        assert dist["cruise"]["max_altitude_m"] is None
+        assert sum(d["count"] for d in dist.values()) == 60
+
+    @pytest.mark.parametrize(
+        "column, index",
+        [
+            ("altitude_m", "idx_positions_alt"),
+            ("distance_from_home_km", "idx_positions_dist"),
+        ],
+    )
+    def test_bucket_count_uses_bounded_index_range(self, tmp_path, column, index):
+        """Test both class bounds drive the index range scan."""
+        db_path = tmp_path / "plan.db"
+        FlightDatabase(str(db_path)).close()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            plan = " ".join(
+                row[-1]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN " + _bucket_count_sql(column), (0, 1)
+                )
+            )
+        finally:
+            conn.close()
+
+        assert f"INDEX {index} ({column}>? AND {column}<?)" in plan
+
     def test_distance_distribution(self, stats_db):
         """Test distance distribution."""
         engine = StatisticsEngine(stats_db)
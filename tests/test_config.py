@@ -2,8 +2,12 @@
 Tests for configuration management.
 """
 
+import dataclasses
+from unittest.mock import patch
+
 import pytest
-from lara.config import Config
+import lara.config as config_module
+from lara.config import Config, Settings, preload_config
 
 
 @pytest.fixture
@@ -87,3 +91,96 @@ location:
         # Should fall back to default config
         assert config._config["location"]["name"] == "Berlin Brandenburger Tor, Germany"
         assert config._config["tracking"]["radius_km"] == 25
+
+    def test_cached_config_is_not_shared(self, tmp_path, sample_config):
+        """Test that configs loaded from the same file do not share state."""
+        custom_config_path = tmp_path / "custom_config.yaml"
+        custom_config_path.write_text(sample_config)
+
+        first = Config(config_path=str(custom_config_path))
+        first.set("tracking.radius_km", 99)
+
+        second = Config(config_path=str(custom_config_path))
+        assert second._config["tracking"]["radius_km"] == 30
+
+    def test_config_file_parsed_once(self, tmp_path, sample_config):
+        """Test that an unchanged file is served from the YAML cache."""
+        custom_config_path = tmp_path / "custom_config.yaml"
+        custom_config_path.write_text(sample_config)
+
+        Config(config_path=str(custom_config_path))
+        with patch("lara.config.yaml.load") as mock_load:
+            config = Config(config_path=str(custom_config_path))
+
+        mock_load.assert_not_called()
+        assert config._config["location"]["name"] == "Paris, France"
+
+    def test_set_invalidates_cached_property(self):
+        """Test that set() refreshes cached property values."""
+        config = Config()
+        assert config.radius_km == 25
+
+        config.set("tracking.radius_km", 40)
+        assert config.radius_km == 40
+
+        config.set("location", {"latitude": 1.5, "longitude": 2.5})
+        assert config.home_latitude == 1.5
+        assert config.location_name == "Unknown Location"
+
+    def test_get_dot_notation(self):
+        """Test nested, top-level and missing key lookups."""
+        config = Config()
+        assert config.get("tracking.radius_km") == 25
+        assert config.get("api")["credentials_path"] is None
+        assert config.get("missing", "fallback") == "fallback"
+        assert config.get("location.latitude.deeper", 1) == 1
+
+    def test_preload_config(self, tmp_path, sample_config):
+        """Test that a preloaded file is not parsed again on load."""
+        custom_config_path = tmp_path / "custom_config.yaml"
+        custom_config_path.write_text(sample_config)
+
+        preload_config(str(custom_config_path))
+        # Let the background parse finish before yaml.load is patched
+        config_module._PRELOADS[str(custom_config_path)].result()
+
+        with patch("lara.config.yaml.load") as mock_load:
+            config = Config(config_path=str(custom_config_path))
+
+        mock_load.assert_not_called()
+        assert config.location_name == "Paris, France"
+
+    def test_validate_config(self):
+        """Test schema validation of required fields, types and ranges."""
+        config = Config()
+        valid = config._get_default_config()
+        assert config._validate_config(valid) is True
+
+        assert config._validate_config({}) is False
+        assert config._validate_config(None) is False
+
+        out_of_range = config._get_default_config()
+        out_of_range["location"]["latitude"] = 91
+        assert config._validate_config(out_of_range) is False
+
+        wrong_type = config._get_default_config()
+        wrong_type["tracking"] = "25"
+        assert config._validate_config(wrong_type) is False
+
+    def test_set_creates_missing_sections(self):
+        """Test set() on new nested and top-level keys."""
+        config = Config()
+        config.set("logging.level", "DEBUG")
+        config.set("version", 2)
+
+        assert config.get("logging.level") == "DEBUG"
+        assert config.get("version") == 2
+
+
+class TestSettings:
+    def test_settings_are_frozen(self):
+        """Test that settings cannot be reassigned or mutated at runtime."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            Settings.MIN_PATTERN_OCCURRENCES = 1
+        with pytest.raises(TypeError):
+            Settings.ALTITUDE_CLASSES["very_low"] = (0, 500)
@@ -13,10 +13,11 @@ This test suite covers:
 
 import pytest
 import json
+import logging
 import tempfile
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
+import time
 from unittest.mock import Mock, patch
 from typing import Dict, Any
 
@@ -32,6 +33,12 @@ from lara.tracking.auth import OpenSkyAuth, OpenSkyBasicAuth, create_auth_from_c
 # ============================================================================
 
 
+@pytest.fixture(autouse=True)
+def auth_log_level(caplog):
+    """Capture all auth log records, including debug messages."""
+    caplog.set_level(logging.DEBUG, logger="lara.tracking.auth")
+
+
 @pytest.fixture
 def valid_credentials() -> Dict[str, str]:
     """Valid OAuth2 credentials for testing."""
@@ -107,7 +114,7 @@ def mock_config():
 class TestOpenSkyAuthInitialization:
     """Tests for OpenSkyAuth initialization and credential loading."""
 
-    def test_init_with_credentials_file(self, credentials_file: str, capsys):
+    def test_init_with_credentials_file(self, credentials_file: str, caplog):
         """Test initialization with valid credentials file."""
         auth = OpenSkyAuth(credentials_path=credentials_file)
 
@@ -118,9 +125,8 @@ class TestOpenSkyAuthInitialization:
         assert auth.token_type == "Bearer"
 
         # Check console output
-        captured = capsys.readouterr()
-        assert "OAuth2 credentials" in captured.out
-        assert "test-client-id" in captured.out
+        assert "OAuth2 credentials" in caplog.text
+        assert "test-client-id" in caplog.text
 
     def test_init_with_direct_credentials(self):
         """Test initialization with direct client_id and client_secret."""
@@ -184,7 +190,7 @@ class TestOpenSkyAuthInitialization:
 class TestOpenSkyAuthTokenManagement:
     """Tests for token request, validation, and refresh."""
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_request_token_success(
         self,
         mock_post: Mock,
@@ -219,7 +225,7 @@ class TestOpenSkyAuthTokenManagement:
         # Verify response
         assert token_data == mock_token_response
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_request_token_http_error(self, mock_post: Mock, credentials_file: str):
         """Test handling of HTTP errors during token request."""
         # Mock error response
@@ -236,7 +242,7 @@ class TestOpenSkyAuthTokenManagement:
         with pytest.raises(Exception, match="Token request failed with status 401"):
             auth._request_token()
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_request_token_network_error(self, mock_post: Mock, credentials_file: str):
         """Test handling of network errors during token request."""
         import requests
@@ -248,13 +254,13 @@ class TestOpenSkyAuthTokenManagement:
         with pytest.raises(Exception, match="Failed to obtain access token"):
             auth._request_token()
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_get_token_requests_new_token(
         self,
         mock_post: Mock,
         mock_token_response: Dict[str, Any],
         credentials_file: str,
-        capsys,
+        caplog,
     ):
         """Test that get_token requests new token when none exists."""
         mock_response = Mock()
@@ -271,10 +277,9 @@ class TestOpenSkyAuthTokenManagement:
         assert auth.token_expires_at is not None
 
         # Check console output
-        captured = capsys.readouterr()
-        assert "Access token obtained" in captured.out
+        assert "Access token obtained" in caplog.text
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_get_token_reuses_valid_token(
         self,
         mock_post: Mock,
@@ -298,7 +303,7 @@ class TestOpenSkyAuthTokenManagement:
         assert mock_post.call_count == 1  # Still only one call
         assert token1 == token2
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_get_token_refreshes_expired_token(
         self,
         mock_post: Mock,
@@ -318,13 +323,13 @@ class TestOpenSkyAuthTokenManagement:
         assert mock_post.call_count == 1
 
         # Manually expire token
-        auth.token_expires_at = datetime.now() - timedelta(seconds=1)
+        auth._token_expires_at_mono = time.monotonic() - 1
 
         # Get token again - should refresh
         auth.get_token()
         assert mock_post.call_count == 2
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_get_token_force_refresh(
         self,
         mock_post: Mock,
@@ -356,7 +361,7 @@ class TestOpenSkyAuthTokenManagement:
         """Test token validation with expired token."""
         auth = OpenSkyAuth(credentials_path=credentials_file)
         auth.access_token = "test-token"
-        auth.token_expires_at = datetime.now() - timedelta(seconds=1)
+        auth._token_expires_at_mono = time.monotonic() - 1
 
         assert auth._is_token_valid() is False
 
@@ -364,7 +369,7 @@ class TestOpenSkyAuthTokenManagement:
         """Test token validation with valid token."""
         auth = OpenSkyAuth(credentials_path=credentials_file)
         auth.access_token = "test-token"
-        auth.token_expires_at = datetime.now() + timedelta(minutes=10)
+        auth._token_expires_at_mono = time.monotonic() + 600
 
         assert auth._is_token_valid() is True
 
@@ -372,13 +377,21 @@ class TestOpenSkyAuthTokenManagement:
         """Test token invalidation."""
         auth = OpenSkyAuth(credentials_path=credentials_file)
         auth.access_token = "test-token"
-        auth.token_expires_at = datetime.now() + timedelta(minutes=10)
+        auth._token_expires_at_mono = time.monotonic() + 600
 
         auth.invalidate_token()
 
         assert auth.access_token is None
         assert auth.token_expires_at is None
 
+    @patch("lara.tracking.auth.requests.Session.close")
+    def test_close_releases_session(self, mock_close: Mock, credentials_file: str):
+        """Test that close() shuts down the pooled HTTP session."""
+        auth = OpenSkyAuth(credentials_path=credentials_file)
+        auth.close()
+
+        mock_close.assert_called()
+
 
 # ============================================================================
 # OpenSkyAuth Tests - API Integration
@@ -388,7 +401,7 @@ class TestOpenSkyAuthTokenManagement:
 class TestOpenSkyAuthAPIIntegration:
     """Tests for API request methods and authentication headers."""
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_get_auth_headers(
         self,
         mock_post: Mock,
@@ -408,8 +421,33 @@ class TestOpenSkyAuthAPIIntegration:
         assert headers["Authorization"].startswith("Bearer ")
         assert mock_token_response["access_token"] in headers["Authorization"]
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    def test_auth_headers_cached_until_refresh(
+        self,
+        mock_post: Mock,
+        mock_token_response: Dict[str, Any],
+        credentials_file: str,
+    ):
+        """Test that headers are reused until the token is refreshed."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = mock_token_response
+        mock_post.return_value = mock_response
+
+        auth = OpenSkyAuth(credentials_path=credentials_file)
+        headers = auth.get_auth_headers()
+        assert auth.get_auth_headers() is headers
+
+        mock_response.json.return_value = {
+            **mock_token_response,
+            "access_token": "refreshed-token",
+        }
+        auth.get_token(force_refresh=True)
+
+        assert auth.get_auth_headers()["Authorization"] == "Bearer refreshed-token"
+
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_make_authenticated_request_success(
         self,
         mock_get: Mock,
@@ -448,15 +486,40 @@ class TestOpenSkyAuthAPIIntegration:
 
         assert response.status_code == 200
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    def test_make_authenticated_request_uses_given_session(
+        self,
+        mock_post: Mock,
+        mock_token_response: Dict[str, Any],
+        credentials_file: str,
+    ):
+        """Test that a caller-provided session is used for the API request."""
+        mock_token_resp = Mock()
+        mock_token_resp.status_code = 200
+        mock_token_resp.json.return_value = mock_token_response
+        mock_post.return_value = mock_token_resp
+
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+
+        auth = OpenSkyAuth(credentials_path=credentials_file)
+        response = auth.make_authenticated_request(
+            "https://opensky-network.org/api/states/all", session=session
+        )
+
+        session.get.assert_called_once()
+        assert "Authorization" in session.get.call_args[1]["headers"]
+        assert response.status_code == 200
+
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_make_authenticated_request_token_refresh_on_401(
         self,
         mock_get: Mock,
         mock_post: Mock,
         mock_token_response: Dict[str, Any],
         credentials_file: str,
-        capsys,
+        caplog,
     ):
         """Test automatic token refresh when API returns 401."""
         # Mock token requests
@@ -490,11 +553,10 @@ class TestOpenSkyAuthAPIIntegration:
         assert response.status_code == 200
 
         # Check console output for refresh message
-        captured = capsys.readouterr()
-        assert "Token expired during request" in captured.out
+        assert "Token expired during request" in caplog.text
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_make_authenticated_request_timeout(
         self,
         mock_get: Mock,
@@ -530,15 +592,15 @@ class TestOpenSkyAuthAPIIntegration:
 class TestOpenSkyAuthTesting:
     """Tests for the test_authentication method."""
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_authentication_success(
         self,
         mock_get: Mock,
         mock_post: Mock,
         mock_token_response: Dict[str, Any],
         credentials_file: str,
-        capsys,
+        caplog,
     ):
         """Test successful authentication test."""
         # Mock token request
@@ -557,12 +619,11 @@ class TestOpenSkyAuthTesting:
 
         assert result is True
 
-        captured = capsys.readouterr()
-        assert "test successful" in captured.out
+        assert "test successful" in caplog.text
 
-    @patch("lara.tracking.auth.requests.post")
+    @patch("lara.tracking.auth.requests.Session.post")
     def test_authentication_failure_no_token(
-        self, mock_post: Mock, credentials_file: str, capsys
+        self, mock_post: Mock, credentials_file: str, caplog
     ):
         """Test authentication test when token request fails."""
         mock_post.side_effect = Exception("Network error")
@@ -572,18 +633,17 @@ class TestOpenSkyAuthTesting:
 
         assert result is False
 
-        captured = capsys.readouterr()
-        assert "failed" in captured.out
+        assert "failed" in caplog.text
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_authentication_failure_401(
         self,
         mock_get: Mock,
         mock_post: Mock,
         mock_token_response: Dict[str, Any],
         credentials_file: str,
-        capsys,
+        caplog,
     ):
         """Test authentication test when API returns 401."""
         # Mock token request
@@ -602,8 +662,7 @@ class TestOpenSkyAuthTesting:
 
         assert result is False
 
-        captured = capsys.readouterr()
-        assert "not accepted" in captured.out
+        assert "not accepted" in caplog.text
 
 
 # ============================================================================
@@ -623,7 +682,7 @@ class TestOpenSkyBasicAuth:
         assert auth.credentials == ("testuser", "testpass")
         assert auth.client_id == "testuser"  # For display
 
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_make_authenticated_request(self, mock_get: Mock):
         """Test making request with basic auth."""
         mock_response = Mock()
@@ -644,8 +703,8 @@ class TestOpenSkyBasicAuth:
 
         assert response.status_code == 200
 
-    @patch("lara.tracking.auth.requests.get")
-    def test_authentication_success(self, mock_get: Mock, capsys):
+    @patch("lara.tracking.auth.requests.Session.get")
+    def test_authentication_success(self, mock_get: Mock, caplog):
         """Test successful basic authentication test."""
         mock_response = Mock()
         mock_response.status_code = 200
@@ -656,12 +715,11 @@ class TestOpenSkyBasicAuth:
 
         assert result is True
 
-        captured = capsys.readouterr()
-        assert "Basic authentication successful" in captured.out
-        assert "deprecated" in captured.out
+        assert "Basic authentication successful" in caplog.text
+        assert "deprecated" in caplog.text
 
-    @patch("lara.tracking.auth.requests.get")
-    def test_authentication_failure(self, mock_get: Mock, capsys):
+    @patch("lara.tracking.auth.requests.Session.get")
+    def test_authentication_failure(self, mock_get: Mock, caplog):
         """Test failed basic authentication test."""
         mock_response = Mock()
         mock_response.status_code = 401
@@ -672,8 +730,7 @@ class TestOpenSkyBasicAuth:
 
         assert result is False
 
-        captured = capsys.readouterr()
-        assert "failed" in captured.out
+        assert "failed" in caplog.text
 
 
 # ============================================================================
@@ -689,7 +746,6 @@ class TestCreateAuthFromConfig:
         """Test creating auth with credentials_path in config."""
         # Setup mock
         mock_auth_instance = Mock()
-        mock_auth_instance.test_authentication.return_value = True
         mock_auth_class.return_value = mock_auth_instance
 
         # Setup config
@@ -704,13 +760,13 @@ class TestCreateAuthFromConfig:
 
         assert result == mock_auth_instance
         mock_auth_class.assert_called_once_with(credentials_path="credentials.json")
-        mock_auth_instance.test_authentication.assert_called_once()
+        mock_auth_instance.get_token.assert_called_once()
+        mock_auth_instance.test_authentication.assert_not_called()
 
     @patch("lara.tracking.auth.OpenSkyAuth")
     def test_create_with_client_credentials(self, mock_auth_class: Mock):
         """Test creating auth with direct client_id and client_secret."""
         mock_auth_instance = Mock()
-        mock_auth_instance.test_authentication.return_value = True
         mock_auth_class.return_value = mock_auth_instance
 
         config = Mock()
@@ -730,7 +786,7 @@ class TestCreateAuthFromConfig:
         )
 
     @patch("lara.tracking.auth.OpenSkyBasicAuth")
-    def test_create_with_basic_auth(self, mock_auth_class: Mock, capsys):
+    def test_create_with_basic_auth(self, mock_auth_class: Mock, caplog):
         """Test creating auth with username/password (basic auth)."""
         mock_auth_instance = Mock()
         mock_auth_instance.test_authentication.return_value = True
@@ -751,9 +807,31 @@ class TestCreateAuthFromConfig:
 
         assert result == mock_auth_instance
         mock_auth_class.assert_called_once_with("testuser", "testpass")
+        mock_auth_instance.test_authentication.assert_called_once()
+
+        assert "basic authentication" in caplog.text
+
+    @patch("lara.tracking.auth.OpenSkyBasicAuth")
+    def test_create_basic_auth_test_fails_returns_none(
+        self, mock_auth_class: Mock, caplog
+    ):
+        """Test that None is returned when basic credentials are rejected."""
+        mock_auth_instance = Mock()
+        mock_auth_instance.test_authentication.return_value = False
+        mock_auth_class.return_value = mock_auth_instance
+
+        config = Mock()
+        config.get = Mock(
+            side_effect=lambda key, default=None: {
+                "api.username": "testuser",
+                "api.password": "wrongpass",
+            }.get(key, default)
+        )
 
-        captured = capsys.readouterr()
-        assert "basic authentication" in captured.out
+        result = create_auth_from_config(config)
+
+        assert result is None
+        assert "Basic authentication failed" in caplog.text
 
     def test_create_no_credentials_returns_none(self):
         """Test that None is returned when no credentials configured."""
@@ -765,10 +843,10 @@ class TestCreateAuthFromConfig:
         assert result is None
 
     @patch("lara.tracking.auth.OpenSkyAuth")
-    def test_create_auth_test_fails_returns_none(self, mock_auth_class: Mock, capsys):
-        """Test that None is returned when authentication test fails."""
+    def test_create_auth_token_fails_returns_none(self, mock_auth_class: Mock, caplog):
+        """Test that None is returned when the token request fails."""
         mock_auth_instance = Mock()
-        mock_auth_instance.test_authentication.return_value = False
+        mock_auth_instance.get_token.side_effect = Exception("401 Unauthorized")
         mock_auth_class.return_value = mock_auth_instance
 
         config = Mock()
@@ -782,11 +860,10 @@ class TestCreateAuthFromConfig:
 
         assert result is None
 
-        captured = capsys.readouterr()
-        assert "test failed" in captured.out
+        assert "token request failed" in caplog.text
 
     @patch("lara.tracking.auth.OpenSkyAuth")
-    def test_create_auth_exception_returns_none(self, mock_auth_class: Mock, capsys):
+    def test_create_auth_exception_returns_none(self, mock_auth_class: Mock, caplog):
         """Test that None is returned when auth initialization raises exception."""
         mock_auth_class.side_effect = Exception("Init failed")
 
@@ -801,8 +878,7 @@ class TestCreateAuthFromConfig:
 
         assert result is None
 
-        captured = capsys.readouterr()
-        assert "initialization failed" in captured.out
+        assert "initialization failed" in caplog.text
 
 
 # ============================================================================
@@ -813,8 +889,8 @@ class TestCreateAuthFromConfig:
 class TestAuthIntegration:
     """Integration tests for authentication flow."""
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_full_authentication_flow(
         self, mock_get: Mock, mock_post: Mock, credentials_file: str
     ):
@@ -858,8 +934,8 @@ class TestAuthIntegration:
         assert response1.status_code == 200
         assert response2.status_code == 200
 
-    @patch("lara.tracking.auth.requests.post")
-    @patch("lara.tracking.auth.requests.get")
+    @patch("lara.tracking.auth.requests.Session.post")
+    @patch("lara.tracking.auth.requests.Session.get")
     def test_token_expiry_and_refresh(
         self, mock_get: Mock, mock_post: Mock, credentials_file: str
     ):
@@ -888,7 +964,7 @@ class TestAuthIntegration:
         assert mock_post.call_count == 1
 
         # Manually expire token
-        auth.token_expires_at = datetime.now() - timedelta(seconds=1)
+        auth._token_expires_at_mono = time.monotonic() - 1
 
         # Second request should refresh token
         auth.make_authenticated_request("https://opensky-network.org/api/states/all")
@@ -897,3 +973,29 @@ class TestAuthIntegration:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+    @pytest.mark.parametrize(
+        "settings",
+        [
+            {"api.credentials_path": "credentials.json"},
+            {"api.client_id": "test-id", "api.client_secret": "test-secret"},
+        ],
+    )
+    @patch("lara.tracking.auth.OpenSkyAuth")
+    def test_create_auth_empty_token_returns_none(
+        self, mock_auth_class: Mock, settings, caplog
+    ):
+        """Test that None is returned when the token response has no token."""
+        mock_auth_instance = Mock()
+        mock_auth_instance.get_token.return_value = None
+        mock_auth_class.return_value = mock_auth_instance
+
+        config = Mock()
+        config.get = Mock(
+            side_effect=lambda key, default=None: settings.get(key, default)
+        )
+
+        result = create_auth_from_config(config)
+
+        assert result is None
+        assert "returned no token" in caplog.text
@@ -2,9 +2,12 @@
 Tests for LARA flight collector.
 """
 
+import json
+import math
 import pytest
 import sys
 import os
+import sqlite3
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -16,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from lara.tracking.collector import FlightCollector
 from lara.config import Config
+from lara.utils import haversine_distance, parse_states_columnar
 
 
 @pytest.fixture
@@ -36,10 +40,11 @@ def temp_config():
     yield config
 
     # Cleanup
-    try:
-        os.unlink(db_path)
-    except Exception:
-        pass
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(db_path + suffix)
+        except Exception:
+            pass
 
 
 @pytest.fixture
@@ -99,12 +104,12 @@ class TestFlightCollector:
         assert collector.update_interval == 10
         assert collector.iteration_count == 0
 
-    @patch("lara.tracking.collector.requests.get")
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_fetch_flights_success(self, mock_get, temp_config, mock_api_response):
         """Test successful flight data fetch."""
         # Mock successful API response
         mock_response = Mock()
-        mock_response.json.return_value = mock_api_response
+        mock_response.content = json.dumps(mock_api_response).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -115,11 +120,31 @@ class TestFlightCollector:
         assert flights[0][0] == "abc123"
         assert flights[1][0] == "def456"
 
-    @patch("lara.tracking.collector.requests.get")
+    def test_backoff_delay_jittered_and_capped(self, temp_config):
+        """Test 429 backoff grows exponentially and stays under the cap."""
+        collector = FlightCollector(temp_config)
+
+        with patch("lara.tracking.collector.random.uniform", side_effect=max):
+            delays = []
+            for hits in range(1, 6):
+                collector.rate_limit_count = hits
+                delays.append(collector._backoff_delay())
+
+        assert delays == [60, 120, 240, 300, 300]
+
+        # Never retried straight away: at least half the ceiling is waited
+        with patch("lara.tracking.collector.random.uniform", side_effect=min):
+            assert collector._backoff_delay() == 150
+
+        collector.rate_limit_count = 1
+        for _ in range(20):
+            assert 30 <= collector._backoff_delay() <= 60
+
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_fetch_flights_empty_response(self, mock_get, temp_config):
         """Test handling of empty API response."""
         mock_response = Mock()
-        mock_response.json.return_value = {"states": None}
+        mock_response.content = json.dumps({"states": None}).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -128,8 +153,8 @@ class TestFlightCollector:
 
         assert flights == []
 
-    @patch("lara.tracking.collector.requests.get")
-    def test_fetch_flights_api_error(self, mock_get, temp_config, capsys):
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_fetch_flights_api_error(self, mock_get, temp_config, caplog):
         """Test handling of API errors."""
         mock_get.side_effect = RequestException("API Error")
 
@@ -137,11 +162,10 @@ class TestFlightCollector:
         flights = collector.fetch_flights()
 
         assert flights == []
-        captured = capsys.readouterr()
-        assert "Error fetching data" in captured.out
+        assert "Error fetching data" in caplog.text
 
-    @patch("lara.tracking.collector.requests.get")
-    def test_fetch_flights_timeout(self, mock_get, temp_config, capsys):
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_fetch_flights_timeout(self, mock_get, temp_config, caplog):
         """Test handling of API timeout."""
         import requests
 
@@ -151,8 +175,7 @@ class TestFlightCollector:
         flights = collector.fetch_flights()
 
         assert flights == []
-        captured = capsys.readouterr()
-        assert "timeout" in captured.out.lower()
+        assert "timeout" in caplog.text.lower()
 
     def test_process_flight_valid(self, temp_config):
         """Test processing valid flight data."""
@@ -239,6 +262,113 @@ class TestFlightCollector:
 
         assert result is None
 
+    def test_compute_distances(self, temp_config, mock_api_response):
+        """Test vectorized distances with malformed and position-less states."""
+        collector = FlightCollector(temp_config)
+        states = mock_api_response["states"] + [
+            ["bad"],
+            None,
+            ["abc", "X", "DE", 0, 0, None, None],
+        ]
+
+        distances = collector.compute_distances(parse_states_columnar(states))
+
+        assert len(distances) == len(states)
+        assert distances[0] == pytest.approx(
+            haversine_distance(49.3508, 8.1364, states[0][6], states[0][5])
+        )
+        assert all(math.isnan(d) for d in distances[-3:])
+
+    def test_flight_id_cache_skips_lookup(self, temp_config, mock_api_response):
+        """Test recently seen aircraft reuse their flight id without a query."""
+        collector = FlightCollector(temp_config)
+        state = mock_api_response["states"][0]
+        first_ts = "2024-01-01T12:00:00"
+        later_ts = "2024-01-01T12:00:10"
+
+        moved = list(state)
+        moved[6] += 0.01
+
+        flight_id = collector.process_flight(state, first_ts)["flight_id"]
+
+        with patch.object(
+            collector.db, "get_or_create_flight", side_effect=AssertionError
+        ):
+            result = collector.process_flight(moved, later_ts)
+
+        assert result["flight_id"] == flight_id
+        flight = collector.db.get_flight_by_id(flight_id)
+        assert flight["last_seen"] == later_ts
+        assert flight["position_count"] == 2
+
+    def test_unchanged_position_not_stored(self, temp_config, mock_api_response):
+        """Test a repeated position only advances last_seen."""
+        collector = FlightCollector(temp_config)
+        state = mock_api_response["states"][0]
+
+        flight_id = collector.process_flight(state, "2024-01-01T12:00:00")["flight_id"]
+        result = collector.process_flight(state, "2024-01-01T12:00:10")
+
+        assert result["flight_id"] == flight_id
+        flight = collector.db.get_flight_by_id(flight_id)
+        assert flight["position_count"] == 1
+        assert flight["last_seen"] == "2024-01-01T12:00:10"
+        assert len(collector.db.get_positions_for_flight(flight_id)) == 1
+        assert collector.db.get_statistics()["last_observation"] == (
+            "2024-01-01T12:00:10"
+        )
+
+    def test_flight_id_cache_expires(self, temp_config, mock_api_response):
+        """Test a gap longer than the session timeout starts a new flight."""
+        collector = FlightCollector(temp_config)
+        state = mock_api_response["states"][0]
+
+        first = collector.process_flight(state, "2024-01-01T12:00:00")
+        second = collector.process_flight(state, "2024-01-01T14:00:00")
+
+        assert first["flight_id"] != second["flight_id"]
+
+    def test_new_flight_at_unchanged_position_stored(
+        self, temp_config, mock_api_response
+    ):
+        """Test a new session of a parked aircraft records its first position."""
+        collector = FlightCollector(temp_config)
+        state = mock_api_response["states"][0]
+        renamed = list(state)
+        renamed[1] = "NEW456  "
+
+        first = collector.process_flight(state, "2024-01-01T12:00:00")
+        second = collector.process_flight(renamed, "2024-01-01T12:00:10")
+
+        assert first["flight_id"] != second["flight_id"]
+        flight = collector.db.get_flight_by_id(second["flight_id"])
+        assert flight["position_count"] == 1
+        assert flight["min_distance_km"] is not None
+
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_failed_bulk_write_keeps_position_pending(
+        self, mock_get, temp_config, mock_api_response
+    ):
+        """Test positions from a failed scan write are stored by the next scan."""
+        mock_response = Mock()
+        mock_response.content = json.dumps(mock_api_response).encode()
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        collector = FlightCollector(temp_config)
+        with patch.object(
+            collector.db, "add_positions_bulk", side_effect=sqlite3.OperationalError
+        ):
+            with pytest.raises(sqlite3.OperationalError):
+                collector.run_single_iteration()
+
+        assert collector._last_pos == {}
+
+        collector.last_request_time = 0
+        count = collector.run_single_iteration()
+        assert count > 0
+        assert collector.db.get_statistics()["total_positions"] == count
+
     def test_display_flight_info(self, temp_config, capsys):
         """Test flight information display."""
         collector = FlightCollector(temp_config)
@@ -257,12 +387,12 @@ class TestFlightCollector:
         assert "5.2 km" in captured.out
         assert "10000 m" in captured.out
 
-    @patch("lara.tracking.collector.requests.get")
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_run_single_iteration(self, mock_get, temp_config, mock_api_response):
         """Test single collection iteration."""
         # Mock API response
         mock_response = Mock()
-        mock_response.json.return_value = mock_api_response
+        mock_response.content = json.dumps(mock_api_response).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -272,11 +402,54 @@ class TestFlightCollector:
         assert collector.iteration_count == 1
         assert count >= 0  # May be filtered by radius
 
-    @patch("lara.tracking.collector.requests.get")
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_run_single_iteration_bulk_insert(
+        self, mock_get, temp_config, mock_api_response
+    ):
+        """Test that a scan writes its positions with one bulk call."""
+        mock_response = Mock()
+        mock_response.content = json.dumps(mock_api_response).encode()
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        collector = FlightCollector(temp_config)
+        with patch.object(
+            collector.db, "add_position", side_effect=AssertionError
+        ), patch.object(
+            collector.db, "add_positions_bulk", wraps=collector.db.add_positions_bulk
+        ) as bulk:
+            count = collector.run_single_iteration()
+
+        bulk.assert_called_once()
+        assert len(bulk.call_args[0][0]) == count
+        assert collector.db.get_statistics()["total_positions"] == count
+
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_run_single_iteration_headless_logs(
+        self, mock_get, temp_config, mock_api_response, caplog, capsys
+    ):
+        """Test scans log a summary instead of printing when not on a TTY."""
+        mock_response = Mock()
+        mock_response.content = json.dumps(mock_api_response).encode()
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        collector = FlightCollector(temp_config)
+        collector.interactive = False
+
+        with caplog.at_level("INFO", logger="lara.tracking.collector"), patch(
+            "lara.tracking.collector.get_bounding_box", side_effect=AssertionError
+        ):
+            count = collector.run_single_iteration()
+
+        assert f"Scan #1: Found {count} flight(s)" in caplog.text
+        assert capsys.readouterr().out == ""
+
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_run_single_iteration_no_flights(self, mock_get, temp_config):
         """Test iteration with no flights detected."""
         mock_response = Mock()
-        mock_response.json.return_value = {"states": None}
+        mock_response.content = json.dumps({"states": None}).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -285,6 +458,31 @@ class TestFlightCollector:
 
         assert count == 0
 
+    def test_run_sleeps_remainder_of_interval(self, temp_config):
+        """Test the run loop subtracts scan time from the sleep."""
+        collector = FlightCollector(temp_config)
+        clock = [1000.0]
+
+        def scan():
+            collector.iteration_count += 1
+            if collector.iteration_count == 3:
+                raise KeyboardInterrupt
+            clock[0] += 4.0  # Each scan takes 4 seconds
+            return 0
+
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        with patch.object(collector, "run_single_iteration", side_effect=scan), patch(
+            "lara.tracking.collector.time.monotonic", side_effect=lambda: clock[0]
+        ), patch("lara.tracking.collector.time.sleep", side_effect=fake_sleep):
+            collector.run()
+
+        assert sleeps == [collector.update_interval - 4.0] * 2
+
     def test_print_header(self, temp_config, capsys):
         """Test header printing."""
         collector = FlightCollector(temp_config)
@@ -308,12 +506,12 @@ class TestFlightCollector:
 class TestCollectorIntegration:
     """Integration tests for flight collector."""
 
-    @patch("lara.tracking.collector.requests.get")
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_complete_collection_cycle(self, mock_get, temp_config, mock_api_response):
         """Test complete collection cycle from API to database."""
         # Mock API response
         mock_response = Mock()
-        mock_response.json.return_value = mock_api_response
+        mock_response.content = json.dumps(mock_api_response).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -328,11 +526,11 @@ class TestCollectorIntegration:
         assert stats["total_flights"] >= 0
         assert stats["total_positions"] >= 0
 
-    @patch("lara.tracking.collector.requests.get")
+    @patch("lara.tracking.collector.requests.Session.get")
     def test_daily_stats_update(self, mock_get, temp_config, mock_api_response):
         """Test that daily stats are updated correctly."""
         mock_response = Mock()
-        mock_response.json.return_value = mock_api_response
+        mock_response.content = json.dumps(mock_api_response).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -369,11 +567,11 @@ class TestCollectorEdgeCases:
         # Should handle gracefully and return None
         assert result is None
 
-    @patch("lara.tracking.collector.requests.get")
-    def test_invalid_json_response(self, mock_get, temp_config, capsys):
+    @patch("lara.tracking.collector.requests.Session.get")
+    def test_invalid_json_response(self, mock_get, temp_config, caplog):
         """Test handling of invalid JSON response."""
         mock_response = Mock()
-        mock_response.json.side_effect = ValueError("Invalid JSON")
+        mock_response.content = b"<html>Service Unavailable</html>"
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -381,8 +579,7 @@ class TestCollectorEdgeCases:
         flights = collector.fetch_flights()
 
         assert flights == []
-        captured = capsys.readouterr()
-        assert "Error parsing" in captured.out
+        assert "Error parsing" in caplog.text
 
 
 if __name__ == "__main__":
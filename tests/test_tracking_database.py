@@ -3,16 +3,18 @@ Tests for LARA database operations.
 """
 
 import pytest
+import sqlite3
 import sys
 import os
 import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lara.tracking.database import FlightDatabase
+from lara.tracking import database as database_module
+from lara.tracking.database import FlightDatabase, SQL_GET_FLIGHT
 
 
 @pytest.fixture
@@ -28,10 +30,12 @@ def temp_db():
     yield db
 
     # Cleanup
-    try:
-        os.unlink(path)
-    except Exception:
-        pass
+    db.close()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except Exception:
+            pass
 
 
 class TestFlightDatabase:
@@ -42,6 +46,21 @@ class TestFlightDatabase:
         # Database should be created and initialized
         assert os.path.exists(temp_db.db_path)
 
+    def test_connection_uses_wal(self, temp_db, caplog):
+        """Test file databases run in WAL mode without a warning."""
+        mode = temp_db._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+        assert "not WAL" not in caplog.text
+
+    def test_non_wal_connection_warns(self, caplog):
+        """Test a connection that can't switch to WAL is reported."""
+        conn = sqlite3.connect(":memory:")
+        try:
+            database_module.configure_connection(conn)
+        finally:
+            conn.close()
+        assert "not WAL" in caplog.text
+
     def test_create_flight(self, temp_db):
         """Test creating a flight record."""
         timestamp = datetime.now().isoformat()
@@ -66,6 +85,41 @@ class TestFlightDatabase:
 
         assert flight_id1 == flight_id2
 
+    def test_same_flight_space_separated_timestamps(self, temp_db):
+        """Test SQLite-style 'YYYY-MM-DD HH:MM:SS' timestamps reuse the session."""
+        flight_id = temp_db.get_or_create_flight(
+            "abc123", "DLH123", "DE", "2024-01-01 12:00:00"
+        )
+        again = temp_db.get_or_create_flight(
+            "abc123", "DLH123", "DE", "2024-01-01 12:10:00"
+        )
+
+        assert again == flight_id
+        flight = temp_db.get_flight_by_id(flight_id)
+        assert flight["first_seen"] == "2024-01-01T12:00:00"
+        assert flight["last_seen"] == "2024-01-01T12:10:00"
+
+    @pytest.mark.parametrize("has_returning", [True, False])
+    def test_same_flight_bumps_last_seen(self, temp_db, monkeypatch, has_returning):
+        """Test session reuse advances last_seen with and without RETURNING."""
+        if has_returning and not database_module._HAS_RETURNING:
+            pytest.skip("SQLite < 3.35 has no RETURNING")
+        monkeypatch.setattr(database_module, "_HAS_RETURNING", has_returning)
+
+        flight_id = temp_db.get_or_create_flight(
+            "abc123", "DLH123", "DE", "2024-01-01T12:00:00"
+        )
+        again = temp_db.get_or_create_flight(
+            "abc123", "DLH123", "DE", "2024-01-01T12:10:00"
+        )
+        later = temp_db.get_or_create_flight(
+            "abc123", "DLH123", "DE", "2024-01-01T13:00:00"
+        )
+
+        assert again == flight_id
+        assert later != flight_id
+        assert temp_db.get_flight_by_id(flight_id)["last_seen"] == "2024-01-01T12:10:00"
+
     def test_add_position(self, temp_db):
         """Test adding position update."""
         timestamp = datetime.now().isoformat()
@@ -181,6 +235,360 @@ class TestDatabaseIntegration:
         assert flight["min_distance_km"] == 5.0
         assert flight["max_altitude_m"] == 10400
 
+    def test_add_positions_bulk(self, temp_db):
+        """Test bulk insert writes all positions and flight aggregates."""
+        timestamp = datetime.now().isoformat()
+        flight_a = temp_db.get_or_create_flight("abc123", "DLH123", "DE", timestamp)
+        flight_b = temp_db.get_or_create_flight("def456", "BAW456", "UK", timestamp)
+
+        rows = [
+            (flight_a, {"latitude": 49.0, "baro_altitude": 9000}, 8.0, timestamp),
+            (flight_a, {"latitude": 49.1, "baro_altitude": 11000}, 3.0, timestamp),
+            (flight_a, {"latitude": 49.2}, 6.0, timestamp),
+            (flight_b, {"latitude": 50.0, "geo_altitude": 5000}, 12.0, timestamp),
+        ]
+
+        assert temp_db.add_positions_bulk(rows) == 4
+        assert temp_db.add_positions_bulk([]) == 0
+
+        flight = temp_db.get_flight_by_id(flight_a)
+        assert flight["position_count"] == 3
+        assert flight["min_distance_km"] == 3.0
+        assert flight["max_altitude_m"] == 11000
+        assert flight["min_altitude_m"] == 9000
+
+        flight = temp_db.get_flight_by_id(flight_b)
+        assert flight["position_count"] == 1
+        assert flight["max_altitude_m"] == 5000
+        assert len(temp_db.get_positions_for_flight(flight_b)) == 1
+
+    def test_add_positions_bulk_updates_once_per_flight(self, temp_db):
+        """Test flight aggregates are written with one UPDATE per flight."""
+        timestamp = datetime.now().isoformat()
+        flight_id = temp_db.get_or_create_flight("abc123", "DLH123", "DE", timestamp)
+        rows = [
+            (flight_id, {"baro_altitude": 1000 * i}, 10.0 - i, timestamp)
+            for i in range(1, 6)
+        ]
+
+        statements = []
+        temp_db._conn.set_trace_callback(statements.append)
+        temp_db.add_positions_bulk(rows)
+        temp_db._conn.set_trace_callback(None)
+
+        updates = [sql for sql in statements if "UPDATE flights" in sql]
+        assert len(updates) == 1
+
+        flight = temp_db.get_flight_by_id(flight_id)
+        assert flight["position_count"] == 5
+        assert flight["min_distance_km"] == 5.0
+        assert flight["min_altitude_m"] == 1000
+        assert flight["max_altitude_m"] == 5000
+
+    def test_session_lookup_uses_composite_index(self, temp_db):
+        """Test the flight session lookup seeks the composite index."""
+        plan = temp_db._conn.execute(
+            "EXPLAIN QUERY PLAN " + SQL_GET_FLIGHT,
+            ("abc123", "DLH123", datetime.now().isoformat()),
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+
+        assert "idx_flights_icao_call_lastseen" in details
+        assert "last_seen>?" in details.replace(" ", "")
+        assert "TEMP B-TREE" not in details
+
+    def test_country_ids_shared(self, temp_db):
+        """Test flights from the same country share one countries row."""
+        timestamp = datetime.now().isoformat()
+        first = temp_db.get_or_create_flight("abc123", "DLH1", "Germany", timestamp)
+        second = temp_db.get_or_create_flight("def456", "DLH2", "Germany", timestamp)
+        third = temp_db.get_or_create_flight("ghi789", "BAW3", "UK", timestamp)
+
+        ids = [
+            temp_db.get_flight_by_id(f)["country_id"] for f in (first, second, third)
+        ]
+        assert ids[0] == ids[1] != ids[2]
+
+        count = temp_db._conn.execute("SELECT COUNT(*) FROM countries").fetchone()[0]
+        assert count == 2
+
+    def test_country_ids_migrated(self):
+        """Test an existing database gains backfilled country ids."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE flights (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "icao24 TEXT NOT NULL, callsign TEXT, origin_country TEXT, "
+            "first_seen TIMESTAMP, last_seen TIMESTAMP, min_distance_km REAL, "
+            "max_altitude_m REAL, min_altitude_m REAL, avg_velocity_ms REAL, "
+            "position_count INTEGER DEFAULT 0, "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.executemany(
+            "INSERT INTO flights (icao24, origin_country) VALUES (?, ?)",
+            [("a", "Germany"), ("b", "Germany"), ("c", None)],
+        )
+        conn.commit()
+        conn.close()
+
+        db = FlightDatabase(path)
+        rows = db._conn.execute(
+            "SELECT f.country_id, c.name FROM flights f "
+            "LEFT JOIN countries c ON c.id = f.country_id ORDER BY f.id"
+        ).fetchall()
+        db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+        assert rows[0][0] == rows[1][0] is not None
+        assert [row[1] for row in rows] == ["Germany", "Germany", None]
+
+    def test_callsign_index_follows_flights(self, temp_db, tmp_path):
+        """Test flights_fts tracks inserts, renames and archived flights."""
+
+        def search(db, term):
+            return [
+                row[0]
+                for row in db._conn.execute(
+                    "SELECT rowid FROM flights_fts WHERE callsign LIKE ? "
+                    "ORDER BY rowid",
+                    (f"%{term}%",),
+                )
+            ]
+
+        now = datetime.now().isoformat()
+        old_id = temp_db.get_or_create_flight(
+            "old111", "DLH400", "DE", "2020-01-01T00:00:00"
+        )
+        new_id = temp_db.get_or_create_flight("new222", "BAW12", "UK", now)
+        assert search(temp_db, "lh4") == [old_id]
+
+        with temp_db._transaction() as cursor:
+            cursor.execute(
+                "UPDATE flights SET callsign = 'BAW99' WHERE id = ?", (new_id,)
+            )
+        assert search(temp_db, "BAW9") == [new_id]
+        assert search(temp_db, "BAW12") == []
+
+        archive_path = str(tmp_path / "archive.db")
+        assert temp_db.archive_older_than(30, archive_path) == 1
+        assert search(temp_db, "DLH") == []
+
+        archive = FlightDatabase(archive_path)
+        assert search(archive, "DLH") == [old_id]
+        archive.close()
+
+    def test_callsign_index_backfilled(self):
+        """Test an existing database gets flights_fts built from its rows."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        FlightDatabase(path).close()
+        conn = sqlite3.connect(path)
+        for name in ("flights_fts_ai", "flights_fts_ad", "flights_fts_au"):
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("DROP TABLE flights_fts")
+        conn.execute("INSERT INTO flights (icao24, callsign) VALUES ('abc', 'EWG7KP')")
+        conn.commit()
+        conn.close()
+
+        db = FlightDatabase(path)
+        rows = db._conn.execute(
+            "SELECT rowid FROM flights_fts WHERE callsign LIKE '%g7k%'"
+        ).fetchall()
+        plan = " ".join(
+            row[-1]
+            for row in db._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT rowid FROM flights_fts "
+                "WHERE callsign LIKE '%g7k%'"
+            )
+        )
+        db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+        assert len(rows) == 1
+        assert "VIRTUAL TABLE INDEX" in plan
+
+    def test_statistics_counters_match_full_scan(self, temp_db):
+        """Test the running totals agree with aggregating the raw tables."""
+        rows = []
+        for i, (icao24, ts) in enumerate(
+            [
+                ("abc123", "2024-01-01T12:00:00"),
+                ("abc123", "2024-01-01T12:05:00"),
+                ("abc123", "2024-01-02T08:00:00"),  # New session, same aircraft
+                ("def456", "2024-01-01T11:00:00"),
+            ]
+        ):
+            flight_id = temp_db.get_or_create_flight(icao24, "CS1", "DE", ts)
+            altitude = None if i == 1 else 1000.0 * (i + 1)
+            rows.append((flight_id, {"baro_altitude": altitude}, 10.0 - i, ts))
+        temp_db.add_positions_bulk(rows)
+
+        expected = temp_db.get_statistics()
+        temp_db.rebuild_statistics()
+
+        assert temp_db.get_statistics() == expected
+        assert expected["total_flights"] == 3
+        assert expected["unique_aircraft"] == 2
+        assert expected["total_positions"] == 4
+        assert expected["avg_altitude_m"] == pytest.approx((1000 + 3000 + 4000) / 3)
+        assert expected["closest_approach_km"] == 7.0
+        assert expected["first_observation"] == "2024-01-01T11:00:00"
+        assert expected["last_observation"] == "2024-01-02T08:00:00"
+
+    def test_archive_older_than(self, temp_db, tmp_path):
+        """Test old flights move with their positions to the archive."""
+        now = datetime.now().isoformat()
+        old_id = temp_db.get_or_create_flight(
+            "old111", "OLD1", "DE", "2020-01-01T00:00:00"
+        )
+        new_id = temp_db.get_or_create_flight("new222", "NEW2", "UK", now)
+        temp_db.add_positions_bulk(
+            [
+                (old_id, {"baro_altitude": 1000}, 1.0, "2020-01-01T00:00:00"),
+                (new_id, {"baro_altitude": 2000}, 2.0, now),
+            ]
+        )
+        archive_path = str(tmp_path / "archive.db")
+
+        assert temp_db.archive_older_than(30, archive_path) == 1
+        assert temp_db.archive_older_than(30, archive_path) == 0
+
+        assert temp_db.get_flight_by_id(old_id) is None
+        stats = temp_db.get_statistics()
+        assert stats["total_flights"] == 1
+        assert stats["total_positions"] == 1
+
+        archive = FlightDatabase(archive_path)
+        flight = archive.get_flight_by_id(old_id)
+        positions = archive.get_positions_for_flight(old_id)
+        archived_stats = archive.get_statistics()
+        archive.close()
+
+        assert flight["icao24"] == "old111"
+        assert len(positions) == 1
+        assert archived_stats["total_positions"] == 1
+
+        with pytest.raises(ValueError):
+            temp_db.archive_older_than(0, archive_path)
+
+    def test_archive_resumes_after_interrupted_delete(
+        self, temp_db, tmp_path, monkeypatch
+    ):
+        """Test rows copied by a run that failed before deleting are not lost."""
+        old_id = temp_db.get_or_create_flight(
+            "old111", "OLD1", "DE", "2020-01-01T00:00:00"
+        )
+        temp_db.add_positions_bulk(
+            [(old_id, {"baro_altitude": 1000}, 1.0, "2020-01-01T00:00:00")]
+        )
+        archive_path = str(tmp_path / "archive.db")
+
+        def crash():
+            raise sqlite3.OperationalError("disk I/O error")
+
+        with monkeypatch.context() as m:
+            m.setattr(temp_db, "_delete_archived", crash)
+            with pytest.raises(sqlite3.OperationalError):
+                temp_db.archive_older_than(30, archive_path)
+
+        # Copied and committed, but still live
+        assert temp_db.get_flight_by_id(old_id) is not None
+
+        assert temp_db.archive_older_than(30, archive_path) == 1
+        assert temp_db.get_flight_by_id(old_id) is None
+        archive = FlightDatabase(archive_path)
+        positions = archive.get_positions_for_flight(old_id)
+        archive.close()
+        assert len(positions) == 1
+
+    def test_archive_vacuums_only_fragmented_file(self, temp_db, tmp_path):
+        """Test VACUUM runs only once enough of the file is free pages."""
+        statements = []
+        temp_db._conn.set_trace_callback(statements.append)
+
+        for i, days_ago in enumerate((40, 0)):
+            ts = (datetime.now() - timedelta(days=days_ago)).isoformat()
+            flight_id = temp_db.get_or_create_flight(f"a{i}", f"C{i}", "DE", ts)
+            temp_db.add_positions_bulk(
+                [(flight_id, {"baro_altitude": 1000}, 1.0, ts)] * 2000
+            )
+
+        archive_path = str(tmp_path / "archive.db")
+        statements.clear()
+        temp_db.archive_older_than(30, archive_path)
+        assert "VACUUM" in statements
+
+        ts = (datetime.now() - timedelta(days=40)).isoformat()
+        temp_db.get_or_create_flight("small", "S1", "DE", ts)
+        statements.clear()
+        assert temp_db.archive_older_than(30, archive_path) == 1
+        assert "VACUUM" not in statements
+
+    def test_reader_queries_use_indexes(self, temp_db):
+        """Test route and closest-point queries are served by indexes."""
+
+        def plan(sql, params=()):
+            rows = temp_db._conn.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return " ".join(row[-1] for row in rows)
+
+        route = plan(
+            "SELECT * FROM positions WHERE flight_id = ? ORDER BY timestamp", (1,)
+        )
+        assert "idx_positions_flight_track" in route
+        assert "TEMP B-TREE" not in route
+
+        track = plan(
+            "SELECT flight_id, latitude, longitude, altitude_m FROM positions "
+            "WHERE flight_id = ? ORDER BY timestamp",
+            (1,),
+        )
+        assert "COVERING INDEX idx_positions_flight_track" in track
+        assert "TEMP B-TREE" not in track
+
+        closest = plan("""
+            SELECT f.callsign, p.latitude, p.longitude
+            FROM flights f
+            LEFT JOIN positions p ON f.id = p.flight_id
+                AND p.distance_from_home_km = f.min_distance_km
+            WHERE f.min_distance_km IS NOT NULL
+            ORDER BY f.min_distance_km ASC
+            LIMIT 10
+        """)
+        assert "idx_flights_min_dist" in closest
+        assert "COVERING INDEX idx_positions_flight_dist" in closest
+
+    def test_persistent_connection_wal(self, temp_db):
+        """Test the shared connection uses WAL and data survives close()."""
+        mode = temp_db._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+        timestamp = datetime.now().isoformat()
+        flight_id = temp_db.get_or_create_flight("abc123", "DLH123", "DE", timestamp)
+        temp_db.close()
+        temp_db.close()  # Idempotent
+
+        reopened = FlightDatabase(temp_db.db_path)
+        assert reopened.get_flight_by_id(flight_id)["icao24"] == "abc123"
+        reopened.close()
+
+    def test_failed_transaction_rolls_back(self, temp_db):
+        """Test that an error inside a transaction discards its writes."""
+        timestamp = datetime.now().isoformat()
+
+        with pytest.raises(RuntimeError):
+            with temp_db._transaction() as cursor:
+                temp_db._get_or_create_flight(
+                    cursor, "abc123", "DLH123", "DE", timestamp
+                )
+                raise RuntimeError("boom")
+
+        assert temp_db.get_statistics()["total_flights"] == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
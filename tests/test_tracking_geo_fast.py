@@ -0,0 +1,43 @@
+"""
+Tests for LARA compiled geometry kernels.
+"""
+
+import math
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lara.tracking.geo_fast import haversine, haversine_batch
+from lara.utils import haversine_distance
+
+
+class TestGeoFast:
+    """Tests for haversine kernels (numba or fallback)."""
+
+    def test_scalar_matches_reference(self):
+        """Scalar kernel should agree with lara.utils.haversine_distance."""
+        expected = haversine_distance(49.3508, 8.1364, 50.1109, 8.6821)
+        assert haversine(49.3508, 8.1364, 50.1109, 8.6821) == pytest.approx(expected)
+
+    def test_batch_fills_output(self):
+        """Batch kernel should write distances into the output array."""
+        lats = np.array([49.3508, 50.1109, math.nan])
+        lons = np.array([8.1364, 8.6821, 8.0])
+        out = np.empty(3)
+
+        result = haversine_batch(49.3508, 8.1364, lats, lons, out)
+
+        assert result is out
+        assert out[0] == pytest.approx(0.0)
+        assert out[1] == pytest.approx(
+            haversine_distance(49.3508, 8.1364, 50.1109, 8.6821)
+        )
+        assert math.isnan(out[2])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -26,6 +26,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from lara.tracking.reader import FlightReader
+from lara.tracking.database import FlightDatabase
 
 # ============================================================================
 # Fixtures
@@ -286,7 +287,8 @@ class TestFlightReaderInitialization:
 
         assert reader.db_path == populated_db
         assert reader.conn is not None
-        assert reader.conn.row_factory == sqlite3.Row
+        row = reader.conn.execute("SELECT 1 AS one").fetchone()
+        assert row == {"one": 1}
 
         reader.close()
 
@@ -295,6 +297,19 @@ class TestFlightReaderInitialization:
         with pytest.raises(sqlite3.OperationalError):
             _ = FlightReader("/nonexistent/database.db")
 
+    def test_connection_is_tuned_and_read_only(self, populated_db: str):
+        """Test reader connections use WAL and reject writes."""
+        reader = FlightReader(populated_db)
+        try:
+            pragma = reader.conn.execute
+            assert pragma("PRAGMA journal_mode").fetchone()["journal_mode"] == "wal"
+            assert pragma("PRAGMA query_only").fetchone()["query_only"] == 1
+
+            with pytest.raises(sqlite3.OperationalError):
+                reader.conn.execute("DELETE FROM flights")
+        finally:
+            reader.close()
+
     def test_close_connection(self, populated_db: str):
         """Test closing database connection."""
         reader = FlightReader(populated_db)
@@ -529,6 +544,28 @@ class TestGetCountries:
             for i in range(len(countries) - 1):
                 assert countries[i]["flight_count"] >= countries[i + 1]["flight_count"]
 
+    def test_countries_from_dimension_table(self):
+        """Test countries are resolved through country_id on new databases."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        db = FlightDatabase(path)
+        timestamp = datetime.now().isoformat()
+        for icao24, country in [("a", "Germany"), ("b", "Germany"), ("c", "UK")]:
+            db.get_or_create_flight(icao24, icao24.upper(), country, timestamp)
+        db.close()
+
+        reader = FlightReader(path)
+        countries = reader.get_countries()
+        reader.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+        assert [(c["origin_country"], c["flight_count"]) for c in countries] == [
+            ("Germany", 2),
+            ("UK", 1),
+        ]
+
     def test_countries_custom_limit(self, reader_with_data: FlightReader):
         """Test getting countries with custom limit."""
         countries = reader_with_data.get_countries(limit=2)
@@ -576,6 +613,20 @@ class TestGetHourlyDistribution:
         reader.close()
 
 
+class TestGetAllStats:
+    """Tests for get_all_stats method."""
+
+    def test_all_stats_match_individual_queries(self, reader_with_data: FlightReader):
+        """Test combined stats equal the individual query results."""
+        stats = reader_with_data.get_all_stats()
+
+        assert stats["overview"] == reader_with_data.get_overview()
+        assert stats["countries"] == reader_with_data.get_countries()
+        assert stats["daily_stats"] == reader_with_data.get_daily_stats()
+        assert stats["closest_flights"] == reader_with_data.get_closest_flights()
+        assert not reader_with_data.conn.in_transaction
+
+
 class TestGetAltitudeDistribution:
     """Tests for get_altitude_distribution method."""
 
@@ -671,6 +722,34 @@ class TestGetClosestFlights:
 
         assert len(flights) <= 3
 
+    def test_closest_flights_one_row_per_flight_on_ties(self, empty_db: str):
+        """Test tied closest positions don't duplicate the flight."""
+        conn = sqlite3.connect(empty_db)
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO flights
+            (id, icao24, callsign, origin_country, first_seen, last_seen,
+             min_distance_km)
+            VALUES (1, 'tie123', 'TIE1', 'Germany', '2025-01-01', '2025-01-01', 5.0)
+        """)
+        cursor.executemany(
+            """
+            INSERT INTO positions
+            (flight_id, timestamp, latitude, longitude, distance_from_home_km)
+            VALUES (1, ?, ?, 8.0, ?)
+        """,
+            [("t1", 49.1, 5.0), ("t2", 49.2, 5.0), ("t3", 49.3, 9.0)],
+        )
+        conn.commit()
+        conn.close()
+
+        reader = FlightReader(empty_db)
+        flights = reader.get_closest_flights()
+        reader.close()
+
+        assert len(flights) == 1
+        assert flights[0]["latitude"] in (49.1, 49.2)
+
     def test_closest_flights_excludes_null_distances(self, empty_db: str):
         """Test that flights without distance are excluded."""
         # Create flight with no distance
@@ -849,6 +928,18 @@ class TestGetFlightRoute:
                 time2 = datetime.fromisoformat(positions[i + 1]["timestamp"])
                 assert time1 <= time2
 
+    def test_iter_flight_route_streams_same_positions(
+        self, reader_with_data: FlightReader
+    ):
+        """Test the streaming route yields the same positions lazily."""
+        flight_id = reader_with_data.search_flight("DLH000")[0]["id"]
+
+        flight, positions = reader_with_data.iter_flight_route(flight_id)
+
+        assert not isinstance(positions, list)
+        assert (flight, list(positions)) == reader_with_data.get_flight_route(flight_id)
+        assert reader_with_data.iter_flight_route(99999) is None
+
     def test_get_flight_route_nonexistent_flight(self, reader_with_data: FlightReader):
         """Test getting route for non-existent flight."""
         result = reader_with_data.get_flight_route(99999)
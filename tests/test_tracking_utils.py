@@ -2,6 +2,8 @@
 Tests for LARA utility functions.
 """
 
+import math
+import numpy as np
 import pytest
 import sys
 from pathlib import Path
@@ -10,7 +12,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from lara.utils import (
+    HomePoint,
     haversine_distance,
+    haversine_from,
+    haversine_distances,
     calculate_bearing,
     perpendicular_distance,
     get_bounding_box,
@@ -18,7 +23,13 @@ from lara.utils import (
     format_speed,
     format_duration,
     validate_coordinates,
+    validate_coordinates_batch,
     parse_state_vector,
+    parse_states_columnar,
+    classify_altitude,
+    classify_distance,
+    simplify_path,
+    parallel_offsets,
 )
 
 from lara.analysis.corridor_detector import LineSegment
@@ -43,6 +54,26 @@ class TestHaversineDistance:
         dist = haversine_distance(-33.8688, 151.2093, -37.8136, 144.9631)
         assert dist > 0  # Sydney to Melbourne
 
+    def test_vectorized_matches_scalar(self):
+        """Vectorized distances should match the scalar formula."""
+        lats = [49.3508, 50.1109, -33.8688, math.nan]
+        lons = [8.1364, 8.6821, 151.2093, 8.0]
+
+        dists = haversine_distances(49.3508, 8.1364, lats, lons)
+
+        for lat, lon, dist in zip(lats[:3], lons[:3], dists[:3]):
+            assert dist == pytest.approx(haversine_distance(49.3508, 8.1364, lat, lon))
+        assert math.isnan(dists[3])
+
+    def test_haversine_from_home_point(self):
+        """Distance from a precomputed home point matches the plain formula."""
+        home = HomePoint(49.3508, 8.1364)
+
+        for lat, lon in [(50.1109, 8.6821), (-33.8688, 151.2093), (49.3508, 8.1364)]:
+            assert haversine_from(home, lat, lon) == pytest.approx(
+                haversine_distance(49.3508, 8.1364, lat, lon)
+            )
+
     def test_bearing_calculation(self):
         """Test bearing/heading calculation."""
 
@@ -84,6 +115,72 @@ class TestHaversineDistance:
         assert 10 < dist < 12
 
 
+class TestSimplifyPath:
+    """Tests for simplify_path function."""
+
+    def test_straight_line_keeps_endpoints(self):
+        """Collinear points collapse to the two endpoints."""
+        points = [(49.0 + i * 0.01, 8.0 + i * 0.02) for i in range(100)]
+        result = simplify_path(points, 0.0005)
+        assert result.tolist() == [list(points[0]), list(points[-1])]
+
+    def test_corner_kept(self):
+        """A turn larger than the tolerance survives."""
+        points = [(49.0, 8.0), (49.05, 8.0), (49.1, 8.0), (49.1, 8.05), (49.1, 8.1)]
+        result = simplify_path(points, 0.0005)
+        assert result.tolist() == [[49.0, 8.0], [49.1, 8.0], [49.1, 8.1]]
+
+    def test_small_deviation_dropped(self):
+        """Jitter within the tolerance is removed."""
+        points = [(49.0, 8.0), (49.05, 8.0003), (49.1, 8.0)]
+        assert len(simplify_path(points, 0.0005)) == 2
+        assert len(simplify_path(points, 0.0001)) == 3
+
+    def test_closed_loop(self):
+        """A loop returning to its start keeps its far point."""
+        points = [(49.0, 8.0), (49.1, 8.0), (49.1, 8.1), (49.0, 8.0)]
+        assert len(simplify_path(points, 0.0005)) >= 3
+
+    def test_disabled_or_short(self):
+        """Zero tolerance or fewer than three points return the input."""
+        points = [(49.0, 8.0), (49.05, 8.0), (49.1, 8.0)]
+        assert len(simplify_path(points, 0)) == 3
+        assert len(simplify_path(points[:2], 0.0005)) == 2
+
+
+class TestParallelOffsets:
+    """Tests for parallel_offsets function."""
+
+    def test_east_west_segment(self):
+        """An eastbound segment shifts north on the left and south on the right."""
+        result = parallel_offsets([49.0], [8.0], [49.0], [9.0], [5.0])
+        assert result.shape == (1, 2, 2, 2)
+
+        right, left = result[0]
+        assert right[0][0] < 49.0 < left[0][0]
+        for side in (right, left):
+            for (lat, lon), (lat0, lon0) in zip(side, [(49.0, 8.0), (49.0, 9.0)]):
+                assert haversine_distance(lat0, lon0, lat, lon) == pytest.approx(5.0)
+
+    def test_batched_matches_single(self):
+        """Segments computed together equal segments computed alone."""
+        starts = [(49.0, 8.0), (50.0, 7.5)]
+        ends = [(49.5, 8.5), (49.2, 9.0)]
+        widths = [1.0, 3.0]
+        batched = parallel_offsets(
+            [s[0] for s in starts],
+            [s[1] for s in starts],
+            [e[0] for e in ends],
+            [e[1] for e in ends],
+            widths,
+        )
+        for i in range(2):
+            single = parallel_offsets(
+                [starts[i][0]], [starts[i][1]], [ends[i][0]], [ends[i][1]], [widths[i]]
+            )
+            np.testing.assert_allclose(batched[i], single[0])
+
+
 class TestBoundingBox:
     """Tests for get_bounding_box function."""
 
@@ -102,6 +199,12 @@ class TestBoundingBox:
         assert lat_min < lat < lat_max
         assert lon_min < lon < lon_max
 
+    def test_bounding_box_cached(self):
+        """Repeated calls for the same point reuse the cached result."""
+        assert get_bounding_box(49.3508, 8.1364, 50) is get_bounding_box(
+            49.3508, 8.1364, 50
+        )
+
     def test_radius_zero(self):
         """Zero radius should return same point."""
         lat, lon = 49.3508, 8.1364
@@ -130,11 +233,34 @@ class TestFormatting:
         """Test duration formatting."""
         assert format_duration(3665) == "1h 1m 5s"
         assert format_duration(60) == "1m"
+        assert format_duration(59) == "59s"
+        assert format_duration(3600) == "1h"
+        assert format_duration(3601) == "1h 1s"
         assert format_duration(0) == "0s"
         assert format_duration(None) == "N/A"
         assert format_duration(-1) == "N/A"
 
 
+class TestClassification:
+    """Tests for altitude and distance class lookup."""
+
+    def test_classify_altitude(self):
+        """Test class boundaries are lower-inclusive."""
+        assert classify_altitude(-50) == "very_low"
+        assert classify_altitude(999.9) == "very_low"
+        assert classify_altitude(1000) == "low"
+        assert classify_altitude(6000) == "high"
+        assert classify_altitude(11999) == "very_high"
+        assert classify_altitude(40000) == "cruise"
+
+    def test_classify_distance(self):
+        """Test distance classes match Settings.DISTANCE_CLASSES."""
+        assert classify_distance(0) == "very_close"
+        assert classify_distance(5) == "close"
+        assert classify_distance(19.9) == "medium"
+        assert classify_distance(30) == "very_far"
+
+
 class TestValidateCoordinates:
     """Tests for coordinate validation."""
 
@@ -152,6 +278,17 @@ class TestValidateCoordinates:
         assert validate_coordinates(-100, 0) is False
         assert validate_coordinates(0, -200) is False
 
+    def test_batch_matches_scalar(self):
+        """Batch mask should agree with the scalar check, NaN is invalid."""
+        lats = np.array([49.3508, 90.0, -90.0, 100.0, 0.0, math.nan])
+        lons = np.array([8.1364, 180.0, -180.0, 0.0, -200.0, 8.0])
+
+        mask = validate_coordinates_batch(lats, lons)
+
+        expected = [validate_coordinates(a, o) for a, o in zip(lats[:5], lons[:5])]
+        assert mask[:5].tolist() == expected
+        assert not mask[5]
+
 
 class TestParseStateVector:
     """Tests for parse_state_vector function."""
@@ -201,5 +338,74 @@ class TestParseStateVector:
         assert result["squawk"] is None
 
 
+class TestParseStatesColumnar:
+    """Tests for parse_states_columnar function."""
+
+    def test_columns_aligned_with_states(self):
+        """Columns should line up with states, NaN for nulls and bad rows."""
+        state = [
+            "abc123",
+            "DLH123  ",
+            "Germany",
+            1,
+            2,
+            8.1364,
+            49.3508,
+            10000.0,
+            False,
+            250.0,
+            90.0,
+            -1.5,
+            None,
+            None,
+            "1000",
+        ]
+        columns = parse_states_columnar([state, None, ["short"]])
+
+        assert columns["latitude"][0] == 49.3508
+        assert columns["longitude"][0] == 8.1364
+        assert columns["baro_altitude"][0] == 10000.0
+        assert columns["vertical_rate"][0] == -1.5
+        assert math.isnan(columns["geo_altitude"][0])
+        for values in columns.values():
+            assert len(values) == 3
+            assert all(math.isnan(v) for v in values[1:])
+
+    def test_well_formed_scan_matches_per_state_parse(self):
+        """Columns of a clean scan equal the per-state parsed values."""
+        states = [
+            ["abc123", "DLH1", "Germany", 1, 2, 8.0 + i, 49.0 + i, None]
+            + [False, 200.0 + i, 90.0, 0.0, None, 1100.0, "1000", False, 0]
+            for i in range(4)
+        ]
+        columns = parse_states_columnar(states)
+
+        for i, state in enumerate(states):
+            parsed = parse_state_vector(state)
+            assert columns["latitude"][i] == parsed["latitude"]
+            assert columns["velocity"][i] == parsed["velocity"]
+            assert math.isnan(columns["baro_altitude"][i])
+        assert columns["latitude"].flags["C_CONTIGUOUS"]
+
+    def test_non_numeric_value_is_nan(self):
+        """A string in a numeric field becomes NaN without losing the scan."""
+        states = [
+            ["abc123", "DLH1", "Germany", 1, 2, 8.0, 49.0, 1000.0]
+            + [False, "n/a", 90.0, 0.0, None, 1100.0, "1000", False, 0],
+            ["def456", "DLH2", "Germany", 1, 2, 9.0, 50.0, 2000.0]
+            + [False, 210.0, 90.0, 0.0, None, 2100.0, "1000", False, 0],
+        ]
+        columns = parse_states_columnar(states)
+
+        assert math.isnan(columns["velocity"][0])
+        assert columns["velocity"][1] == 210.0
+        assert columns["latitude"].tolist() == [49.0, 50.0]
+
+    def test_empty_scan(self):
+        """An empty scan yields empty columns."""
+        columns = parse_states_columnar([])
+        assert all(len(values) == 0 for values in columns.values())
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Tests for dashboard generation.
+"""
+
+import pytest
+import sys
+import os
+import gzip
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lara.tracking.database import FlightDatabase
+from lara.visualization.dashboard import Dashboard
+
+
+@pytest.fixture
+def dashboard_db():
+    """Create a small collector database for dashboard testing."""
+    tmpdir = tempfile.mkdtemp()
+    db_path = os.path.join(tmpdir, "dashboard.db")
+
+    db = FlightDatabase(db_path)
+    now = datetime.now()
+    for f in range(5):
+        timestamp = (now - timedelta(minutes=f)).isoformat()
+        flight_id = db.get_or_create_flight(f"abc{f}", f"DLH{f}", "Germany", timestamp)
+        db.add_positions_bulk(
+            [
+                (
+                    flight_id,
+                    {
+                        "latitude": 49.3 + k * 0.01,
+                        "longitude": 8.1 + k * 0.01,
+                        "baro_altitude": 5000.0 + k * 100,
+                        "velocity": 200.0,
+                        "true_track": 45.0,
+                        "vertical_rate": 0.0,
+                        "on_ground": False,
+                    },
+                    5.0 + k,
+                    timestamp,
+                )
+                for k in range(5)
+            ]
+        )
+    db.close()
+
+    yield db_path
+
+    for name in os.listdir(tmpdir):
+        os.unlink(os.path.join(tmpdir, name))
+    os.rmdir(tmpdir)
+
+
+class TestDashboard:
+    """Tests for Dashboard class."""
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_generate_complete_dashboard(self, dashboard_db, max_workers):
+        """Test every visualization is written, sequentially or concurrently."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            dashboard = Dashboard(
+                dashboard_db, 49.3508, 8.1364, output_dir, max_workers=max_workers
+            )
+            try:
+                dashboard.generate_complete_dashboard()
+            finally:
+                dashboard.close()
+
+            pages = [
+                "altitude_heatmap.html",
+                "corridors.html",
+                "index.html",
+                "live_view.html",
+                "recent_flights_24h.html",
+                "traffic_heatmap.html",
+            ]
+            assert sorted(os.listdir(output_dir)) == sorted(
+                pages + [page + ".gz" for page in pages] + ["sw.js"]
+            )
+            for page in pages:
+                html = Path(output_dir, page).read_bytes()
+                assert (
+                    gzip.decompress(Path(output_dir, page + ".gz").read_bytes()) == html
+                )
+            index = Path(output_dir, "index.html").read_text(encoding="utf-8")
+            assert "navigator.serviceWorker.register('sw.js')" in index
+            assert dashboard._worker_conns == []
+
+    def test_generation_leaves_stdout_alone(self, dashboard_db, monkeypatch):
+        """Test the dashboard neither swaps sys.stdout nor opens an idle conn."""
+        stdout = sys.stdout
+        seen = []
+        real_run = Dashboard._generate_corridor_map
+
+        def record_stdout(self, *args):
+            seen.append(sys.stdout)
+            return real_run(self, *args)
+
+        monkeypatch.setattr(Dashboard, "_generate_corridor_map", record_stdout)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            dashboard = Dashboard(dashboard_db, 49.3508, 8.1364, output_dir)
+            assert not hasattr(dashboard, "conn")
+            try:
+                dashboard.generate_complete_dashboard()
+            finally:
+                dashboard.close()
+
+        assert seen == [stdout]
+        assert sys.stdout is stdout
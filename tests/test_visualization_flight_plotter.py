@@ -102,3 +102,130 @@ class TestFlightPlotter:
         assert "not found" in captured.out.lower()
 
         plotter.close()
+
+    def test_positions_grouped_per_flight(self, plotter_db):
+        """Test positions for several flights come from one query."""
+        conn = sqlite3.connect(plotter_db)
+        conn.execute("""
+            INSERT INTO flights (id, callsign, first_seen)
+            VALUES (2, 'TEST456', datetime('now'))
+        """)
+        conn.execute("""
+            INSERT INTO positions (flight_id, latitude, longitude, altitude_m, timestamp)
+            VALUES (2, 49.5, 8.5, 9000, datetime('now'))
+        """)
+        conn.commit()
+        conn.close()
+
+        plotter = FlightPlotter(plotter_db, 49.3508, 8.1364)
+        statements = []
+        plotter.conn.set_trace_callback(statements.append)
+
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            plotter.plot_callsign("TEST", temp_path)
+            assert Path(temp_path).exists()
+        finally:
+            plotter.close()
+            Path(temp_path).unlink(missing_ok=True)
+
+        assert len([sql for sql in statements if not sql.startswith("PRAGMA")]) == 2
+
+        plotter = FlightPlotter(plotter_db, 49.3508, 8.1364)
+        flights = {
+            row["id"]: row for row in plotter.conn.execute("SELECT * FROM flights")
+        }
+        drawn = {}
+
+        class Recorder:
+            def add_flight_path(self, positions, flight_info):
+                drawn[flight_info["id"]] = sum(1 for _ in positions)
+
+        plotter._add_tracks(
+            Recorder(),
+            flights,
+            "SELECT * FROM positions ORDER BY flight_id, timestamp",
+            (),
+        )
+        plotter.close()
+        assert drawn == {1: 5, 2: 1}
+
+    def test_plot_callsign_uses_search_index(self, tmp_path):
+        """Test callsign lookups go through flights_fts when it exists."""
+        from lara.tracking.database import FlightDatabase
+
+        db_path = str(tmp_path / "lara.db")
+        db = FlightDatabase(db_path)
+        flight_id = db.get_or_create_flight(
+            "abc123", "DLH400", "Germany", "2024-01-01T12:00:00"
+        )
+        db.get_or_create_flight("def456", "BAW12", "UK", "2024-01-01T12:00:00")
+        db.add_positions_bulk(
+            [(flight_id, {"latitude": 49.4, "longitude": 8.2}, 1.0, "2024-01-01")]
+        )
+        db.close()
+
+        plotter = FlightPlotter(db_path, 49.3508, 8.1364)
+        statements = []
+        plotter.conn.set_trace_callback(statements.append)
+        try:
+            plotter.plot_callsign("lh4", str(tmp_path / "callsign.html"))
+        finally:
+            plotter.close()
+
+        assert (tmp_path / "callsign.html").exists()
+        queries = [sql for sql in statements if "LIKE" in sql]
+        assert len(queries) == 2
+        assert all("flights_fts" in sql for sql in queries)
+
+    def test_plot_recent_flights_skips_flights_without_track(self, tmp_path, capsys):
+        """Test recent flights are filtered on position_count, not a join."""
+        from datetime import datetime
+
+        from lara.tracking.database import FlightDatabase
+
+        db_path = str(tmp_path / "lara.db")
+        now = datetime.now().isoformat()
+        db = FlightDatabase(db_path)
+        tracked = db.get_or_create_flight("abc123", "DLH400", "Germany", now)
+        db.get_or_create_flight("def456", "BAW12", "UK", now)
+        db.add_positions_bulk(
+            [(tracked, {"latitude": 49.4, "longitude": 8.2}, 1.0, now)]
+        )
+        db.close()
+
+        plotter = FlightPlotter(db_path, 49.3508, 8.1364)
+        statements = []
+        plotter.conn.set_trace_callback(statements.append)
+        try:
+            plotter.plot_recent_flights(24, str(tmp_path / "recent.html"))
+        finally:
+            plotter.conn.set_trace_callback(None)
+            plotter.close()
+
+        assert "Plotting 1 recent flights" in capsys.readouterr().out
+        assert all("JOIN" not in sql for sql in statements)
+
+    def test_own_connection_tuned_read_only(self, plotter_db):
+        """Test the plotter's own connection is WAL and rejects writes."""
+        plotter = FlightPlotter(plotter_db, 49.3508, 8.1364)
+        try:
+            assert plotter.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with pytest.raises(sqlite3.OperationalError):
+                plotter.conn.execute("DELETE FROM flights")
+        finally:
+            plotter.close()
+
+    def test_shared_connection_left_open(self, plotter_db):
+        """Test a passed-in connection is used and not closed by close()."""
+        conn = sqlite3.connect(plotter_db)
+        conn.row_factory = sqlite3.Row
+
+        plotter = FlightPlotter(plotter_db, 49.3508, 8.1364, conn=conn)
+        assert plotter.conn is conn
+        plotter.close()
+
+        assert conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0] == 1
+        conn.close()
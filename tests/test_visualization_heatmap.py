@@ -11,7 +11,14 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lara.visualization.heatmap_generator import HeatmapGenerator
+import folium
+import numpy as np
+
+from lara.visualization.heatmap_generator import (
+    MAX_HEATMAP_BINS,
+    HeatmapGenerator,
+    bin_heat_points,
+)
 
 
 @pytest.fixture
@@ -92,6 +99,114 @@ class TestHeatmapGenerator:
             heatmap.close()
             Path(temp_path).unlink(missing_ok=True)
 
+    def test_fetch_array(self, heatmap_db):
+        """Test positions are fetched as a float array, including no rows."""
+        heatmap = HeatmapGenerator(heatmap_db, 49.3508, 8.1364)
+        try:
+            data = heatmap._fetch_array(
+                "SELECT latitude, longitude, altitude_m FROM positions"
+            )
+            assert data.shape == (20, 3)
+            assert data[0].tolist() == [49.35, 8.14, 10000.0]
+
+            empty = heatmap._fetch_array(
+                "SELECT latitude, longitude FROM positions WHERE 0"
+            )
+            assert empty.shape == (0, 2)
+        finally:
+            heatmap.close()
+
+    def test_altitude_weights(self, heatmap_db, monkeypatch):
+        """Test positions are weighted by inverse altitude in kilometers."""
+        from lara.visualization import heatmap_generator
+
+        captured = []
+
+        def fake_heatmap(data, **kwargs):
+            captured.append(data)
+            return folium.FeatureGroup()
+
+        monkeypatch.setattr(heatmap_generator.plugins, "HeatMap", fake_heatmap)
+        heatmap = HeatmapGenerator(heatmap_db, 49.3508, 8.1364)
+
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            heatmap.generate_altitude_heatmap(temp_path)
+            total = sum(weight for _, _, weight in captured[0])
+            assert total == pytest.approx(20 / (10000 / 1000 + 0.1))
+        finally:
+            heatmap.close()
+            Path(temp_path).unlink(missing_ok=True)
+
+    def test_shared_connection_left_open(self, heatmap_db):
+        """Test a passed-in connection serves both heatmaps and stays open."""
+        conn = sqlite3.connect(heatmap_db)
+        conn.row_factory = sqlite3.Row
+        heatmap = HeatmapGenerator(heatmap_db, 49.3508, 8.1364, conn=conn)
+
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            heatmap.generate_traffic_heatmap(temp_path)
+            heatmap.generate_altitude_heatmap(temp_path)
+            heatmap.close()
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        finally:
+            conn.close()
+            Path(temp_path).unlink(missing_ok=True)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestBinHeatPoints:
+    """Tests for heatmap grid binning."""
+
+    def test_weights_summed_per_cell(self):
+        """Test coincident points merge and total weight is preserved."""
+        data = np.array(
+            [[49.0, 8.0, 1.0], [49.0, 8.0, 2.0], [50.0, 9.0, 0.5], [49.5, 8.5, 1.5]]
+        )
+        binned = bin_heat_points(data, bins=4)
+        assert len(binned) == 3
+        assert binned[:, 2].sum() == pytest.approx(5.0)
+        assert binned[:, 2].max() == pytest.approx(3.0)
+        assert (binned[:, 0] >= 49.0).all() and (binned[:, 0] <= 50.0).all()
+
+    def test_default_grid_keeps_sparse_points_in_place(self):
+        """Test few positions over a wide area aren't snapped to a coarse grid."""
+        rng = np.random.default_rng(0)
+        # 400 positions spread over roughly 200 km x 200 km
+        data = np.column_stack(
+            [
+                49.35 + rng.uniform(-0.9, 0.9, 400),
+                8.14 + rng.uniform(-1.4, 1.4, 400),
+                np.ones(400),
+            ]
+        )
+        binned = bin_heat_points(data)
+
+        # Almost every position keeps its own cell (sqrt(N) gave 20x20)
+        assert len(binned) > 390
+        cell = (np.ptp(data[:, :2], axis=0) / MAX_HEATMAP_BINS).max()
+        for lat, lon, _ in binned:
+            nearest = np.abs(data[:, :2] - [lat, lon]).max(axis=1).min()
+            assert nearest <= cell
+
+    def test_default_bins_capped(self):
+        """Test the default grid is MAX_HEATMAP_BINS cells per axis."""
+        rng = np.random.default_rng(0)
+        data = np.column_stack(
+            [rng.random(400_000), rng.random(400_000), np.ones(400_000)]
+        )
+        binned = bin_heat_points(data)
+        assert len(binned) <= MAX_HEATMAP_BINS**2
+        assert binned[:, 2].sum() == pytest.approx(400_000)
+
+    def test_empty(self):
+        """Test no positions give no cells."""
+        assert bin_heat_points(np.empty((0, 3))).shape == (0, 3)
@@ -180,13 +180,47 @@ class TestLiveTrackingHTMLGeneration:
         # Core functions
         assert "function setStatus" in html
         assert "function getAltitudeColor" in html
-        assert "function haversineDistance" in html
         assert "function updateFlightMarker" in html
         assert "function removeStaleMarkers" in html
         assert "function updateFlights" in html
         assert "function startAutoUpdate" in html
         assert "function stopAutoUpdate" in html
 
+    def test_generate_live_html_filters_with_leaflet_distance(self, plotter):
+        """Test that the radius filter uses Leaflet's distanceTo once per state."""
+        html = plotter._generate_live_html(49.0, 8.0, 50.0, 9.0)
+
+        assert "function haversineDistance" not in html
+        assert "HOME_LATLNG = L.latLng(HOME_LAT, HOME_LON)" in html
+        assert html.count("HOME_LATLNG.distanceTo(") == 1
+
+    def test_generate_live_html_patches_markers_in_place(self, plotter):
+        """Test that markers are moved and restyled instead of rebuilt."""
+        html = plotter._generate_live_html(49.0, 8.0, 50.0, 9.0)
+
+        assert "setIcon(" not in html
+        assert html.count("L.divIcon(") == 1
+        assert "requestAnimationFrame(flushStyles)" in html
+        assert ".bindPopup(popupContent)" in html
+        assert "marker.rotation === rotation && marker.color === color" in html
+
+    def test_generate_live_html_api_url(self, plotter):
+        """Test the page polls OpenSky directly unless given a proxy path."""
+        direct = plotter._generate_live_html(49.0, 8.0, 50.0, 9.0)
+        proxied = plotter._generate_live_html(
+            49.0, 8.0, 50.0, 9.0, api_url="/api/states"
+        )
+
+        assert "const API_URL = 'https://opensky-network.org/api/states/all'" in direct
+        assert "const API_URL = '/api/states'" in proxied
+
+    def test_generate_live_html_registers_tile_cache(self, plotter):
+        """Test the page registers the tile cache only when served over http."""
+        html = plotter._generate_live_html(49.0, 8.0, 50.0, 9.0)
+
+        assert "navigator.serviceWorker.register('sw.js')" in html
+        assert "location.protocol.startsWith('http')" in html
+
     def test_generate_live_html_includes_altitude_colors(self, plotter):
         """Test that altitude color scheme matches LARA visualization."""
         html = plotter._generate_live_html(49.0, 8.0, 50.0, 9.0)
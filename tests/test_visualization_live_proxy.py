@@ -0,0 +1,165 @@
+"""
+Tests for the live tracking proxy.
+"""
+
+import gzip
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lara.visualization.live_proxy import PROXY_PATH, StatesCache, create_server
+
+STATES = {"time": 1700000000, "states": [["abc123", "DLH400 ", "Germany"]] * 50}
+
+
+BOUNDS = (48.9, 7.5, 49.8, 8.8)
+
+
+class FakeSession:
+    """Stands in for requests.Session; counts upstream calls."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.calls = []
+
+    def get(self, url, params, timeout):
+        self.calls.append((url, params))
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = json.dumps(STATES).encode()
+        response.url = url
+        return response
+
+
+def serve(page, cache):
+    """Start a proxy server for a page on a free port."""
+    server = create_server(str(page), cache, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    """Run a proxy server for a temp page with a fake upstream."""
+    (tmp_path / "live.html").write_text("<html></html>")
+    (tmp_path / "credentials.json").write_text("{}")
+    session = FakeSession()
+    cache = StatesCache(BOUNDS, ttl=60, session=session)
+    server = serve(tmp_path / "live.html", cache)
+
+    yield f"http://127.0.0.1:{server.server_port}", session
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestStatesCache:
+    """Tests for StatesCache class."""
+
+    def test_cached_until_expired(self):
+        """Test one upstream call for the fixed box serves requests in the TTL."""
+        session = FakeSession()
+        cache = StatesCache(BOUNDS, ttl=60, session=session)
+
+        etag, body = cache.get()
+        assert cache.get() == (etag, body)
+        assert json.loads(gzip.decompress(body)) == STATES
+        assert session.calls == [
+            (
+                cache.url,
+                {"lamin": 48.9, "lomin": 7.5, "lamax": 49.8, "lomax": 8.8},
+            )
+        ]
+
+        expiring = StatesCache(BOUNDS, ttl=0, session=session)
+        expiring.get()
+        expiring.get()
+        assert len(session.calls) == 3
+
+    def test_upstream_error_cached(self):
+        """Test a failed upstream response is raised again without refetching."""
+        session = FakeSession(status=429)
+        cache = StatesCache(BOUNDS, ttl=60, session=session)
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                cache.get()
+        assert len(session.calls) == 1
+
+    def test_expired_entry_served_during_refresh(self):
+        """Test other callers get the previous entry while one refreshes."""
+        session = FakeSession()
+        cache = StatesCache(BOUNDS, ttl=0, session=session)
+        first = cache.get()
+
+        with cache._refresh_lock:
+            assert cache.get() == first
+        assert len(session.calls) == 1
+
+
+class TestLiveProxyServer:
+    """Tests for the proxy HTTP server."""
+
+    def test_states_gzip_and_etag(self, proxy):
+        """Test states are served gzipped, revalidated, and fetched once."""
+        base, session = proxy
+        url = f"{base}{PROXY_PATH}?lamin=1&lomin=2"
+
+        request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(request) as response:
+            assert response.headers["Content-Encoding"] == "gzip"
+            etag = response.headers["ETag"]
+            assert json.loads(gzip.decompress(response.read())) == STATES
+
+        request = urllib.request.Request(url, headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(request)
+        assert exc.value.code == 304
+
+        # A different client query neither changes the box nor refetches
+        with urllib.request.urlopen(f"{base}{PROXY_PATH}?lamin=5") as response:
+            assert response.headers["Content-Encoding"] is None
+            assert json.loads(response.read()) == STATES
+
+        assert len(session.calls) == 1
+        assert session.calls[0][1]["lamin"] == 48.9
+
+    def test_page_and_service_worker_served(self, proxy):
+        """Test the live page and the tile cache service worker are served."""
+        base, _ = proxy
+        for path in ("/live.html", "/"):
+            with urllib.request.urlopen(base + path) as response:
+                assert response.read() == b"<html></html>"
+        with urllib.request.urlopen(f"{base}/sw.js") as response:
+            assert b"lara-tiles" in response.read()
+
+    @pytest.mark.parametrize("path", ["/credentials.json", "/../live.html", "/x/"])
+    def test_other_files_not_served(self, proxy, path):
+        """Test nothing else from the page's directory is exposed."""
+        base, _ = proxy
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(base + path)
+        assert exc.value.code == 404
+
+    def test_rate_limit_passed_through(self, tmp_path):
+        """Test upstream rate limiting reaches the page as HTTP 429."""
+        cache = StatesCache(BOUNDS, session=FakeSession(429))
+        server = serve(tmp_path / "live.html", cache)
+        try:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                urllib.request.urlopen(
+                    f"http://127.0.0.1:{server.server_port}{PROXY_PATH}"
+                )
+            assert exc.value.code == 429
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -8,6 +8,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from lara.config import Colors
 from lara.visualization.map_generator import MapGenerator
 
 
@@ -41,6 +42,75 @@ class TestMapGenerator:
         gen.add_flight_path(positions, flight_info)
         # Should not raise exception
 
+    def test_add_flight_path_from_generator(self):
+        """Test positions can be streamed from a one-shot iterator."""
+        gen = MapGenerator(49.3508, 8.1364)
+        children = len(gen.map._children)
+
+        positions = (
+            {"latitude": 49.35 + i * 0.01, "longitude": 8.14, "altitude_m": None}
+            for i in range(3)
+        )
+        gen.add_flight_path(positions, {"callsign": "TEST123"})
+
+        assert len(gen.map._children) == children + 1
+
+    def test_flight_paths_share_one_layer(self):
+        """Test every flight path goes into a single feature group."""
+        gen = MapGenerator(49.3508, 8.1364)
+        children = len(gen.map._children)
+
+        for i in range(5):
+            gen.add_flight_path(
+                [
+                    {"latitude": 49.35, "longitude": 8.14 + i, "altitude_m": 1000},
+                    {"latitude": 49.36, "longitude": 8.15 + i, "altitude_m": 1000},
+                ],
+                {"callsign": f"TEST{i}"},
+            )
+
+        assert len(gen.map._children) == children + 1
+        assert len(gen._flight_layer._children) == 5
+
+    def test_add_flight_path_without_altitude_key(self):
+        """Test positions may omit altitude_m."""
+        gen = MapGenerator(49.3508, 8.1364)
+
+        gen.add_flight_path(
+            [
+                {"latitude": 49.1, "longitude": 8.1},
+                {"latitude": 49.2, "longitude": 8.2},
+            ],
+            {"callsign": "NOALT"},
+        )
+
+        line = list(gen._flight_layer._children.values())[-1]
+        assert line.locations == [[49.1, 8.1], [49.2, 8.2]]
+
+    def test_add_flight_path_skips_missing_coordinates(self):
+        """Test NULL coordinates are dropped and NULL altitudes ignored."""
+        gen = MapGenerator(49.3508, 8.1364)
+        children = len(gen.map._children)
+
+        gen.add_flight_path(
+            [{"latitude": None, "longitude": None, "altitude_m": 500}],
+            {"callsign": "EMPTY"},
+        )
+        assert len(gen.map._children) == children
+
+        gen.add_flight_path(
+            [
+                {"latitude": 49.35, "longitude": 8.14, "altitude_m": 1000},
+                {"latitude": None, "longitude": 8.15, "altitude_m": 90000},
+                {"latitude": 49.40, "longitude": 8.14, "altitude_m": None},
+                {"latitude": 49.40, "longitude": 8.20, "altitude_m": 3000},
+            ],
+            {"callsign": "TEST123"},
+        )
+        line = list(gen._flight_layer._children.values())[-1]
+        assert len(line.locations) == 3
+        assert "TEST123 - 2000m" in gen.map.get_root().render()
+
     def test_add_corridor(self):
         """Test adding corridor."""
         gen = MapGenerator(49.3508, 8.1364)
@@ -59,6 +129,36 @@ class TestMapGenerator:
         gen.add_corridor(corridor, rank=1)
         # Should not raise exception
 
+    def test_add_corridors(self):
+        """Test each corridor gets a centre line and two width lines."""
+        gen = MapGenerator(49.3508, 8.1364)
+        children = len(gen.map._children)
+
+        corridors = [
+            {
+                "rank": rank,
+                "heading": 90,
+                "length_km": 100,
+                "width_km": 8,
+                "start_lat": 49.0 + rank * 0.1,
+                "start_lon": 7.5,
+                "end_lat": 49.0 + rank * 0.1,
+                "end_lon": 8.5,
+                "center_lat": 49.0 + rank * 0.1,
+                "center_lon": 8.0,
+                "unique_flights": 10,
+                "total_positions": 100,
+            }
+            for rank in (1, 2, 3)
+        ]
+        gen.add_corridors(corridors)
+
+        lines = list(gen.map._children.values())[children:]
+        assert len(lines) == 9
+        assert lines[0].locations == [[49.1, 7.5], [49.1, 8.5]]
+        north, south = lines[1].locations, lines[2].locations
+        assert north[0][0] < 49.1 < south[0][0] or south[0][0] < 49.1 < north[0][0]
+
     def test_save_map(self):
         """Test saving map to file."""
         gen = MapGenerator(49.3508, 8.1364)
@@ -73,6 +173,23 @@ class TestMapGenerator:
         finally:
             Path(temp_path).unlink(missing_ok=True)
 
+    def test_save_adds_title_once(self):
+        """Test the title and favicon are in the head, once per save."""
+        gen = MapGenerator(49.3508, 8.1364)
+
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            gen.save(temp_path)
+            gen.save(temp_path)
+            html = Path(temp_path).read_text(encoding="utf-8")
+            head = html[: html.index("</head>")]
+            assert head.count("<title>LARA Map</title>") == 1
+            assert '<link rel="icon" href="../docu/icon.ico">' in head
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+
     def test_altitude_color(self):
         """Test altitude color assignment."""
         gen = MapGenerator(49.3508, 8.1364)
@@ -91,3 +208,4 @@ class TestMapGenerator:
         color2 = gen._get_rank_color(2)
         assert color1 is not None
         assert color2 is not None
+        assert gen._get_rank_color(1000) == Colors.RANKED_COLORS[-1]